@@ -429,7 +429,7 @@ const Dashboard = () => {
                 {uploadedFiles.map((file, index) => (
                   <li key={index}>
                     <a href={file.file} target="_blank" rel="noopener noreferrer">
-                      {file.file.split('/').pop()} ({(file.size / 1024).toFixed(2)} KB)
+                      {file.original_name || file.file.split('?')[0].split('/').pop()} ({(file.size / 1024).toFixed(2)} KB)
                     </a>
                   </li>
                 ))}
@@ -74,28 +74,17 @@ const Dashboard = () => {
   useEffect(() => {
     const fetchTasks = async () => {
       try {
-        const response = await fetch('http://127.0.0.1:8000/api/tasks/');
+        // Subtasks come inline with each task instead of one request per task
+        const response = await fetch('http://127.0.0.1:8000/api/tasks/?expand=subtasks');
         if (response.ok) {
           const data = await response.json();
           console.log('Tasks response:', data);
           const tasksArray = Array.isArray(data) ? data : data.results || [];
           setTasks(tasksArray);
 
-          // Fetch subtasks for each task
-          const subtaskPromises = tasksArray.map(task =>
-            fetch(`http://127.0.0.1:8000/api/tasks/${task.id}/subtasks/`)
-              .then(res => res.ok ? res.json() : [])
-              .then(subtaskData => ({
-                taskId: task.id,
-                subtasks: Array.isArray(subtaskData) ? subtaskData : subtaskData.results || []
-              }))
-              .catch(() => ({ taskId: task.id, subtasks: [] }))
-          );
-
-          const subtaskResults = await Promise.all(subtaskPromises);
-          const subtaskMap = subtaskResults.reduce((acc, { taskId, subtasks }) => ({
+          const subtaskMap = tasksArray.reduce((acc, task) => ({
             ...acc,
-            [taskId]: subtasks
+            [task.id]: task.subtasks || []
           }), {});
           setSubtasks(subtaskMap);
         } else {
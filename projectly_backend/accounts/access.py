@@ -0,0 +1,69 @@
+# accounts/access.py
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import CharField, Value
+
+from .models import AccessPermission, Project
+
+# Project members keep full rights; AccessPermission grants the other levels
+LEVELS = {'view': 1, 'edit': 2, 'admin': 3}
+MEMBER_LEVEL = 'admin'
+
+
+def _cache_key(user_id):
+    return f'project-access:{user_id}'
+
+
+class ProjectAccess:
+    """The projects a user can reach, and at which level."""
+
+    def __init__(self, levels):
+        self.levels = levels
+
+    def project_ids(self, level='view'):
+        required = LEVELS[level]
+        return {project_id for project_id, granted in self.levels.items() if LEVELS[granted] >= required}
+
+    def can(self, project_id, level='view'):
+        granted = self.levels.get(int(project_id))
+        return granted is not None and LEVELS[granted] >= LEVELS[level]
+
+
+def load_project_access(user_id):
+    """Memberships and AccessPermission grants for ``user_id`` in one UNION query."""
+    memberships = Project.members.through.objects.filter(user_id=user_id).values_list(
+        'project_id', Value(MEMBER_LEVEL, output_field=CharField())
+    )
+    grants = AccessPermission.objects.filter(user_id=user_id).values_list('project_id', 'permission')
+    levels = {}
+    for project_id, level in memberships.union(grants, all=True):
+        if LEVELS[level] > LEVELS.get(levels.get(project_id), 0):
+            levels[project_id] = level
+    return levels
+
+
+def project_access_for(user_id):
+    """``user_id``'s access, from the short-lived cache when possible."""
+    if user_id is None:
+        return ProjectAccess({})
+    levels = cache.get(_cache_key(user_id))
+    if levels is None:
+        levels = load_project_access(user_id)
+        cache.set(_cache_key(user_id), levels, getattr(settings, 'PROJECT_ACCESS_TIMEOUT', 60))
+    return ProjectAccess(levels)
+
+
+def get_project_access(request):
+    """Resolve the request user's access once per request."""
+    access = getattr(request, '_project_access', None)
+    if access is None:
+        user = request.user
+        access = request._project_access = project_access_for(user.pk if user.is_authenticated else None)
+    return access
+
+
+def invalidate_project_access(user_ids):
+    keys = [_cache_key(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,62 @@
+# accounts/authentication.py
+from django.contrib.auth.hashers import make_password
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .hashers import run_hashing, verify_and_upgrade
+from .models import ClaimsUser, User, UserProfile
+
+ROLE_CLAIM = 'role'
+ACTIVE_CLAIM = 'active'
+
+
+def tokens_for_user(user):
+    """A refresh token whose access tokens carry the claims ClaimsJWTAuthentication trusts."""
+    refresh = RefreshToken.for_user(user)
+    refresh[ROLE_CLAIM] = UserProfile.objects.filter(user=user).values_list('role', flat=True).first() or ''
+    refresh[ACTIVE_CLAIM] = user.is_active
+    return refresh
+
+
+async def authenticate_credentials(email, password):
+    """Async counterpart of ModelBackend.authenticate with hashing on the bounded pool.
+
+    A hash made with an outdated algorithm or cost is replaced as part of
+    the login. Raises HashingOverloaded when the pool is saturated.
+    """
+    user = await User.objects.filter(email=email).only('id', 'email', 'password', 'is_active').afirst()
+    if user is None:
+        # Hash anyway so unknown addresses take as long as wrong passwords
+        await run_hashing(make_password, password)
+        return None
+    is_correct, upgraded = await run_hashing(verify_and_upgrade, password, user.password)
+    if not is_correct or not user.is_active:
+        return None
+    if upgraded:
+        user.password = upgraded
+        await User.objects.filter(pk=user.pk).aupdate(password=upgraded)
+    return user
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """JWT authentication that builds the user from the token instead of loading it.
+
+    The signature already proves who the caller is, so this skips the user
+    query JWTAuthentication makes on every request. The price is that
+    deactivation and role changes only take effect once the caller's
+    short-lived access token expires.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken('Token contained no recognizable user identification')
+        if not validated_token.get(ACTIVE_CLAIM, True):
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        return ClaimsUser.from_claims(
+            user_id, is_active=True, role=validated_token.get(ROLE_CLAIM) or None
+        )
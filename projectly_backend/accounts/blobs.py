@@ -0,0 +1,96 @@
+# accounts/blobs.py
+import hashlib
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Blob, blob_path
+
+
+def upload_dir():
+    # Spool files on the same filesystem as MEDIA_ROOT so that moving a
+    # finished upload into the blob store is a rename rather than a copy.
+    return getattr(settings, 'UPLOAD_TEMP_DIR', None) or os.path.join(settings.MEDIA_ROOT, '.uploads')
+
+
+def find_blob(sha256):
+    return Blob.objects.filter(sha256=sha256.lower()).first() if sha256 else None
+
+
+def _place(path, name):
+    """Move the file at ``path`` to ``name`` in storage: a rename on local disk."""
+    try:
+        target = default_storage.path(name)
+    except NotImplementedError:
+        if not default_storage.exists(name):
+            with open(path, 'rb') as f:
+                default_storage.save(name, File(f))
+        os.remove(path)
+        return
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    # Same content under the same name, so replacing a concurrent writer is harmless
+    shutil.move(path, target)
+
+
+def ingest_path(path, sha256, size):
+    """Turn a fully written file into a Blob, consuming ``path``.
+
+    If the content is already stored the file is simply dropped, so a
+    duplicate costs no write to storage.
+    """
+    blob = find_blob(sha256)
+    if blob is not None and default_storage.exists(blob.file.name):
+        os.remove(path)
+        # Restart the GC grace period so the blob survives until it is referenced
+        Blob.objects.filter(pk=blob.pk, ref_count=0).update(orphaned_at=timezone.now())
+        return blob
+
+    name = blob_path(Blob(sha256=sha256), None)
+    _place(path, name)
+    try:
+        with transaction.atomic():
+            # Unreferenced until a row points at it; stamped so GC can reclaim it if none ever does
+            blob, _ = Blob.objects.get_or_create(
+                sha256=sha256, defaults={'size': size, 'file': name, 'orphaned_at': timezone.now()}
+            )
+    except IntegrityError:
+        blob = Blob.objects.get(sha256=sha256)
+    return blob
+
+
+def store_file(fileobj):
+    """Hash ``fileobj`` while spooling it to disk in chunks and return its Blob."""
+    os.makedirs(upload_dir(), exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=upload_dir(), suffix='.blob')
+    digest, size = hashlib.sha256(), 0
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            if hasattr(fileobj, 'seek'):
+                fileobj.seek(0)
+            for chunk in fileobj.chunks() if hasattr(fileobj, 'chunks') else iter(lambda: fileobj.read(1024 * 1024), b''):
+                out.write(chunk)
+                digest.update(chunk)
+                size += len(chunk)
+        return ingest_path(path, digest.hexdigest(), size)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def acquire_blob(blob_id):
+    Blob.objects.filter(pk=blob_id).update(ref_count=F('ref_count') + 1, orphaned_at=None)
+
+
+def release_blob(blob_id):
+    Blob.objects.filter(pk=blob_id).update(
+        ref_count=Greatest(F('ref_count') - 1, 0),
+        orphaned_at=Case(When(ref_count__lte=1, then=Value(timezone.now())), default=F('orphaned_at')),
+    )
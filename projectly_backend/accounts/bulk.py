@@ -0,0 +1,249 @@
+# accounts/bulk.py
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from .models import Notification, Project, SubTask, Task
+from .notifications import queue_notification
+from .versions import bump_model_version
+
+User = get_user_model()
+
+MODES = ('create', 'update', 'upsert')
+
+
+def default_chunk_size():
+    return getattr(settings, 'BULK_WRITE_CHUNK_SIZE', 500)
+
+
+class BulkResult:
+    def __init__(self, mode):
+        self.mode = mode
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+        self.started = time.perf_counter()
+
+    def add_error(self, row, errors):
+        self.errors.append({'row': row, 'errors': errors})
+
+    def as_dict(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'mode': self.mode,
+            'rows': self.rows,
+            'created': self.created,
+            'updated': self.updated,
+            'failed': len(self.errors),
+            'errors': self.errors,
+            'elapsed_ms': round(elapsed * 1000, 1),
+            'rows_per_second': round(self.rows / elapsed, 1) if elapsed else None,
+        }
+
+
+class BulkWriter:
+    """Create, update or upsert rows in chunks of ``bulk_create``/``bulk_update``.
+
+    Rows are plain dicts. Each chunk is validated with a handful of queries
+    (one per foreign key model plus one to load existing rows) and written
+    inside its own transaction, so a bad row is reported without aborting
+    the rest of the import.
+    """
+    model = None
+    fields = ()
+    required_on_create = ()
+    foreign_keys = {}
+
+    def __init__(self, mode='create', chunk_size=None):
+        if mode not in MODES:
+            raise ValueError(f'mode must be one of {", ".join(MODES)}')
+        self.mode = mode
+        self.chunk_size = chunk_size or default_chunk_size()
+
+    def write(self, rows):
+        result = BulkResult(self.mode)
+        rows = iter(rows)
+        offset = 0
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            self.write_chunk(chunk, offset, result)
+            offset += len(chunk)
+        result.rows = offset
+        return result
+
+    def write_chunk(self, chunk, offset, result):
+        existing = self.load_existing(chunk)
+        related = self.load_related(chunk)
+        to_create, to_update, update_fields = [], [], set()
+        seen_keys, written = set(), []
+
+        for index, row in enumerate(chunk, start=offset):
+            if not isinstance(row, dict):
+                result.add_error(index, {'non_field_errors': ['Expected an object.']})
+                continue
+            key = self.row_key(row)
+            if key is not None and key in seen_keys:
+                result.add_error(index, {'non_field_errors': ['Duplicate row in the same chunk.']})
+                continue
+            seen_keys.add(key)
+
+            instance = existing.get(key) if key is not None else None
+            if self.mode == 'update' and instance is None:
+                result.add_error(index, {'non_field_errors': ['No existing row matches id or external_id.']})
+                continue
+            if self.mode == 'create' and instance is not None:
+                result.add_error(index, {'external_id': ['A row with this external_id already exists.']})
+                continue
+
+            values, errors = self.clean_row(row, related, creating=instance is None)
+            if errors:
+                result.add_error(index, errors)
+                continue
+
+            written.append(index)
+            if instance is None:
+                to_create.append(self.build(values))
+            else:
+                for field, value in values.items():
+                    setattr(instance, field, value)
+                update_fields.update(values)
+                to_update.append(instance)
+
+        try:
+            with transaction.atomic():
+                if to_create:
+                    created = self.model.objects.bulk_create(to_create)
+                    self.after_create(created)
+                if to_update and update_fields:
+                    self.model.objects.bulk_update(to_update, sorted(update_fields))
+                    self.after_update(to_update)
+        except DatabaseError as exc:
+            for index in written:
+                result.add_error(index, {'non_field_errors': [f'Chunk rejected by the database: {exc}']})
+            return
+
+        result.created += len(to_create)
+        result.updated += len(to_update)
+        # Bulk writes skip model signals, so invalidate list validators here
+        bump_model_version(self.model)
+
+    def row_key(self, row):
+        """Identify a row by ``id`` (not when creating) or else ``external_id``."""
+        if not isinstance(row, dict):
+            return None
+        if self.mode != 'create' and row.get('id') not in (None, ''):
+            return ('id', str(row['id']))
+        if row.get('external_id') not in (None, ''):
+            return ('external_id', str(row['external_id']))
+        return None
+
+    def load_existing(self, chunk):
+        keys = [self.row_key(row) for row in chunk]
+        ids = [value for kind, value in filter(None, keys) if kind == 'id' and value.isdigit()]
+        external_ids = [value for kind, value in filter(None, keys) if kind == 'external_id']
+
+        existing = {}
+        if ids:
+            for instance in self.model.objects.filter(id__in=ids):
+                existing[('id', str(instance.id))] = instance
+        if external_ids:
+            for instance in self.model.objects.filter(external_id__in=external_ids):
+                existing[('external_id', instance.external_id)] = instance
+        return existing
+
+    def load_related(self, chunk):
+        related = {}
+        for field, model in self.foreign_keys.items():
+            ids = {str(row[field]) for row in chunk if isinstance(row, dict) and row.get(field) not in (None, '')}
+            found = model.objects.filter(id__in=[value for value in ids if value.isdigit()]).values_list('id', flat=True)
+            related[field] = {str(pk) for pk in found}
+        return related
+
+    def clean_row(self, row, related, creating):
+        values, errors = {}, {}
+        for field_name in self.fields:
+            if field_name not in row:
+                if creating and field_name in self.required_on_create:
+                    errors[field_name] = ['This field is required.']
+                continue
+            value = row[field_name]
+            if value == '':
+                value = None
+
+            if field_name in self.foreign_keys:
+                if value is not None and str(value) not in related[field_name]:
+                    errors[field_name] = [f'Invalid pk "{value}" - object does not exist.']
+                    continue
+                values[f'{field_name}_id'] = int(value) if value is not None else None
+                continue
+
+            if isinstance(value, (list, dict)):
+                errors[field_name] = ['Expected a single value.']
+                continue
+            field = self.model._meta.get_field(field_name)
+            try:
+                values[field_name] = field.clean(value, None)
+            except ValidationError as exc:
+                errors[field_name] = exc.messages
+            except (TypeError, ValueError):
+                # e.g. a number where a date string is expected
+                errors[field_name] = [f'Invalid value "{value}".']
+        return values, errors
+
+    def build(self, values):
+        return self.model(**values)
+
+    def after_create(self, created):
+        pass
+
+    def after_update(self, updated):
+        pass
+
+
+class TaskBulkWriter(BulkWriter):
+    model = Task
+    fields = ('external_id', 'title', 'description', 'status', 'assigned_to', 'due_date', 'project')
+    required_on_create = ('title',)
+    foreign_keys = {'assigned_to': User, 'project': Project}
+
+    def __init__(self, mode='create', chunk_size=None, created_by=None):
+        super().__init__(mode, chunk_size)
+        self.created_by = created_by
+
+    def build(self, values):
+        return Task(created_by=self.created_by, **values)
+
+    # Bulk writes skip post_save, so assignment notifications are queued here
+    def after_create(self, created):
+        for task in created:
+            if task.assigned_to_id:
+                self.notify(task)
+
+    def after_update(self, updated):
+        for task in updated:
+            if task.assigned_to_id and task.assigned_to_id != task._loaded_assigned_to_id:
+                self.notify(task)
+            task._loaded_assigned_to_id = task.assigned_to_id
+
+    def notify(self, task):
+        queue_notification(Notification(
+            user_id=task.assigned_to_id,
+            notification_type='task_assigned',
+            message=f'You have been assigned a new task: {task.title}',
+            related_task_id=task.id,
+            related_project_id=task.project_id,
+        ))
+
+
+class SubTaskBulkWriter(BulkWriter):
+    model = SubTask
+    fields = ('external_id', 'parent_task', 'title', 'description', 'assigned_to', 'due_date', 'completed')
+    required_on_create = ('parent_task', 'title')
+    foreign_keys = {'parent_task': Task, 'assigned_to': User}
@@ -0,0 +1,93 @@
+# accounts/hashers.py
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.contrib.auth.hashers import make_password, verify_password
+
+
+def _param(name, default):
+    value = getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(name)
+    return default if value is None else value
+
+
+# The algorithm names are Django's own, so existing hashes keep verifying.
+# Changing a cost parameter makes must_update() true for older hashes, and
+# they are rewritten with the new cost on the user's next login.
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return _param('PBKDF2_ITERATIONS', hashers.PBKDF2PasswordHasher.iterations)
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return _param('ARGON2_TIME_COST', hashers.Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _param('ARGON2_MEMORY_COST', hashers.Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _param('ARGON2_PARALLELISM', hashers.Argon2PasswordHasher.parallelism)
+
+
+class BCryptSHA256PasswordHasher(hashers.BCryptSHA256PasswordHasher):
+    @property
+    def rounds(self):
+        return _param('BCRYPT_ROUNDS', hashers.BCryptSHA256PasswordHasher.rounds)
+
+
+class HashingOverloaded(Exception):
+    """More password checks are waiting than ``PASSWORD_HASH_QUEUE`` allows."""
+
+
+def hash_workers():
+    return getattr(settings, 'PASSWORD_HASH_WORKERS', None) or os.cpu_count() or 1
+
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            workers = hash_workers()
+            _slots = threading.BoundedSemaphore(workers + getattr(settings, 'PASSWORD_HASH_QUEUE', 64))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+    return _executor, _slots
+
+
+async def run_hashing(func, *args):
+    """Run ``func`` on the hashing pool so the event loop keeps serving other requests.
+
+    The pool has one thread per core by default (the hashers release the
+    GIL). Work beyond the pool plus ``PASSWORD_HASH_QUEUE`` waiting calls is
+    refused rather than queued without bound.
+    """
+    executor, slots = _get_executor()
+    if not slots.acquire(blocking=False):
+        raise HashingOverloaded()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    finally:
+        slots.release()
+
+
+def verify_and_upgrade(raw_password, encoded):
+    """Return ``(is_correct, new_encoded)``; ``new_encoded`` is set when the hash should be upgraded.
+
+    Unlike ``User.check_password`` this never touches the database, so it
+    can run on the hashing pool and the caller saves the new hash itself.
+    """
+    is_correct, must_update = verify_password(raw_password, encoded)
+    return is_correct, make_password(raw_password) if is_correct and must_update else None
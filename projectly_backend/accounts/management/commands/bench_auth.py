@@ -0,0 +1,65 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from accounts.authentication import ClaimsJWTAuthentication, tokens_for_user
+from accounts.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the per-request cost of each authentication backend: time to resolve '
+        'request.user and the queries it takes. The test user is rolled back afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Authenticated requests per backend')
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(email='bench-auth@example.com', password='!')
+                results = self.run(user, options['requests'])
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(f"{'backend':<28} {'us/request':>11} {'queries/request':>16}")
+        for name, (micros, queries) in results.items():
+            self.stdout.write(f'{name:<28} {micros:>11.1f} {queries:>16.2f}')
+
+    def run(self, user, count):
+        factory = APIRequestFactory()
+        access = str(tokens_for_user(user).access_token)
+        default_chain = [auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+        cases = {
+            'JWTAuthentication': ([JWTAuthentication()], access, lambda user: user.pk),
+            'ClaimsJWTAuthentication': ([ClaimsJWTAuthentication()], access, lambda user: user.pk),
+            # A view that goes on to read a column the token does not carry
+            'Claims + user.email': ([ClaimsJWTAuthentication()], access, lambda user: user.email),
+            # The default chain when no credentials match: every backend gets a turn
+            'default chain, anonymous': (default_chain, None, lambda user: user.pk),
+        }
+        results = {}
+        for name, (authenticators, token, touch) in cases.items():
+            headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+            timings = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(count):
+                    request = Request(factory.get('/api/projects/', **headers), authenticators=authenticators)
+                    started = time.perf_counter()
+                    touch(request.user)
+                    timings.append((time.perf_counter() - started) * 1_000_000)
+            results[name] = (statistics.median(timings), len(queries) / count)
+        return results
@@ -0,0 +1,114 @@
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+COUNTERS = 50
+
+
+def configurations(workdir):
+    """Each configuration to compare: SQLite as Django ships it, SQLite as configured here, and Postgres if in use."""
+    configs = {
+        'sqlite default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(workdir, 'default.sqlite3')},
+        'sqlite tuned': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(workdir, 'tuned.sqlite3'),
+            'OPTIONS': settings.SQLITE_OPTIONS,
+        },
+    }
+    default = settings.DATABASES['default']
+    if default['ENGINE'] != 'django.db.backends.sqlite3':
+        configs[f"{default['ENGINE'].rsplit('.', 1)[-1]} (default)"] = dict(default)
+    return configs
+
+
+class Command(BaseCommand):
+    help = (
+        'Run N parallel writer threads against each database configuration and report '
+        'committed write transactions per second, lock errors and latency.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, nargs='+', default=[1, 4, 16], help='Parallel writer counts')
+        parser.add_argument('--transactions', type=int, default=200, help='Transactions per writer')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'configuration':<22} {'writers':>7} {'commits/s':>10} {'locked':>7} {'p95 ms':>8}")
+        with tempfile.TemporaryDirectory() as workdir:
+            for number, (name, config) in enumerate(configurations(workdir).items()):
+                alias = f'bench_writers_{number}'
+                connections.settings[alias] = connections.configure_settings({'default': config})['default']
+                try:
+                    self.create_tables(alias)
+                    for writers in options['writers']:
+                        result = self.run(alias, writers, options['transactions'])
+                        self.stdout.write(
+                            f"{name:<22} {writers:>7} {result['rate']:>10.1f} {result['locked']:>7} {result['p95']:>8.2f}"
+                        )
+                finally:
+                    self.drop_tables(alias)
+                    connections[alias].close()
+                    del connections[alias]
+                    del connections.settings[alias]
+
+    def create_tables(self, alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute('CREATE TABLE IF NOT EXISTS bench_writes (counter_id INTEGER, message TEXT)')
+            cursor.execute('CREATE TABLE IF NOT EXISTS bench_counters (id INTEGER PRIMARY KEY, total INTEGER)')
+            cursor.execute('DELETE FROM bench_counters')
+            cursor.executemany('INSERT INTO bench_counters (id, total) VALUES (%s, 0)', [(i,) for i in range(COUNTERS)])
+
+    def drop_tables(self, alias):
+        with connections[alias].cursor() as cursor:
+            cursor.execute('DROP TABLE IF EXISTS bench_writes')
+            cursor.execute('DROP TABLE IF EXISTS bench_counters')
+
+    def run(self, alias, writers, count):
+        """Each transaction reads a counter, inserts a row and bumps the counter, like a notification signal."""
+        latencies, locked = [], []
+        lock = threading.Lock()
+        start = threading.Barrier(writers + 1)
+
+        def writer(seed):
+            mine, failures = [], 0
+            start.wait()
+            try:
+                for i in range(count):
+                    counter_id = (seed * count + i) % COUNTERS
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic(using=alias), connections[alias].cursor() as cursor:
+                            cursor.execute('SELECT total FROM bench_counters WHERE id = %s', [counter_id])
+                            cursor.fetchone()
+                            cursor.execute(
+                                'INSERT INTO bench_writes (counter_id, message) VALUES (%s, %s)', [counter_id, 'x' * 200]
+                            )
+                            cursor.execute('UPDATE bench_counters SET total = total + 1 WHERE id = %s', [counter_id])
+                    except OperationalError:
+                        failures += 1
+                        continue
+                    mine.append((time.perf_counter() - started) * 1000)
+            finally:
+                connections[alias].close()
+                with lock:
+                    latencies.extend(mine)
+                    locked.append(failures)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - began
+        return {
+            'rate': len(latencies) / elapsed,
+            'locked': sum(locked),
+            'p95': statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0.0,
+        }
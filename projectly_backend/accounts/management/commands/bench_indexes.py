@@ -0,0 +1,167 @@
+import json
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from accounts.models import Board, BoardList, Card, Notification, Project, Task, User
+
+
+class Rollback(Exception):
+    pass
+
+
+def query_shapes(user, project, board, board_list):
+    """The hot queries, each paired with the index that should serve it."""
+    today = date.today()
+    return [
+        ('unread_notifications', 'notification_unread_idx',
+         Notification.objects.filter(user=user, is_read=False).order_by('-created_at')[:50]),
+        ('user_notifications', 'notification_user_created_idx',
+         Notification.objects.filter(user=user).order_by('-created_at')[:50]),
+        ('project_tasks_by_status', 'task_project_status_idx',
+         Task.objects.filter(project=project, status='in progress')),
+        ('assigned_tasks_by_status', 'task_assignee_status_idx',
+         Task.objects.filter(assigned_to=user, status='to do')),
+        ('tasks_due_this_week', 'task_due_date_idx',
+         Task.objects.filter(due_date__range=(today, today + timedelta(days=7)))),
+        ('board_lists', 'boardlist_board_position_idx',
+         BoardList.objects.filter(board=board).order_by('position')),
+        ('list_cards', 'card_list_position_idx',
+         Card.objects.filter(list=board_list).order_by('position')),
+        ('member_projects', 'project_members_user_idx',
+         Project.members.through.objects.filter(user=user).values_list('project_id', flat=True)),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed realistic volumes, then record the query plan and latency of each hot query '
+        'with and without its index. Everything runs in a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--projects', type=int, default=100)
+        parser.add_argument('--tasks', type=int, default=50000)
+        parser.add_argument('--notifications', type=int, default=200000)
+        parser.add_argument('--cards', type=int, default=20000)
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query; the median is reported')
+        parser.add_argument('--output', help='Write plans and timings to this JSON file')
+        parser.add_argument('--check', action='store_true', help='Fail if a query stops using its index')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        random.seed(0)
+        try:
+            with transaction.atomic():
+                shapes = query_shapes(*self.seed(options))
+                self.analyze()
+                results = {name: {'index': index} for name, index, _ in shapes}
+                for name, index, queryset in shapes:
+                    results[name]['with_index'] = self.measure(queryset, index, 'with_index')
+                with transaction.atomic():
+                    with connection.cursor() as cursor:
+                        for _, index, _ in shapes:
+                            cursor.execute(f'DROP INDEX {connection.ops.quote_name(index)}')
+                    for name, index, queryset in shapes:
+                        results[name]['without_index'] = self.measure(queryset, index, 'without_index')
+                    transaction.set_rollback(True)
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.report(results)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({'vendor': connection.vendor, 'options': options, 'queries': results}, f, indent=2, default=str)
+
+        missing = [name for name, result in results.items() if not result['with_index']['uses_index']]
+        if options['check'] and missing:
+            raise CommandError(f'Queries not using their index: {", ".join(missing)}')
+
+    def seed(self, options):
+        users = User.objects.bulk_create(
+            User(email=f'bench{i}@example.com', password='!') for i in range(options['users'])
+        )
+        projects = Project.objects.bulk_create(
+            Project(name=f'Bench {i}', created_by=random.choice(users)) for i in range(options['projects'])
+        )
+        Membership = Project.members.through
+        Membership.objects.bulk_create(
+            Membership(project=project, user=user)
+            for project in projects
+            for user in random.sample(users, min(len(users), 10))
+        )
+
+        today = date.today()
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        Task.objects.bulk_create((
+            Task(
+                title=f'Task {i}',
+                status=random.choice(statuses),
+                assigned_to=random.choice(users),
+                due_date=today + timedelta(days=random.randint(-180, 180)),
+                project=random.choice(projects),
+                created_by=random.choice(users),
+            )
+            for i in range(options['tasks'])
+        ), batch_size=5000)
+        Notification.objects.bulk_create((
+            Notification(
+                user=random.choice(users),
+                notification_type='update',
+                message=f'Notification {i}',
+                # Most notifications have been read; the bell asks for the rest
+                is_read=random.random() < 0.9,
+            )
+            for i in range(options['notifications'])
+        ), batch_size=5000)
+
+        boards = Board.objects.bulk_create(Board(project=project) for project in projects)
+        lists = BoardList.objects.bulk_create(
+            BoardList(board=board, name=f'List {i}', position=i) for board in boards for i in range(5)
+        )
+        Card.objects.bulk_create((
+            Card(list=random.choice(lists), title=f'Card {i}', position=i, created_by=random.choice(users))
+            for i in range(options['cards'])
+        ), batch_size=5000)
+
+        return users[0], projects[0], boards[0], lists[0]
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def measure(self, queryset, index, phase):
+        plan = self.explain(queryset, phase)
+        timings = []
+        for _ in range(self.repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        return {
+            'plan': plan,
+            'uses_index': index in plan,
+            'median_ms': round(statistics.median(timings), 3),
+        }
+
+    def explain(self, queryset, phase):
+        # sqlite3 caches prepared statements by SQL text and a cached EXPLAIN
+        # is not re-planned after DROP INDEX, so make each phase's text unique.
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql} /* {phase} */', params)
+            return '\n'.join(' '.join(str(column) for column in row) for row in cursor.fetchall())
+
+    def report(self, results):
+        self.stdout.write(f"{'query':<26} {'index used':<11} {'without':>10} {'with':>10} {'speedup':>8}")
+        for name, result in results.items():
+            before = result['without_index']['median_ms']
+            after = result['with_index']['median_ms']
+            used = 'yes' if result['with_index']['uses_index'] else 'NO'
+            speedup = f'{before / after:.1f}x' if after else '-'
+            self.stdout.write(f'{name:<26} {used:<11} {before:>8.2f}ms {after:>8.2f}ms {speedup:>8}')
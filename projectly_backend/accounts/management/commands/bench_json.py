@@ -0,0 +1,100 @@
+import gc
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import Task, User
+from accounts.renderers import ORJSONRenderer, orjson
+from accounts.serializers import TaskSerializer
+from accounts.streaming import stream_json
+
+
+def measure(func, repeat):
+    """Best wall time in ms over ``repeat`` runs, then peak traced memory in MiB of one more run."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best * 1000, peak / 2 ** 20
+
+
+def drain(response):
+    return sum(len(part) for part in response.streaming_content)
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare encode time and peak memory of the stdlib and orjson renderers on a task list, '
+        'and of a rendered versus a streamed list response. Benchmark rows are rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', type=int, default=100_000, help='Tasks in the payload')
+        parser.add_argument('--repeat', type=int, default=2, help='Timed runs per case; the best is reported')
+
+    def handle(self, *args, **options):
+        renderers = [('json', JSONRenderer())]
+        if orjson is not None:
+            renderers.append(('orjson', ORJSONRenderer()))
+        else:
+            self.stdout.write('orjson is not installed; ORJSONRenderer falls back to json and is not measured.')
+        fastest = renderers[-1][1]
+
+        with transaction.atomic():
+            tasks = self.create_tasks(options['tasks'])
+            data = TaskSerializer(tasks, many=True).data
+            self.stdout.write(f"{options['tasks']} tasks, {len(fastest.render(data)) / 2 ** 20:.1f} MiB of JSON")
+            self.stdout.write(f"{'case':<34} {'best ms':>10} {'peak MiB':>10}")
+
+            for name, renderer in renderers:
+                self.report(f'encode ({name})', lambda: renderer.render(data), options['repeat'])
+
+            # End to end from the database, as TaskListCreateView and FileListView serve them
+            self.report(
+                f'rendered list ({renderers[-1][0]})',
+                lambda: fastest.render(TaskSerializer(tasks.all(), many=True).data),
+                options['repeat'],
+            )
+            self.report(
+                'streamed list (?stream=json)',
+                lambda: drain(stream_json(tasks.all(), TaskSerializer)),
+                options['repeat'],
+            )
+            transaction.set_rollback(True)
+
+    def report(self, name, func, repeat):
+        elapsed, peak = measure(func, repeat)
+        self.stdout.write(f'{name:<34} {elapsed:>10.1f} {peak:>10.1f}')
+
+    def create_tasks(self, count):
+        user = User.objects.create(email='bench-json@example.invalid')
+        statuses = [choice for choice, _ in Task.STATUS_CHOICES]
+        Task.objects.bulk_create(
+            (
+                Task(
+                    title=f'Task {i}',
+                    description='Benchmark task with a short description, like most real ones. ' * 2,
+                    status=statuses[i % len(statuses)],
+                    assigned_to=user,
+                    due_date=date(2025, 1, 1) + timedelta(days=i % 365),
+                    created_by=user,
+                    external_id=f'bench-json-{i}',
+                )
+                for i in range(count)
+            ),
+            batch_size=2000,
+        )
+        return Task.objects.filter(created_by=user).order_by('created_at', 'id')
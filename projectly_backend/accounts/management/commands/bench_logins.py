@@ -0,0 +1,81 @@
+import asyncio
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.utils.module_loading import import_string
+
+from accounts.authentication import authenticate_credentials
+from accounts.hashers import hash_workers
+from accounts.models import User
+
+PASSWORD = 'Bench-password-1'
+
+
+def cores():
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure login throughput for each installed password hasher, verifying inline on one '
+        'thread and on the async hashing pool. Benchmark users are deleted afterwards.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=64, help='Logins per hasher and mode')
+        parser.add_argument('--concurrency', type=int, default=32, help='Logins in flight on the async path')
+        parser.add_argument('--hasher', action='append', dest='hashers',
+                            help='Algorithm to measure (e.g. argon2); repeatable. Defaults to all configured.')
+
+    def handle(self, *args, **options):
+        algorithms = options['hashers'] or [
+            import_string(path).algorithm for path in settings.PASSWORD_HASHERS if path.startswith('accounts.')
+        ]
+        emails = [f'bench-login-{i}@example.invalid' for i in range(options['logins'])]
+        self.stdout.write(
+            f'{cores()} core(s), {hash_workers()} hashing thread(s), {options["concurrency"]} concurrent logins'
+        )
+        self.stdout.write(f"{'hasher':<16} {'mode':<8} {'logins/s':>10} {'per core':>10}")
+        try:
+            for algorithm in algorithms:
+                try:
+                    hasher = get_hasher(algorithm)
+                except ValueError:
+                    raise CommandError(f'Hasher {algorithm!r} is not configured in PASSWORD_HASHERS.')
+                User.objects.filter(email__in=emails).delete()
+                encoded = make_password(PASSWORD, hasher=algorithm)
+                User.objects.bulk_create(User(email=email, password=encoded) for email in emails)
+
+                # Measure this hasher as the preferred one, so logins do not upgrade the hashes mid-run
+                path = next(path for path in settings.PASSWORD_HASHERS if import_string(path).algorithm == algorithm)
+                with override_settings(PASSWORD_HASHERS=[path, *(p for p in settings.PASSWORD_HASHERS if p != path)]):
+                    for mode, run in (('inline', self.inline), ('pooled', self.pooled)):
+                        started = time.perf_counter()
+                        logged_in = run(emails, options['concurrency'])
+                        elapsed = time.perf_counter() - started
+                        if logged_in != len(emails):
+                            raise CommandError(f'Only {logged_in} of {len(emails)} {algorithm} logins succeeded.')
+                        rate = len(emails) / elapsed
+                        self.stdout.write(f'{hasher.algorithm:<16} {mode:<8} {rate:>10.1f} {rate / cores():>10.1f}')
+        finally:
+            User.objects.filter(email__in=emails).delete()
+
+    def inline(self, emails, concurrency):
+        return sum(authenticate(email=email, password=PASSWORD) is not None for email in emails)
+
+    def pooled(self, emails, concurrency):
+        async def run():
+            gate = asyncio.Semaphore(concurrency)
+
+            async def login(email):
+                async with gate:
+                    return await authenticate_credentials(email, PASSWORD)
+
+            return await asyncio.gather(*(login(email) for email in emails))
+
+        return sum(user is not None for user in asyncio.run(run()))
@@ -0,0 +1,75 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from accounts.models import Blob, BlobPreview
+from accounts.signals import BLOB_BACKED_MODELS
+
+
+def delete_files(names):
+    for name in names:
+        default_storage.delete(name)
+
+
+class Command(BaseCommand):
+    help = 'Delete blobs no row has referenced for the grace period, optionally recounting references first.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24, help='How long a blob must stay unreferenced')
+        parser.add_argument('--recount', action='store_true', help='Recompute ref_count from the referencing tables')
+        parser.add_argument('--dry-run', action='store_true', help='Report without deleting anything')
+
+    def handle(self, *args, **options):
+        if options['recount']:
+            self.recount(options['dry_run'])
+
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        candidates = Blob.objects.filter(ref_count=0, orphaned_at__lt=cutoff).values_list('sha256', flat=True)
+        deleted = freed = 0
+        for sha256 in list(candidates):
+            with transaction.atomic():
+                # Recheck under the lock: an upload may have claimed the blob meanwhile
+                blob = Blob.objects.select_for_update().filter(
+                    sha256=sha256, ref_count=0, orphaned_at__lt=cutoff
+                ).first()
+                if blob is None:
+                    continue
+                deleted += 1
+                freed += blob.size
+                if not options['dry_run']:
+                    # The preview row goes with the blob; its thumbnail file has to be removed too
+                    thumbnails = BlobPreview.objects.filter(blob=blob).exclude(thumbnail='')
+                    names = [blob.file.name, *thumbnails.values_list('thumbnail', flat=True)]
+                    blob.delete()
+                    transaction.on_commit(lambda names=names: delete_files(names))
+
+        verb = 'Would delete' if options['dry_run'] else 'Deleted'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {deleted} orphaned blob(s), {freed} bytes.'))
+
+    def recount(self, dry_run):
+        actual = Counter()
+        for model in BLOB_BACKED_MODELS:
+            counts = model.objects.filter(blob__isnull=False).values('blob').annotate(refs=Count('id'))
+            actual.update({row['blob']: row['refs'] for row in counts})
+
+        fixed = 0
+        for sha256, stored in list(Blob.objects.values_list('sha256', 'ref_count')):
+            refs = actual.get(sha256, 0)
+            if refs == stored:
+                continue
+            fixed += 1
+            if dry_run:
+                continue
+            with transaction.atomic():
+                # Count again under the lock so concurrent attaches are not lost
+                blob = Blob.objects.select_for_update().get(sha256=sha256)
+                refs = sum(model.objects.filter(blob=blob).count() for model in BLOB_BACKED_MODELS)
+                blob.ref_count = refs
+                blob.orphaned_at = (blob.orphaned_at or timezone.now()) if refs == 0 else None
+                blob.save(update_fields=['ref_count', 'orphaned_at'])
+        self.stdout.write(f'Corrected {fixed} reference count(s).')
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from accounts.models import Blob
+from accounts.previews import generate_preview
+
+
+class Command(BaseCommand):
+    help = 'Derive previews for blobs stored before the preview pipeline, or whose preview failed.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry previews that failed')
+
+    def handle(self, *args, **options):
+        missing = Q(preview__isnull=True) | Q(preview__status='pending')
+        if options['retry_failed']:
+            missing |= Q(preview__status='failed')
+        counts = {'ready': 0, 'failed': 0}
+        for sha256 in Blob.objects.filter(missing).values_list('sha256', flat=True).iterator():
+            preview = generate_preview(sha256)
+            if preview is not None:
+                counts[preview.status] += 1
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {counts['ready']} preview(s); {counts['failed']} failed."
+        ))
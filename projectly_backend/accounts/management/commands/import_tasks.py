@@ -0,0 +1,67 @@
+import csv
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.bulk import MODES, SubTaskBulkWriter, TaskBulkWriter
+
+User = get_user_model()
+
+
+def read_csv(stream):
+    for row in csv.DictReader(stream):
+        yield {key: value for key, value in row.items() if key}
+
+
+def read_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+class Command(BaseCommand):
+    help = 'Stream tasks or subtasks from a CSV/NDJSON file into the database in chunked bulk writes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin")
+        parser.add_argument('--format', choices=('csv', 'ndjson'), help='Defaults to the file extension')
+        parser.add_argument('--model', choices=('task', 'subtask'), default='task')
+        parser.add_argument('--mode', choices=MODES, default='upsert')
+        parser.add_argument('--chunk-size', type=int, help='Rows per transaction (default: BULK_WRITE_CHUNK_SIZE)')
+        parser.add_argument('--created-by', help='Email of the user recorded as creator of new tasks')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or ('csv' if path.endswith('.csv') else 'ndjson')
+
+        if options['model'] == 'task':
+            created_by = self.get_creator(options['created_by'])
+            writer = TaskBulkWriter(options['mode'], options['chunk_size'], created_by=created_by)
+        else:
+            writer = SubTaskBulkWriter(options['mode'], options['chunk_size'])
+
+        stream = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+        try:
+            rows = read_csv(stream) if file_format == 'csv' else read_ndjson(stream)
+            result = writer.write(rows).as_dict()
+        except json.JSONDecodeError as e:
+            raise CommandError(f'Invalid NDJSON: {e}')
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in result['errors']:
+            self.stderr.write(f"row {error['row']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{result['rows']} rows: {result['created']} created, {result['updated']} updated, "
+            f"{result['failed']} failed in {result['elapsed_ms']} ms ({result['rows_per_second']} rows/s)"
+        ))
+
+    def get_creator(self, email):
+        user = User.objects.filter(email=email).first() if email else User.objects.first()
+        if user is None:
+            raise CommandError('No user to record as task creator; pass --created-by.')
+        return user
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from accounts.retention import (
+    archive_notifications, collapse_notifications, purge_archive, retention_policy
+)
+
+STEPS = {
+    'collapse': (collapse_notifications, 'collapsed'),
+    'archive': (archive_notifications, 'archived'),
+    'purge': (purge_archive, 'purged from the archive'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Apply NOTIFICATION_RETENTION: collapse repeated task notifications, move old ones '
+        'to the archive and purge the archive. Works in short batches; safe to stop and rerun.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--step', choices=STEPS, action='append', help='Run only these steps (repeatable)')
+        parser.add_argument('--batch-size', type=int, help='Rows per transaction (default: policy BATCH_SIZE)')
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Count what would change without changing it')
+
+    def handle(self, *args, **options):
+        policy = retention_policy()
+        if options['batch_size']:
+            policy['BATCH_SIZE'] = options['batch_size']
+
+        for name in options['step'] or STEPS:
+            step, verb = STEPS[name]
+            count = step(policy, dry_run=options['dry_run'], pause=options['pause'])
+            prefix = 'would be ' if options['dry_run'] else ''
+            self.stdout.write(self.style.SUCCESS(f'{count} notification(s) {prefix}{verb}.'))
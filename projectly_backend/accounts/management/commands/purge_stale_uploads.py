@@ -0,0 +1,23 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts.models import UploadSession
+from accounts.uploads import abort_upload
+
+
+class Command(BaseCommand):
+    help = 'Delete resumable uploads that have not received a chunk recently, with their partial files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, default=48, help='Idle time after which an upload is abandoned')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['hours'])
+        stale = UploadSession.objects.filter(status='active', updated_at__lt=cutoff)
+        count = 0
+        for session in stale.iterator():
+            abort_upload(session)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f'Removed {count} stale upload(s).'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from accounts.models import Notification, NotificationCounter
+
+
+class Command(BaseCommand):
+    help = 'Recount unread notifications and repair any per-user counter that has drifted.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report drift without fixing it')
+
+    def handle(self, *args, **options):
+        actual = dict(
+            Notification.objects.filter(is_read=False)
+            .values('user').annotate(unread=Count('id')).values_list('user', 'unread')
+        )
+        stored = dict(NotificationCounter.objects.values_list('user_id', 'unread'))
+        drifted = sorted(
+            user_id for user_id in actual.keys() | stored.keys()
+            if actual.get(user_id, 0) != stored.get(user_id, 0)
+        )
+
+        for user_id in drifted:
+            if options['dry_run']:
+                self.stdout.write(f'user {user_id}: counter {stored.get(user_id, 0)}, actual {actual.get(user_id, 0)}')
+                continue
+            self.repair(user_id)
+
+        verb = 'Found' if options['dry_run'] else 'Repaired'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {len(drifted)} drifted counter(s) out of {len(actual.keys() | stored.keys())}.'))
+
+    def repair(self, user_id):
+        # Lock the counter and recount under the lock, so writes that landed
+        # since the bulk scan above are not overwritten with a stale number.
+        with transaction.atomic():
+            counter, _ = NotificationCounter.objects.select_for_update().get_or_create(user_id=user_id)
+            counter.unread = Notification.objects.filter(user_id=user_id, is_read=False).count()
+            counter.save(update_fields=['unread'])
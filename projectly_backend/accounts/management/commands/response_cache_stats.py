@@ -0,0 +1,29 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from accounts.response_cache import reset_stats, stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Report response cache hits, misses and hit ratio per resource. Only counters in a shared '
+        'cache backend are visible here; with the default local-memory backend, read them from the '
+        'admin-only /api/response-cache/stats/ endpoint of the serving process instead.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--json', action='store_true', help='Print one JSON object, for monitoring agents')
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after reporting')
+
+    def handle(self, *args, **options):
+        result = stats()
+        if options['json']:
+            self.stdout.write(json.dumps(result))
+        else:
+            self.stdout.write(f"{'resource':<16} {'hits':>10} {'misses':>10} {'hit ratio':>10}")
+            for resource, counts in result.items():
+                ratio = '-' if counts['hit_ratio'] is None else f"{counts['hit_ratio']:.1%}"
+                self.stdout.write(f"{resource:<16} {counts['hits']:>10} {counts['misses']:>10} {ratio:>10}")
+        if options['reset']:
+            reset_stats()
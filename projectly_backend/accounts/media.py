@@ -0,0 +1,176 @@
+# accounts/media.py
+import posixpath
+import re
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from rest_framework.utils.urls import replace_query_param
+
+from .access import project_access_for
+from .models import Attachment, FileShare, ReportFile
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def normalize_media_path(path):
+    """Reject anything that could climb out of MEDIA_ROOT; returns the storage name or None."""
+    name = posixpath.normpath(path).lstrip('/')
+    if name in ('', '.') or name.startswith('..') or '\\' in name or name.startswith('.uploads/'):
+        return None
+    return name
+
+
+CONTENT_ADDRESSED_PREFIXES = ('blobs/', 'previews/')
+
+
+def _blob_key(name):
+    # Blobs and their previews are named after the blob's SHA-256
+    return posixpath.basename(name)[:64]
+
+
+def _file_lookup(name):
+    # Blob and preview paths carry the blob's key, which is indexed; older files match on name
+    if name.startswith(CONTENT_ADDRESSED_PREFIXES):
+        return Q(blob_id=_blob_key(name))
+    return Q(file=name)
+
+
+def _first_row(candidates):
+    for queryset in candidates:
+        row = queryset.only('id', 'file', 'original_name').first()
+        if row is not None:
+            return row
+    return None
+
+
+def media_row(name):
+    """Any FileShare, Attachment or ReportFile using ``name``, or None."""
+    lookup = _file_lookup(name)
+    return _first_row(model.objects.filter(lookup) for model in (FileShare, Attachment, ReportFile))
+
+
+def readable_media(user_id, name):
+    """A FileShare, Attachment or ReportFile using ``name`` that the user may see, or None."""
+    project_ids = project_access_for(user_id).project_ids('view')
+    lookup = _file_lookup(name)
+    return _first_row((
+        FileShare.objects.filter(lookup).filter(
+            Q(uploaded_by_id=user_id) | Q(shared_with__id=user_id) | Q(project_id__in=project_ids)
+        ),
+        Attachment.objects.filter(lookup, project_id__in=project_ids),
+        ReportFile.objects.filter(lookup).filter(
+            Q(report__created_by_id=user_id) | Q(report__shared_with__id=user_id)
+            | Q(report__project_id__in=project_ids)
+        ),
+    ))
+
+
+def can_read_media(user_id, name):
+    """Whether any FileShare, Attachment or ReportFile that uses ``name`` is visible to the user."""
+    return readable_media(user_id, name) is not None
+
+
+def media_url_window():
+    return getattr(settings, 'MEDIA_URL_MAX_AGE', 60 * 60)
+
+
+def media_url_epoch():
+    """Start of the current signing window; signed URLs stay the same within it."""
+    window = media_url_window()
+    return int(time.time()) // window * window
+
+
+class MediaSigner(signing.TimestampSigner):
+    # Stamping the window start instead of the current second keeps a file's
+    # URL stable across listings, so conditional GETs can keep serving it
+    def timestamp(self):
+        return signing.b62_encode(media_url_epoch())
+
+
+def _signer():
+    return MediaSigner(salt='accounts.media')
+
+
+def sign_media_url(url, name):
+    """``url`` with a ``signature`` that opens ``name`` without credentials.
+
+    Links opened by the browser (``<a href>``, ``<img src>``) carry no
+    Authorization header, so views that already decided the caller may see a
+    file hand out its URL signed. The signature holds for one to two
+    ``MEDIA_URL_MAX_AGE`` windows.
+    """
+    signature = _signer().sign(name)[len(name) + 1:]
+    return replace_query_param(url, 'signature', signature)
+
+
+def media_signature_valid(name, signature):
+    try:
+        _signer().unsign(f'{name}:{signature}', max_age=2 * media_url_window())
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def file_etag(name, stat):
+    # Blob content never changes under its name, so the digest is a strong validator
+    if name.startswith('blobs/'):
+        return f'"{_blob_key(name)}"'
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def parse_range(header, size):
+    """Return ``(start, end)`` for a single ``bytes=`` range, None to send the whole file.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header else None
+    if match is None:
+        # Multiple or malformed ranges: serving the whole file is always allowed
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError('empty suffix range')
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError('range not satisfiable')
+    return start, end
+
+
+class FileRange:
+    """A window onto an open file that FileResponse streams without reading past ``end``.
+
+    ``fileno``/``tell`` are exposed so servers with ``wsgi.file_wrapper``
+    (gunicorn, uWSGI) can hand the window to ``os.sendfile`` instead.
+    """
+
+    def __init__(self, f, start, end):
+        self.f = f
+        self.name = f.name
+        f.seek(start)
+        self.remaining = end - start + 1
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size is None or size < 0 else min(size, self.remaining)
+        data = self.f.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.f.fileno()
+
+    def tell(self):
+        return self.f.tell()
+
+    def close(self):
+        self.f.close()
+
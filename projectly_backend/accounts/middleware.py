@@ -0,0 +1,21 @@
+# accounts/middleware.py
+from .routers import pin_to_primary, replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaPinMiddleware:
+    """Pin the caller to the primary database for a moment after a successful write.
+
+    Replicas lag the primary, so without this a client that creates a task
+    and immediately reloads the list could be served a list without it.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replicas():
+            pin_to_primary(request, response)
+        return response
@@ -0,0 +1,48 @@
+# Generated by Django 5.2 on 2026-10-18 10:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0007_task_subtask_external_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='boardlist',
+            index=models.Index(fields=['board', 'position'], name='boardlist_board_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['list', 'position'], name='card_list_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at'], name='notification_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('is_read', False)), fields=['user', '-created_at'], name='notification_unread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'status'], name='task_assignee_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['due_date'], name='task_due_date_idx'),
+        ),
+        # Membership checks list a user's projects; covering (user_id, project_id)
+        # answers that from the index alone. The through table is auto-created,
+        # so there is no Meta to declare it on.
+        migrations.RunSQL(
+            'CREATE INDEX project_members_user_idx ON accounts_project_members (user_id, project_id)',
+            reverse_sql='DROP INDEX project_members_user_idx',
+        ),
+    ]
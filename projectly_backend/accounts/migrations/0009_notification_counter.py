@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 10:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_counters(apps, schema_editor):
+    Notification = apps.get_model('accounts', 'Notification')
+    NotificationCounter = apps.get_model('accounts', 'NotificationCounter')
+    unread = (
+        Notification.objects.filter(is_read=False)
+        .values('user').annotate(unread=Count('id')).values_list('user', 'unread')
+    )
+    NotificationCounter.objects.bulk_create(
+        (NotificationCounter(user_id=user_id, unread=count) for user_id, count in unread),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0008_query_shape_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('unread', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
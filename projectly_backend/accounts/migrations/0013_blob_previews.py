@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 10:46
+
+import accounts.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0012_blob_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlobPreview',
+            fields=[
+                ('blob', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='preview', serialize=False, to='accounts.blob')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('ready', 'Ready'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('mime_type', models.CharField(blank=True, max_length=100)),
+                ('width', models.PositiveIntegerField(blank=True, null=True)),
+                ('height', models.PositiveIntegerField(blank=True, null=True)),
+                ('page_count', models.PositiveIntegerField(blank=True, null=True)),
+                ('thumbnail', models.FileField(blank=True, max_length=255, upload_to=accounts.models.preview_path)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2 on 2026-10-18 11:19
+
+import os
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_original_names(apps, schema_editor):
+    """Recover the names that blob-backed rows replaced with the blob's path, where they were kept."""
+    FileShare = apps.get_model('accounts', 'FileShare')
+    Attachment = apps.get_model('accounts', 'Attachment')
+    UploadSession = apps.get_model('accounts', 'UploadSession')
+    FileShare.objects.filter(blob__isnull=False).update(original_name=Coalesce(
+        Subquery(UploadSession.objects.filter(file_share=OuterRef('pk')).values('filename')[:1]), Value(''),
+    ))
+    # Attachment.name was set from the upload's name before it was stored as a blob
+    for attachment in Attachment.objects.filter(blob__isnull=False).exclude(name='').only('id', 'name'):
+        Attachment.objects.filter(pk=attachment.pk).update(original_name=os.path.basename(attachment.name)[:255])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_claims_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='fileshare',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='reportfile',
+            name='original_name',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.RunPython(backfill_original_names, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,225 @@
+# accounts/mixins.py
+import hashlib
+from functools import lru_cache
+
+from django.conf import settings
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from .access import get_project_access
+from .media import media_url_epoch
+from .models import Project
+from .response_cache import get_response_data, response_key, set_response_data
+from .streaming import stream_json, stream_ndjson
+from .routers import is_pinned_to_primary, read_from_replica, reading_from_replica, stop_reading_from_replica
+from .versions import get_last_modified, get_version, model_version_key
+
+
+class EagerLoadingMixin:
+    """Apply a view's declared ``select_related``/``prefetch_related`` plan.
+
+    Views keep their own ``get_queryset`` for scoping; the loading plan is
+    layered on in ``filter_queryset`` so list, detail and streaming paths
+    all share it and serializers read related rows from the caches.
+    """
+    select_related = ()
+    prefetch_related = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+class StreamingListMixin:
+    """Let bulk consumers read a whole list as a stream instead of one rendered body.
+
+    ``?stream=json`` sends the same JSON array the plain response would;
+    ``?stream=ndjson`` sends one object per line. Either way rows are
+    serialized and encoded in batches, so memory stays flat.
+    """
+    streams = {'json': stream_json, 'ndjson': stream_ndjson}
+    stream_ordering = ()
+
+    def list(self, request, *args, **kwargs):
+        stream = self.streams.get(request.query_params.get('stream'))
+        if stream is None:
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.stream_ordering:
+            queryset = queryset.order_by(*self.stream_ordering)
+        return stream(queryset, self.get_serializer_class(), self.get_serializer_context())
+
+
+class ConditionalGetMixin:
+    """Answer ``If-None-Match``/``If-Modified-Since`` with 304 before serializing.
+
+    The validator is derived from version counters that signals bump on
+    every write, so checking it costs a couple of cache reads. Views list the
+    models their payload depends on in ``conditional_models``, or override
+    ``get_validator_keys()`` for narrower scopes such as a single board.
+    """
+    conditional_models = ()
+    # Payloads with signed media URLs change with the signing window
+    signed_media = False
+
+    def get_validator_keys(self):
+        return [('model', model_version_key(model)) for model in self.conditional_models]
+
+    def get_validators(self):
+        keys = self.get_validator_keys()
+        versions = [get_version(namespace, key) for namespace, key in keys]
+        stamps = [get_last_modified(namespace, key) for namespace, key in keys]
+        if self.signed_media:
+            epoch = media_url_epoch()
+            versions.append(epoch)
+            stamps.append(epoch)
+
+        user = self.request.user
+        identity = user.pk if user.is_authenticated else ''
+        source = '|'.join(str(part) for part in (
+            self.request.get_full_path(), identity, self.request.accepted_renderer.format, *versions
+        ))
+        etag = quote_etag(hashlib.md5(source.encode()).hexdigest())
+        last_modified = max(stamps) if stamps and None not in stamps else None
+        return etag, last_modified
+
+    def is_not_modified(self, request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            etags = parse_etags(if_none_match)
+            return '*' in etags or any(tag.removeprefix('W/') == etag for tag in etags)
+        if_modified_since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+        return bool(if_modified_since and last_modified and int(last_modified) <= if_modified_since)
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        if self.is_not_modified(request, etag, last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = super().get(request, *args, **kwargs)
+
+        # A lagging replica's rows may predate the counters, and a body sent
+        # under a newer ETag would then be kept by every 304. A 304 is still
+        # safe: the client's copy came from the primary at this version.
+        validated = response.status_code == status.HTTP_304_NOT_MODIFIED or (
+            response.status_code == status.HTTP_200_OK and not reading_from_replica()
+        )
+        if validated:
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            # Let clients keep the payload but revalidate on every poll
+            response['Cache-Control'] = 'no-cache'
+            patch_vary_headers(response, ('Authorization',))
+        return response
+
+
+class ProjectAccessMixin:
+    """Scope querysets by the project ids the user can reach.
+
+    Access is resolved once per request (see ``accounts.access``), so views
+    filter with ``project_id__in`` instead of joining through
+    ``project__members`` on every query.
+    """
+
+    def required_level(self):
+        if self.request.method in SAFE_METHODS:
+            return 'view'
+        return 'admin' if self.request.method == 'DELETE' else 'edit'
+
+    def accessible_project_ids(self, level=None):
+        return get_project_access(self.request).project_ids(level or self.required_level())
+
+    def filter_by_project(self, queryset, project_id):
+        """Limit ``queryset`` to one project, or to nothing if the user cannot see it."""
+        if get_project_access(self.request).can(project_id, self.required_level()):
+            return queryset.filter(project_id=project_id)
+        return queryset.none()
+
+    def get_accessible_project(self, project_id, level='edit'):
+        if not get_project_access(self.request).can(project_id, level):
+            raise Http404('No Project matches the given query.')
+        return get_object_or_404(Project, id=project_id)
+
+
+class ProjectResponseCacheMixin:
+    """Serve GETs from the per-project response cache (see ``accounts.response_cache``).
+
+    Entries are keyed by project, ``cache_resource``, the caller's access
+    level and the full path, and die when a signal invalidates the
+    resource. Only primary reads fill the cache. Views whose URL does not
+    name the project override ``get_cache_project_id()``.
+    """
+    cache_resource = None
+
+    def get_cache_project_id(self):
+        return self.kwargs.get('project_id')
+
+    def get(self, request, *args, **kwargs):
+        project_id = self.get_cache_project_id()
+        if project_id is None:
+            return super().get(request, *args, **kwargs)
+        level = get_project_access(request).levels.get(int(project_id))
+        key = response_key(
+            project_id, self.cache_resource, level, request.get_full_path(), request.accepted_renderer.format
+        )
+        data = get_response_data(key, self.cache_resource)
+        if data is not None:
+            return Response(data)
+        response = super().get(request, *args, **kwargs)
+        # A lagging replica's rows would be served under the new generation to everyone
+        if response.status_code == status.HTTP_200_OK and not reading_from_replica():
+            set_response_data(key, response.data)
+        return response
+
+
+@lru_cache(maxsize=None)
+def _authentication_classes(paths):
+    return [import_string(path) for path in paths]
+
+
+class AuthenticationGroupMixin:
+    """Authenticate with the backends ``settings.AUTHENTICATION_GROUPS`` lists for this view's group.
+
+    Lets a group of endpoints move to (or back from) the stateless JWT
+    backend in settings; views outside any group keep DRF's defaults.
+    """
+    authentication_group = None
+
+    def get_authenticators(self):
+        paths = getattr(settings, 'AUTHENTICATION_GROUPS', {}).get(self.authentication_group)
+        if paths is None:
+            return super().get_authenticators()
+        return [auth() for auth in _authentication_classes(tuple(paths))]
+
+
+class ReplicaReadMixin:
+    """Serve this view's safe requests from a read replica.
+
+    Opt in only where slightly stale rows are acceptable. Callers who wrote
+    within ``REPLICA_PIN_SECONDS`` keep reading from the primary, so they
+    see their own changes.
+
+    List it before ``ConditionalGetMixin``, which then leaves validators
+    off bodies read from the replica.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and not is_pinned_to_primary(request):
+            self._replica_token = read_from_replica()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        stop_reading_from_replica(getattr(self, '_replica_token', None))
+        self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,3 +1,5 @@
+import os
+import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
 from django.core.validators import validate_email
@@ -64,6 +66,36 @@ class User(AbstractUser):
 
     objects = UserManager()
 
+class ClaimsUser(User):
+    """A User built from signed access-token claims rather than a database row.
+
+    ``pk``, ``is_active`` and ``role`` come from the token. Any other column
+    is deferred, and the first one read loads them all in a single query, so
+    views that only need the id never touch the user table.
+    """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def from_claims(cls, user_id, is_active=True, role=None, using='default'):
+        user = cls.from_db(using, ['id', 'is_active'], [user_id, is_active])
+        user._role = role
+        return user
+
+    @property
+    def role(self):
+        if getattr(self, '_role', None) is None:
+            # Tokens issued before the role claim existed
+            self._role = UserProfile.objects.filter(user_id=self.pk).values_list('role', flat=True).first() or ''
+        return self._role
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred and set(fields) <= deferred:
+            fields = deferred
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
 class UserProfile(models.Model):
     user = models.OneToOneField(
         User, 
@@ -134,6 +166,9 @@ class BoardList(models.Model):
     
     class Meta:
         ordering = ['position']
+        indexes = [
+            models.Index(fields=['board', 'position'], name='boardlist_board_position_idx'),
+        ]
     
     def __str__(self):
         return f"{self.board} - {self.name}"
@@ -149,11 +184,82 @@ class Card(models.Model):
     
     class Meta:
         ordering = ['position']
+        indexes = [
+            models.Index(fields=['list', 'position'], name='card_list_position_idx'),
+        ]
     
     def __str__(self):
         return self.title
 
-class Attachment(models.Model):
+def blob_path(instance, filename):
+    # Fan out over two directory levels so no directory grows huge
+    return f'blobs/{instance.sha256[:2]}/{instance.sha256[2:4]}/{instance.sha256}'
+
+class Blob(models.Model):
+    """File content stored once, under its SHA-256, and shared by every row that uploads it."""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    size = models.BigIntegerField()
+    file = models.FileField(upload_to=blob_path, max_length=255)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    # When ref_count last dropped to zero; gc_blobs deletes blobs orphaned long enough
+    orphaned_at = models.DateTimeField(null=True, blank=True, db_index=True)
+
+    def __str__(self):
+        return f"{self.sha256} ({self.ref_count} refs)"
+
+def preview_path(instance, filename):
+    # Derivatives sit next to their blob's fan-out and are named after it
+    sha256 = instance.blob_id
+    return f'previews/{sha256[:2]}/{sha256[2:4]}/{sha256}.jpg'
+
+class BlobPreview(models.Model):
+    """Thumbnail and metadata derived once per blob by ``accounts.previews``."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    blob = models.OneToOneField(Blob, on_delete=models.CASCADE, primary_key=True, related_name='preview')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    mime_type = models.CharField(max_length=100, blank=True)
+    width = models.PositiveIntegerField(null=True, blank=True)
+    height = models.PositiveIntegerField(null=True, blank=True)
+    page_count = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail = models.FileField(upload_to=preview_path, max_length=255, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Preview of {self.blob_id} ({self.status})"
+
+class BlobBackedModel(models.Model):
+    """Base for models whose ``file`` is stored in the shared blob store.
+
+    New uploads are hashed and deduplicated on save (see ``accounts.signals``);
+    ``file`` then names the blob's path and ``original_name`` keeps the name
+    the file was uploaded under. Rows saved before the blob store existed
+    have no blob and keep their own file.
+    """
+    blob = models.ForeignKey(Blob, on_delete=models.PROTECT, null=True, blank=True, related_name='+')
+    original_name = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets post_save move the reference when a row is pointed at another blob
+        instance._loaded_blob_id = instance.__dict__.get('blob_id', UNKNOWN)
+        return instance
+
+    @property
+    def filename(self):
+        """The name to show and download the file as."""
+        return self.original_name or os.path.basename(self.file.name or '')
+
+class Attachment(BlobBackedModel):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='attachments')
     file = models.FileField(upload_to='attachments/')
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -192,6 +298,17 @@ class Communication(models.Model):
         return self.subject
 
 # models.py
+UNKNOWN = object()
+
+class TaskQuerySet(models.QuerySet):
+    def with_subtask_rollups(self):
+        """Annotate subtask totals and the next open due date, computed in SQL."""
+        return self.annotate(
+            subtask_count=models.Count('subtasks'),
+            completed_subtask_count=models.Count('subtasks', filter=models.Q(subtasks__completed=True)),
+            next_subtask_due_date=models.Min('subtasks__due_date', filter=models.Q(subtasks__completed=False)),
+        )
+
 class Task(models.Model):
     STATUS_CHOICES = [
         ('to do', 'To Do'),
@@ -207,6 +324,25 @@ class Task(models.Model):
     project = models.ForeignKey(Project, on_delete=models.CASCADE, null=True, blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_tasks')
     created_at = models.DateTimeField(auto_now_add=True)
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)  # Key used by bulk upserts
+
+    objects = TaskQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the assignee as loaded so post_save can diff without a query
+        instance._loaded_assigned_to_id = instance.__dict__.get('assigned_to_id', UNKNOWN)
+        return instance
+
+    class Meta:
+        indexes = [
+            # Keyset pagination walks tasks in (created_at, id) order
+            models.Index(fields=['created_at', 'id'], name='task_created_id_idx'),
+            models.Index(fields=['project', 'status'], name='task_project_status_idx'),
+            models.Index(fields=['assigned_to', 'status'], name='task_assignee_status_idx'),
+            models.Index(fields=['due_date'], name='task_due_date_idx'),
+        ]
 
 class Notification(models.Model):
     TYPE_CHOICES = [
@@ -226,10 +362,57 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_user_created_idx'),
+            # The bell only ever asks for unread rows, so keep that index small
+            models.Index(
+                fields=['user', '-created_at'],
+                condition=models.Q(is_read=False),
+                name='notification_unread_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.email} - {self.get_notification_type_display()}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets post_save tell whether a save flipped is_read
+        instance._loaded_is_read = instance.__dict__.get('is_read', UNKNOWN)
+        return instance
+
+class NotificationArchive(models.Model):
+    """Notifications moved out of the hot table by the retention policy."""
+    id = models.BigIntegerField(primary_key=True)  # Same id the row had in Notification
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+    notification_type = models.CharField(max_length=20, choices=Notification.TYPE_CHOICES)
+    message = models.TextField()
+    # Plain ids: archived rows outlive the tasks and projects they mention
+    related_task_id = models.BigIntegerField(null=True, blank=True)
+    related_project_id = models.BigIntegerField(null=True, blank=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='notification_archive_user_idx'),
+            models.Index(fields=['created_at'], name='notification_archive_age_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.notification_type} (archived)"
+
+class NotificationCounter(models.Model):
+    """Unread notifications per user, kept in step with Notification writes."""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='notification_counter')
+    unread = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
 class GanttChart(models.Model):
     project = models.OneToOneField(Project, on_delete=models.CASCADE, related_name='gantt_chart')
     created_at = models.DateTimeField(auto_now_add=True)
@@ -268,7 +451,7 @@ class Report(models.Model):
     def __str__(self):
         return f"{self.get_report_type_display()} - {self.title}"
 
-class ReportFile(models.Model):
+class ReportFile(BlobBackedModel):
     report = models.ForeignKey(Report, on_delete=models.CASCADE, related_name='files')
     file = models.FileField(upload_to='reports/%Y/%m/%d/')
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -284,11 +467,12 @@ class SubTask(models.Model):
     due_date = models.DateField(null=True, blank=True)
     completed = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    external_id = models.CharField(max_length=100, unique=True, null=True, blank=True)  # Key used by bulk upserts
     
     def __str__(self):
         return f"Subtask: {self.title} for {self.parent_task.title}"
 
-class FileShare(models.Model):
+class FileShare(BlobBackedModel):
     file = models.FileField(upload_to='shared_files/%Y/%m/%d/')
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='uploaded_files')
     uploaded_at = models.DateTimeField(auto_now_add=True)
@@ -296,7 +480,29 @@ class FileShare(models.Model):
     project = models.ForeignKey('Project', on_delete=models.CASCADE, null=True, blank=True)
     
     def __str__(self):
-        return f"Shared file: {self.file.name}"
+        return f"Shared file: {self.filename}"
+
+class UploadSession(models.Model):
+    """A resumable upload: chunks are appended to a partial file until ``offset == size``."""
+    STATUS_CHOICES = [
+        ('active', 'Active'),
+        ('complete', 'Complete'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_sessions')
+    project = models.ForeignKey('Project', on_delete=models.CASCADE, null=True, blank=True)
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)  # Bytes received and on disk
+    sha256 = models.CharField(max_length=64, blank=True)  # Expected digest of the whole file, if given
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    file_share = models.ForeignKey(FileShare, on_delete=models.SET_NULL, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.filename} ({self.offset}/{self.size})"
 
 class AccessPermission(models.Model):
     PERMISSION_CHOICES = [
@@ -0,0 +1,116 @@
+# accounts/notifications.py
+import threading
+from collections import Counter, defaultdict
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .models import Notification, NotificationCounter, Task
+from .realtime import publish_notification
+
+
+# Notifications waiting for a commit, oldest first, per thread and connection alias
+_pending = threading.local()
+
+
+def _queued(alias):
+    if not hasattr(_pending, 'queues'):
+        _pending.queues = defaultdict(list)
+    return _pending.queues[alias]
+
+
+def _flush_from(alias, notification):
+    """Commit hook of ``notification``: write it and everything queued after it.
+
+    Every queued notification registers this hook, so the first one to run
+    after a commit writes the transaction's whole batch and the rest find
+    nothing left to do. Anything queued before it had its hook discarded by
+    a rollback and is dropped.
+    """
+    queue = _queued(alias)
+    index = next((i for i, queued in enumerate(queue) if queued is notification), None)
+    if index is None:
+        return
+    batch = queue[index:]
+    queue.clear()
+
+    # Drop rows whose task was deleted before the commit landed
+    task_ids = {n.related_task_id for n in batch if n.related_task_id}
+    if task_ids:
+        existing = set(Task.objects.using(alias).filter(id__in=task_ids).values_list('id', flat=True))
+        batch = [n for n in batch if n.related_task_id is None or n.related_task_id in existing]
+    create_notifications(batch)
+
+
+def queue_notification(notification):
+    """Create ``notification`` once the current transaction commits.
+
+    Everything queued inside one transaction is written with a single
+    ``bulk_create``, so mass reassignments cost one INSERT per commit.
+    """
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        create_notifications([notification])
+        return
+    _queued(connection.alias).append(notification)
+    transaction.on_commit(partial(_flush_from, connection.alias, notification), using=connection.alias)
+
+
+def create_notifications(notifications):
+    """Insert ``notifications`` in one query and push them to open streams."""
+    if not notifications:
+        return []
+    with transaction.atomic():
+        created = Notification.objects.bulk_create(notifications)
+        adjust_unread_counts(Counter(n.user_id for n in created if not n.is_read))
+    # bulk_create skips post_save, so publish here instead of in the signal
+    for notification in created:
+        transaction.on_commit(lambda notification=notification: publish_notification(notification))
+    return created
+
+
+def adjust_unread_counts(deltas):
+    """Apply ``{user_id: delta}`` to the unread counters.
+
+    Users sharing a delta are updated together, so creating one notification
+    each for a whole project is two queries however large the project is.
+    """
+    by_delta = defaultdict(list)
+    for user_id, delta in deltas.items():
+        if delta:
+            by_delta[delta].append(user_id)
+    if not by_delta:
+        return
+    with transaction.atomic():
+        # Users without a counter row have nothing unread yet; only increments need one
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=user_id) for user_id, delta in deltas.items() if delta > 0],
+            ignore_conflicts=True,
+        )
+        for delta, user_ids in by_delta.items():
+            NotificationCounter.objects.filter(user_id__in=user_ids).update(
+                unread=Greatest(F('unread') + delta, 0)
+            )
+
+
+def unread_count(user):
+    return NotificationCounter.objects.filter(user=user).values_list('unread', flat=True).first() or 0
+
+
+def mark_notifications_read(user, ids=None, before=None):
+    """Mark the user's unread notifications read in one UPDATE; returns how many changed.
+
+    ``ids`` limits the update to those notifications and ``before`` to ones
+    created at or before that time; with neither, everything is marked read.
+    """
+    notifications = Notification.objects.filter(user=user, is_read=False)
+    if ids is not None:
+        notifications = notifications.filter(id__in=ids)
+    if before is not None:
+        notifications = notifications.filter(created_at__lte=before)
+    with transaction.atomic():
+        marked = notifications.update(is_read=True)
+        adjust_unread_counts({user.pk: -marked})
+    return marked
@@ -0,0 +1,203 @@
+# accounts/previews.py
+import logging
+import re
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, close_old_connections, transaction
+
+from .models import Blob, BlobPreview, FileShare
+from .versions import bump_model_version
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; without it previews carry metadata only
+    Image = ImageOps = None
+
+logger = logging.getLogger(__name__)
+
+SNIFF_SIZE = 64 * 1024
+SCAN_SIZE = 1024 * 1024
+
+SIGNATURES = (
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+    (b'%PDF-', 'application/pdf'),
+    (b'BM', 'image/bmp'),
+    (b'PK\x03\x04', 'application/zip'),
+)
+
+# /Type /Page but not /Type /Pages
+PDF_PAGE_RE = re.compile(rb'/Type\s*/Page(?![A-Za-z])')
+
+
+def preview_workers():
+    return getattr(settings, 'PREVIEW_WORKERS', 2)
+
+
+def sniff_mime_type(head):
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    for signature, mime_type in SIGNATURES:
+        if head.startswith(signature):
+            return mime_type
+    return 'application/octet-stream'
+
+
+def _jpeg_size(f):
+    """Walk the JPEG markers to the first frame header; EXIF can push it past the sniffed head."""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return None
+        if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+            continue
+        length = f.read(2)
+        if len(length) < 2:
+            return None
+        (length,) = struct.unpack('>H', length)
+        if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack('>xHH', f.read(5))
+            return width, height
+        f.seek(length - 2, 1)
+
+
+def image_size(f, head, mime_type):
+    """Read dimensions from the header alone, without decoding any pixels."""
+    if mime_type == 'image/png' and len(head) >= 24:
+        return struct.unpack('>II', head[16:24])
+    if mime_type == 'image/gif' and len(head) >= 10:
+        return struct.unpack('<HH', head[6:10])
+    if mime_type == 'image/bmp' and len(head) >= 26:
+        width, height = struct.unpack('<ii', head[18:26])
+        return width, abs(height)
+    if mime_type == 'image/jpeg':
+        return _jpeg_size(f)
+    return None
+
+
+def pdf_page_count(f):
+    """Count page objects in overlapping blocks so memory stays flat for large PDFs.
+
+    Pages inside compressed object streams are invisible to this scan; the
+    count is then left unknown rather than guessed.
+    """
+    f.seek(0)
+    pages, tail = 0, b''
+    for block in iter(lambda: f.read(SCAN_SIZE), b''):
+        window = tail + block
+        # Only count matches that start in the new data, so none is seen twice
+        pages += sum(1 for match in PDF_PAGE_RE.finditer(window) if match.start() >= len(tail))
+        tail = window[-32:]
+    return pages or None
+
+
+def render_thumbnail(f):
+    """JPEG bytes of a thumbnail of the image in ``f``, or None if Pillow cannot or should not."""
+    if Image is None:
+        return None
+    f.seek(0)
+    try:
+        with Image.open(f) as image:
+            if image.width * image.height > getattr(settings, 'PREVIEW_MAX_PIXELS', 50_000_000):
+                return None
+            size = tuple(getattr(settings, 'PREVIEW_THUMBNAIL_SIZE', (320, 320)))
+            # Lets the JPEG decoder scale by 1/2..1/8 while decoding instead of afterwards
+            image.draft('RGB', size)
+            thumbnail = ImageOps.exif_transpose(image)
+            thumbnail.thumbnail(size)
+            if thumbnail.mode not in ('RGB', 'L'):
+                thumbnail = thumbnail.convert('RGB')
+            out = BytesIO()
+            thumbnail.save(out, 'JPEG', quality=80, optimize=True)
+            return out.getvalue()
+    except (OSError, Image.DecompressionBombError):
+        # Truncated or undecodable: the header metadata is still worth keeping
+        logger.warning('Could not render a thumbnail', exc_info=True)
+        return None
+
+
+def describe(preview, f):
+    head = f.read(SNIFF_SIZE)
+    preview.mime_type = sniff_mime_type(head)
+    if preview.mime_type.startswith('image/'):
+        size = image_size(f, head, preview.mime_type)
+        if size:
+            preview.width, preview.height = size
+        thumbnail = render_thumbnail(f)
+        if thumbnail is not None:
+            if preview.thumbnail:
+                preview.thumbnail.delete(save=False)
+            preview.thumbnail.save('thumbnail.jpg', ContentFile(thumbnail), save=False)
+    elif preview.mime_type == 'application/pdf':
+        preview.page_count = pdf_page_count(f)
+
+
+def generate_preview(sha256):
+    """Derive the preview for blob ``sha256``; content is immutable, so a ready preview is final."""
+    blob = Blob.objects.filter(pk=sha256).first()
+    if blob is None:
+        # Collected before the worker got to it
+        return None
+    try:
+        preview, _ = BlobPreview.objects.get_or_create(blob=blob)
+    except IntegrityError:
+        preview = BlobPreview.objects.get(blob=blob)
+    if preview.status == 'ready':
+        return preview
+
+    try:
+        with default_storage.open(blob.file.name, 'rb') as f:
+            describe(preview, f)
+    except Exception:
+        logger.exception('Could not generate a preview for blob %s', sha256)
+        preview.status = 'failed'
+    else:
+        preview.status = 'ready'
+    preview.save()
+    # File listings embed previews, so their conditional-GET validators must move
+    bump_model_version(FileShare)
+    return preview
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=preview_workers(), thread_name_prefix='previews')
+    return _executor
+
+
+def _run(sha256):
+    try:
+        generate_preview(sha256)
+    finally:
+        # Pool threads outlive requests, so nothing else closes their connections
+        close_old_connections()
+
+
+def schedule_preview(sha256):
+    """Generate ``sha256``'s preview once the blob is committed.
+
+    Work runs on a small in-process thread pool so uploads return without
+    waiting; ``PREVIEW_WORKERS = 0`` runs it inline instead.
+    """
+    def submit():
+        if preview_workers() > 0:
+            _get_executor().submit(_run, sha256)
+        else:
+            generate_preview(sha256)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,102 @@
+# accounts/realtime.py
+import asyncio
+import threading
+from collections import defaultdict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+DEFAULT_BROKER = 'accounts.realtime.InProcessBroker'
+SUBSCRIPTION_QUEUE_SIZE = 100
+
+
+class Subscription:
+    """A single connection's queue of pending messages."""
+
+    def __init__(self, broker, user_id):
+        self.broker = broker
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+
+    def offer(self, message):
+        # Runs on the subscriber's loop; a client that stopped reading loses
+        # its oldest messages rather than growing the queue without bound.
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class InProcessBroker:
+    """Pub/sub between threads and event loops of this process.
+
+    ``publish`` may be called from any thread (typically a sync view's
+    ``on_commit`` hook); delivery hops onto each subscriber's event loop.
+    Run one process, or swap in a broker backed by a shared channel, when
+    serving from several workers.
+    """
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, user_id):
+        subscription = Subscription(self, user_id)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+
+    def publish(self, user_id, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                subscription.close()
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    """Return the broker named by ``settings.NOTIFICATION_BROKER``."""
+    return import_string(getattr(settings, 'NOTIFICATION_BROKER', DEFAULT_BROKER))()
+
+
+@receiver(setting_changed)
+def reset_broker(setting, **kwargs):
+    if setting == 'NOTIFICATION_BROKER':
+        get_broker.cache_clear()
+
+
+def notification_message(notification):
+    return {
+        'id': notification.id,
+        'notification_type': notification.notification_type,
+        'message': notification.message,
+        'related_task': notification.related_task_id,
+        'related_project': notification.related_project_id,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at,
+    }
+
+
+def publish_notification(notification):
+    get_broker().publish(notification.user_id, notification_message(notification))
@@ -0,0 +1,63 @@
+# accounts/renderers.py
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Datetimes go through DRF's encoder so both paths format them identically
+_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    # Decimal, lazy translations, querysets, ...: whatever DRF's encoder knows
+    return _encoder.default(obj)
+
+
+def _escape_line_separators(content):
+    # As DRF does: U+2028/U+2029 are valid JSON but end a line in JavaScript
+    return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def dumps(data):
+    """Encode ``data`` as compact UTF-8 JSON bytes, with orjson when it is installed.
+
+    The result decodes to the same value as DRF's rendering, but the bytes
+    are not always identical: orjson writes ``1e16`` where ``json`` writes
+    ``1e+16``. NaN and Infinity become ``null`` instead of the error DRF
+    raises. Integers wider than 64 bits, which orjson cannot encode, take the
+    stdlib path.
+    """
+    if orjson is not None:
+        try:
+            return _escape_line_separators(orjson.dumps(data, default=_default, option=_OPTIONS))
+        except orjson.JSONEncodeError:
+            pass
+    return JSONRenderer().render(data)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer that encodes with orjson, several times faster than ``json``.
+
+    Output decodes like DRF's compact, unicode rendering (see ``dumps``
+    for where the bytes differ). Without orjson, or
+    when a client asks for indented JSON or the project turns off compact
+    or unicode output, it renders exactly like JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or not api_settings.COMPACT_JSON
+            or not api_settings.UNICODE_JSON
+            or self.get_indent(accepted_media_type or '', renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        return dumps(data)
@@ -0,0 +1,128 @@
+# accounts/response_cache.py
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Board, BoardList, Card, Communication, Event, GanttChart, GanttTask, Project
+
+CACHE_ALIAS = 'responses'
+RESOURCES = ('project', 'board', 'gantt', 'events', 'communications')
+
+
+def _chart_project(chart_id):
+    return GanttChart.objects.filter(id=chart_id).values_list('project_id', flat=True).first()
+
+
+# The cached resource each model's rows appear in, and how to find their project
+PROJECT_OF = {
+    Project: ('project', lambda obj: obj.pk),
+    Board: ('board', lambda obj: obj.project_id),
+    BoardList: ('board', lambda obj: Board.objects.filter(id=obj.board_id).values_list('project_id', flat=True).first()),
+    Card: ('board', lambda obj: BoardList.objects.filter(id=obj.list_id).values_list('board__project_id', flat=True).first()),
+    Event: ('events', lambda obj: obj.project_id),
+    Communication: ('communications', lambda obj: obj.project_id),
+    GanttChart: ('gantt', lambda obj: obj.project_id),
+    GanttTask: ('gantt', lambda obj: _chart_project(obj.gantt_chart_id)),
+}
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def _generation_key(project_id, resource):
+    return f'response-generation:{project_id}:{resource}'
+
+
+def _stats_key(resource, outcome):
+    return f'response-stats:{resource}:{outcome}'
+
+
+def get_generation(project_id, resource):
+    """The current generation of ``resource`` in ``project_id``; entries of older generations are dead."""
+    cache = get_cache()
+    key = _generation_key(project_id, resource)
+    generation = cache.get(key)
+    if generation is None:
+        # Seeded from the clock, as in versions.py, so an evicted generation never repeats
+        cache.add(key, time.time_ns() // 1000, timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def invalidate(project_id, resource):
+    """Drop every cached response of ``resource`` in ``project_id`` once the transaction commits."""
+    def bump():
+        cache = get_cache()
+        key = _generation_key(project_id, resource)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns() // 1000, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def invalidate_for(instance):
+    """Invalidate the resource ``instance`` appears in, if its project can still be found."""
+    resource, project_of = PROJECT_OF[type(instance)]
+    project_id = project_of(instance)
+    if project_id is not None:
+        invalidate(project_id, resource)
+
+
+def invalidate_project(project_id):
+    for resource in RESOURCES:
+        invalidate(project_id, resource)
+
+
+def response_key(project_id, resource, level, path, format):
+    """Entries are shared by every user with the same access level to the project."""
+    generation = get_generation(project_id, resource)
+    return f'response:{project_id}:{resource}:{generation}:{level or "none"}:{format}:{path}'
+
+
+def get_response_data(key, resource):
+    data = get_cache().get(key)
+    record(resource, 'misses' if data is None else 'hits')
+    return data
+
+
+def set_response_data(key, data):
+    get_cache().set(key, data, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300))
+
+
+def record(resource, outcome):
+    cache = get_cache()
+    key = _stats_key(resource, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counters are best-effort: backends without atomic incr may drop a few
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def _stats_keys():
+    return [_stats_key(resource, outcome) for resource in RESOURCES for outcome in ('hits', 'misses')]
+
+
+def stats():
+    """Hits, misses and hit ratio per resource, across every process sharing the cache."""
+    counts = get_cache().get_many(_stats_keys())
+    result = {}
+    for resource in RESOURCES:
+        hits = counts.get(_stats_key(resource, 'hits'), 0)
+        misses = counts.get(_stats_key(resource, 'misses'), 0)
+        result[resource] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': hits / (hits + misses) if hits + misses else None,
+        }
+    return result
+
+
+def reset_stats():
+    get_cache().delete_many(_stats_keys())
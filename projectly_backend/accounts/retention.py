@@ -0,0 +1,143 @@
+# accounts/retention.py
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive
+from .notifications import adjust_unread_counts
+
+DEFAULT_RETENTION = {
+    'COLLAPSE_TYPES': ['task_assigned'],
+    'ARCHIVE_READ_AFTER_DAYS': 30,
+    'ARCHIVE_ALL_AFTER_DAYS': 180,
+    'PURGE_ARCHIVE_AFTER_DAYS': 730,
+    'BATCH_SIZE': 1000,
+}
+
+ARCHIVED_FIELDS = (
+    'id', 'user_id', 'notification_type', 'message', 'related_task_id',
+    'related_project_id', 'is_read', 'created_at',
+)
+
+
+def retention_policy():
+    return {**DEFAULT_RETENTION, **getattr(settings, 'NOTIFICATION_RETENTION', {})}
+
+
+def _days_ago(days):
+    return timezone.now() - timedelta(days=days) if days is not None else None
+
+
+def superseded_notifications(types):
+    """Notifications of ``types`` with a newer one for the same user and task."""
+    newer = Notification.objects.filter(
+        user=OuterRef('user'),
+        related_task=OuterRef('related_task'),
+        notification_type=OuterRef('notification_type'),
+        id__gt=OuterRef('id'),
+    )
+    return Notification.objects.filter(
+        notification_type__in=types, related_task__isnull=False
+    ).filter(Exists(newer))
+
+
+def expired_notifications(read_before, any_before):
+    queryset = Notification.objects.none()
+    if read_before is not None:
+        queryset = Notification.objects.filter(is_read=True, created_at__lt=read_before)
+    if any_before is not None:
+        queryset = queryset | Notification.objects.filter(created_at__lt=any_before)
+    return queryset
+
+
+def in_batches(queryset, batch_size, pause=0):
+    """Yield lists of rows from ``queryset`` in id order, ``batch_size`` at a time.
+
+    Each batch is fetched with a fresh ``id > last`` query, so rows handled
+    (and removed) by the caller are never rescanned and a run that stops
+    part-way simply resumes from what is left.
+    """
+    last_id = 0
+    while True:
+        batch = list(
+            queryset.filter(id__gt=last_id).order_by('id').values(*ARCHIVED_FIELDS)[:batch_size]
+        )
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1]['id']
+        if pause:
+            time.sleep(pause)
+
+
+def _delete_rows(model, ids):
+    """Delete ``ids`` from ``model``'s table in one statement, without signals or cascades."""
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote(model._meta.pk.column)} IN ({placeholders})',
+            ids,
+        )
+
+
+def _remove(batch, archive):
+    with transaction.atomic():
+        if archive:
+            NotificationArchive.objects.bulk_create(
+                [NotificationArchive(**row) for row in batch], ignore_conflicts=True
+            )
+        # A plain DELETE skips the per-row post_delete signals; the unread
+        # counters are adjusted for the whole batch below instead.
+        _delete_rows(Notification, [row['id'] for row in batch])
+        unread = Counter(row['user_id'] for row in batch if not row['is_read'])
+        adjust_unread_counts({user_id: -count for user_id, count in unread.items()})
+
+
+def collapse_notifications(policy, dry_run=False, pause=0):
+    """Delete repeated notifications about the same task, keeping the newest."""
+    removed = 0
+    for batch in in_batches(superseded_notifications(policy['COLLAPSE_TYPES']), policy['BATCH_SIZE'], pause):
+        if not dry_run:
+            _remove(batch, archive=False)
+        removed += len(batch)
+    return removed
+
+
+def archive_notifications(policy, dry_run=False, pause=0):
+    """Move read notifications past their age, and any past the hard limit, to the archive."""
+    queryset = expired_notifications(
+        _days_ago(policy['ARCHIVE_READ_AFTER_DAYS']), _days_ago(policy['ARCHIVE_ALL_AFTER_DAYS'])
+    )
+    moved = 0
+    for batch in in_batches(queryset, policy['BATCH_SIZE'], pause):
+        if not dry_run:
+            _remove(batch, archive=True)
+        moved += len(batch)
+    return moved
+
+
+def purge_archive(policy, dry_run=False, pause=0):
+    """Delete archived notifications older than the archive's own limit."""
+    cutoff = _days_ago(policy['PURGE_ARCHIVE_AFTER_DAYS'])
+    if cutoff is None:
+        return 0
+    purged, last_id = 0, 0
+    while True:
+        ids = list(
+            NotificationArchive.objects.filter(created_at__lt=cutoff, id__gt=last_id)
+            .order_by('id').values_list('id', flat=True)[:policy['BATCH_SIZE']]
+        )
+        if not ids:
+            return purged
+        if not dry_run:
+            NotificationArchive.objects.filter(id__in=ids).delete()
+        purged += len(ids)
+        last_id = ids[-1]
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,93 @@
+# accounts/routers.py
+import random
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+PIN_COOKIE = 'read_primary_until'
+
+# The replica alias this request's reads go to, or None for the primary
+_replica = ContextVar('replica', default=None)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def pin_seconds():
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+def _pin_key(user_id):
+    return f'replica-pin:{user_id}'
+
+
+def read_from_replica():
+    """Send this request's reads to one replica; returns a token for ``stop_reading_from_replica``.
+
+    One replica is picked for the whole request so its queries see a
+    single, consistent snapshot. Returns None when no replica is configured.
+    """
+    aliases = replicas()
+    if not aliases:
+        return None
+    return _replica.set(random.choice(aliases))
+
+
+def reading_from_replica():
+    return _replica.get() is not None
+
+
+def stop_reading_from_replica(token):
+    if token is not None:
+        _replica.reset(token)
+
+
+def pin_to_primary(request, response):
+    """Read from the primary for ``REPLICA_PIN_SECONDS`` after this request's write.
+
+    Authenticated writers are pinned by user id, which follows them across
+    devices; the cookie covers views that do not authenticate.
+    """
+    seconds = pin_seconds()
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        cache.set(_pin_key(user.pk), True, seconds)
+    response.set_cookie(PIN_COOKIE, str(int(time.time()) + seconds), max_age=seconds, httponly=True, samesite='Lax')
+
+
+def is_pinned_to_primary(request):
+    """Whether the caller wrote within the last ``REPLICA_PIN_SECONDS``."""
+    try:
+        if int(request.COOKIES.get(PIN_COOKIE, 0)) > time.time():
+            return True
+    except ValueError:
+        pass
+    user = request.user
+    return user.is_authenticated and cache.get(_pin_key(user.pk)) is not None
+
+
+class ReplicaRouter:
+    """Route reads to the replica chosen for the request; writes always go to the primary.
+
+    Reads stay on the primary unless a view opted in (see
+    ``ReplicaReadMixin``). A write inside an opted-in request moves the
+    rest of that request's reads back to the primary, so it reads its own
+    writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _replica.get()
+
+    def db_for_write(self, model, **hints):
+        if _replica.get() is not None:
+            _replica.set(None)
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {'default', *replicas()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,217 @@
+# accounts/scheduling.py
+from collections import defaultdict, deque
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import GanttTask
+from .versions import bump_version, get_version
+
+SCHEDULE_TIMEOUT = 60 * 60
+
+
+class DependencyCycleError(Exception):
+    def __init__(self, cycle):
+        super().__init__('Gantt task dependencies contain a cycle')
+        self.cycle = cycle
+
+
+class DependencyGraph:
+    """A chart's tasks and finish-to-start edges, loaded in one query."""
+
+    def __init__(self, tasks, predecessors):
+        self.tasks = tasks
+        self.predecessors = predecessors
+        self.successors = defaultdict(list)
+        for task_id, preds in predecessors.items():
+            for pred in preds:
+                self.successors[pred].append(task_id)
+
+    @classmethod
+    def load(cls, chart_id):
+        tasks, predecessors = {}, defaultdict(list)
+        rows = GanttTask.objects.filter(gantt_chart_id=chart_id).values_list(
+            'id', 'name', 'start_date', 'end_date', 'dependencies'
+        )
+        for task_id, name, start, end, dependency_id in rows:
+            tasks.setdefault(task_id, {'name': name, 'start_date': start, 'end_date': end})
+            if dependency_id is not None:
+                predecessors[task_id].append(dependency_id)
+        # Edges to tasks on other charts do not constrain this schedule
+        predecessors = {
+            task_id: [pred for pred in preds if pred in tasks]
+            for task_id, preds in predecessors.items()
+        }
+        return cls(tasks, predecessors)
+
+    def duration(self, task_id):
+        task = self.tasks[task_id]
+        return max((task['end_date'] - task['start_date']).days, 0)
+
+    def topological_order(self, nodes=None):
+        """Kahn's algorithm over ``nodes`` (default: every task)."""
+        nodes = set(self.tasks) if nodes is None else set(nodes)
+        indegree = {
+            node: sum(1 for pred in self.predecessors.get(node, ()) if pred in nodes)
+            for node in nodes
+        }
+        ready = deque(sorted(node for node, degree in indegree.items() if degree == 0))
+        order = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for succ in self.successors.get(node, ()):
+                if succ in nodes:
+                    indegree[succ] -= 1
+                    if indegree[succ] == 0:
+                        ready.append(succ)
+        if len(order) < len(nodes):
+            raise DependencyCycleError(self.find_cycle({node for node, degree in indegree.items() if degree > 0}))
+        return order
+
+    def find_cycle(self, nodes):
+        # Every node left after Kahn's algorithm has a predecessor in the
+        # leftover set, so walking predecessors must eventually repeat.
+        node = min(nodes)
+        path, seen = [], {}
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(pred for pred in self.predecessors[node] if pred in nodes)
+        return list(reversed(path[seen[node]:]))
+
+
+def compute_schedule(graph):
+    """Critical path method: earliest/latest dates, slack and the critical path in O(V+E).
+
+    Tasks keep their planned start as a start-no-earlier-than constraint and
+    their planned length as duration; a task may start on the day its last
+    predecessor ends.
+    """
+    order = graph.topological_order()
+    if not order:
+        return {'project_start': None, 'project_finish': None, 'critical_path': [], 'tasks': []}
+
+    duration = {task_id: timedelta(days=graph.duration(task_id)) for task_id in order}
+    earliest_start, earliest_finish = {}, {}
+    for task_id in order:
+        start = graph.tasks[task_id]['start_date']
+        for pred in graph.predecessors.get(task_id, ()):
+            start = max(start, earliest_finish[pred])
+        earliest_start[task_id] = start
+        earliest_finish[task_id] = start + duration[task_id]
+
+    project_start = min(earliest_start.values())
+    project_finish = max(earliest_finish.values())
+
+    latest_start, latest_finish = {}, {}
+    for task_id in reversed(order):
+        finish = project_finish
+        for succ in graph.successors.get(task_id, ()):
+            finish = min(finish, latest_start[succ])
+        latest_finish[task_id] = finish
+        latest_start[task_id] = finish - duration[task_id]
+
+    slack = {task_id: (latest_start[task_id] - earliest_start[task_id]).days for task_id in order}
+
+    # Follow tight critical links back from a critical task that ends the project
+    tight_pred = {}
+    for task_id in order:
+        if slack[task_id] == 0:
+            for pred in graph.predecessors.get(task_id, ()):
+                if slack[pred] == 0 and earliest_finish[pred] == earliest_start[task_id]:
+                    tight_pred[task_id] = pred
+                    break
+    critical_path = []
+    node = next((t for t in reversed(order) if slack[t] == 0 and earliest_finish[t] == project_finish), None)
+    while node is not None:
+        critical_path.append(node)
+        node = tight_pred.get(node)
+    critical_path.reverse()
+
+    return {
+        'project_start': project_start,
+        'project_finish': project_finish,
+        'critical_path': critical_path,
+        'tasks': [
+            {
+                'id': task_id,
+                'name': graph.tasks[task_id]['name'],
+                'duration': duration[task_id].days,
+                'dependencies': graph.predecessors.get(task_id, []),
+                'earliest_start': earliest_start[task_id],
+                'earliest_finish': earliest_finish[task_id],
+                'latest_start': latest_start[task_id],
+                'latest_finish': latest_finish[task_id],
+                'slack': slack[task_id],
+                'critical': slack[task_id] == 0,
+            }
+            for task_id in order
+        ],
+    }
+
+
+def chart_schedule(chart_id):
+    """Return the chart's schedule, cached until a task or dependency changes."""
+    version = get_version('gantt', chart_id)
+    key = f'gantt-schedule:{chart_id}:{version}'
+    schedule = cache.get(key)
+    if schedule is None:
+        schedule = compute_schedule(DependencyGraph.load(chart_id))
+        schedule['chart'] = chart_id
+        cache.set(key, schedule, SCHEDULE_TIMEOUT)
+    return schedule
+
+
+def reschedule_task(chart_id, task_id, start_date=None, end_date=None):
+    """Move one task and push its dependents forward as far as needed.
+
+    Only the moved task's downstream subgraph is visited, and every shifted
+    row is written with a single ``bulk_update``. Returns the changed tasks.
+    """
+    graph = DependencyGraph.load(chart_id)
+    if task_id not in graph.tasks:
+        raise GanttTask.DoesNotExist(f'Gantt task {task_id} is not on chart {chart_id}')
+
+    dates = {}
+    task = graph.tasks[task_id]
+    new_start = start_date or task['start_date']
+    new_end = end_date or task['end_date']
+    if new_end < new_start:
+        raise ValueError('end_date must not be before start_date')
+    dates[task_id] = (new_start, new_end)
+
+    affected, queue = {task_id}, deque([task_id])
+    while queue:
+        for succ in graph.successors.get(queue.popleft(), ()):
+            if succ not in affected:
+                affected.add(succ)
+                queue.append(succ)
+
+    for node in graph.topological_order(affected):
+        if node == task_id:
+            continue
+        start, end = graph.tasks[node]['start_date'], graph.tasks[node]['end_date']
+        ready = max(
+            dates.get(pred, (None, graph.tasks[pred]['end_date']))[1]
+            for pred in graph.predecessors[node]
+        )
+        if start < ready:
+            shift = ready - start
+            dates[node] = (start + shift, end + shift)
+
+    changed = [
+        GanttTask(id=node, start_date=start, end_date=end)
+        for node, (start, end) in dates.items()
+        if (start, end) != (graph.tasks[node]['start_date'], graph.tasks[node]['end_date'])
+    ]
+    if changed:
+        with transaction.atomic():
+            GanttTask.objects.bulk_update(changed, ['start_date', 'end_date'])
+            # bulk_update skips post_save; invalidate cached schedules here
+            bump_version('gantt', chart_id)
+    return [
+        {'id': item.id, 'start_date': item.start_date, 'end_date': item.end_date}
+        for item in changed
+    ]
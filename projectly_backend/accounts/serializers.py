@@ -6,19 +6,56 @@ from .models import (
     UserProfile, Project, Board, BoardList, Card, 
     Attachment, Report, ReportFile, Event, Communication,
     Task, Notification, GanttChart, GanttTask,
-    SubTask, FileShare, AccessPermission, YourModel
+    SubTask, FileShare, AccessPermission, UploadSession, BlobPreview, YourModel
 )
-from rest_framework_simplejwt.tokens import RefreshToken
+from .authentication import tokens_for_user
+from .media import sign_media_url
+from .uploads import max_upload_size
+import os
+import re
 class YourModelSerializer(serializers.ModelSerializer):
     class Meta:
         model = YourModel
         fields = '__all__'
+class SignedFileField(serializers.FileField):
+    """FileField whose URL is signed, so a plain link can open the protected file."""
+
+    def to_representation(self, value):
+        url = super().to_representation(value)
+        return sign_media_url(url, value.name) if url else url
+
+class BlobPreviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = BlobPreview
+        fields = ['status', 'mime_type', 'width', 'height', 'page_count', 'thumbnail']
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        representation['thumbnail'] = (
+            sign_media_url(instance.thumbnail.url, instance.thumbnail.name) if instance.thumbnail else None
+        )
+        return representation
+
+class PreviewField(serializers.Field):
+    """The blob's derived preview, so listings need not fetch the file itself; None until it exists."""
+
+    def __init__(self, **kwargs):
+        kwargs.update(source='*', read_only=True)
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        preview = getattr(instance.blob, 'preview', None) if instance.blob_id else None
+        return BlobPreviewSerializer(preview).data if preview is not None else None
+
 # First define ReportFileSerializer since it's used in ReportSerializer
 class ReportFileSerializer(serializers.ModelSerializer):
+    file = SignedFileField()
+    preview = PreviewField()
+
     class Meta:
         model = ReportFile
-        fields = ['id', 'file', 'uploaded_at']
-        read_only_fields = ['uploaded_at']
+        fields = ['id', 'file', 'original_name', 'uploaded_at', 'preview']
+        read_only_fields = ['original_name', 'uploaded_at']
 
 # Then define ReportSerializer which uses ReportFileSerializer
 class ReportSerializer(serializers.ModelSerializer):
@@ -72,16 +109,17 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         
         return user
 
-class UserLoginSerializer(serializers.Serializer):
+class LoginCredentialsSerializer(serializers.Serializer):
     email = serializers.EmailField()
     password = serializers.CharField(write_only=True)
-    
+
+class UserLoginSerializer(LoginCredentialsSerializer):
     def validate(self, data):
         user = authenticate(email=data['email'], password=data['password'])
         if not user:
             raise serializers.ValidationError("Invalid credentials")
         
-        refresh = RefreshToken.for_user(user)
+        refresh = tokens_for_user(user)
         return {
             'email': user.email,
             'refresh': str(refresh),
@@ -125,14 +163,16 @@ class CardSerializer(serializers.ModelSerializer):
         read_only_fields = ('created_by', 'created_at')
 
 class AttachmentSerializer(serializers.ModelSerializer):
+    preview = PreviewField()
+
     class Meta:
         model = Attachment
         fields = '__all__'
-        read_only_fields = ('uploaded_by', 'uploaded_at')
+        read_only_fields = ('uploaded_by', 'uploaded_at', 'original_name')
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
-        representation['file'] = instance.file.url if instance.file else None
+        representation['file'] = sign_media_url(instance.file.url, instance.file.name) if instance.file else None
         return representation
 
 class EventSerializer(serializers.ModelSerializer):
@@ -162,6 +202,22 @@ class TaskSerializer(serializers.ModelSerializer):
             'due_date': {'required': False},
             'project': {'required': False},
         }
+
+    def to_representation(self, instance):
+        representation = super().to_representation(instance)
+        if 'subtasks' in self.context.get('expand', ()):
+            # Expects the view to prefetch subtasks and annotate with_subtask_rollups()
+            representation['subtasks'] = SubTaskSerializer(instance.subtasks.all(), many=True).data
+            representation['rollup'] = subtask_rollup(instance)
+        return representation
+
+def subtask_rollup(task):
+    return {
+        'subtask_count': task.subtask_count,
+        'completed_count': task.completed_subtask_count,
+        'next_due_date': task.next_subtask_due_date,
+    }
+
 class NotificationSerializer(serializers.ModelSerializer):
     related_task_title = serializers.CharField(source='related_task.title', read_only=True)
     related_project_name = serializers.CharField(source='related_project.name', read_only=True)
@@ -189,6 +245,19 @@ class GanttTaskSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('created_at',)
 
+class GanttRescheduleSerializer(serializers.Serializer):
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Provide start_date and/or end_date.")
+        return attrs
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=False)
+    before = serializers.DateTimeField(required=False)
+
 class SubTaskSerializer(serializers.ModelSerializer):
     assigned_to_email = serializers.EmailField(source='assigned_to.email', read_only=True)
     parent_task_title = serializers.CharField(source='parent_task.title', read_only=True)
@@ -202,15 +271,39 @@ class FileShareSerializer(serializers.ModelSerializer):
     uploaded_by_email = serializers.EmailField(source='uploaded_by.email', read_only=True)
     shared_with_emails = serializers.SerializerMethodField()
     project_name = serializers.CharField(source='project.name', read_only=True, allow_null=True)
+    file = SignedFileField()
+    preview = PreviewField()
     
     class Meta:
         model = FileShare
         fields = '__all__'
-        read_only_fields = ['uploaded_by', 'uploaded_at']
+        read_only_fields = ['uploaded_by', 'uploaded_at', 'original_name']
     
     def get_shared_with_emails(self, obj):
         return [user.email for user in obj.shared_with.all()]
 
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'size', 'sha256', 'project', 'offset', 'status', 'file_share', 'created_at']
+        read_only_fields = ['offset', 'status', 'file_share', 'created_at']
+
+    def validate_filename(self, value):
+        name = os.path.basename(value.replace('\\', '/'))
+        if not name:
+            raise serializers.ValidationError("A file name is required.")
+        return name
+
+    def validate_size(self, value):
+        if value < 0 or value > max_upload_size():
+            raise serializers.ValidationError(f"Size must be between 0 and {max_upload_size()} bytes.")
+        return value
+
+    def validate_sha256(self, value):
+        if value and not re.fullmatch(r'[0-9a-fA-F]{64}', value):
+            raise serializers.ValidationError("Expected a hex-encoded SHA-256 digest.")
+        return value.lower()
+
 class AccessPermissionSerializer(serializers.ModelSerializer):
     user_email = serializers.EmailField(source='user.email', read_only=True)
     project_name = serializers.CharField(source='project.name', read_only=True)
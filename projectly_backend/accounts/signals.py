@@ -1,27 +1,182 @@
 # accounts/signals.py
-from django.db.models.signals import post_save
+import os
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from .models import Task, Notification
+from .models import Task, Notification, BoardList, Card, Project, SubTask, FileShare, GanttTask, AccessPermission, Attachment, ReportFile, Blob, Communication, UNKNOWN
+from .blobs import acquire_blob, release_blob, store_file
+from .access import invalidate_project_access
+from .notifications import adjust_unread_counts, queue_notification
+from .previews import schedule_preview
+from .response_cache import PROJECT_OF, invalidate_for, invalidate_project
+from .versions import bump_version, bump_model_version
+from .realtime import publish_notification
 from django.contrib.auth.models import User
 from .models import UserProfile
 @receiver(post_save, sender=Task)
 def create_task_notification(sender, instance, created, **kwargs):
-    if created and instance.assigned_to:
-        Notification.objects.create(
-            user=instance.assigned_to,
-            notification_type='task_assigned',
-            message=f'You have been assigned a new task: {instance.title}',
-            related_task=instance,
-            related_project=instance.project
-        )
-    elif instance.assigned_to and instance.assigned_to != Task.objects.get(id=instance.id).assigned_to:
-        Notification.objects.create(
-            user=instance.assigned_to,
+    previous = getattr(instance, '_loaded_assigned_to_id', UNKNOWN)
+    instance._loaded_assigned_to_id = instance.assigned_to_id
+
+    assignee_changed = created or previous is not UNKNOWN and previous != instance.assigned_to_id
+    if instance.assigned_to_id and assignee_changed:
+        queue_notification(Notification(
+            user_id=instance.assigned_to_id,
             notification_type='task_assigned',
             message=f'You have been assigned a new task: {instance.title}',
-            related_task=instance,
-            related_project=instance.project
-        )
+            related_task_id=instance.id,
+            related_project_id=instance.project_id
+        ))
+
+@receiver(post_save, sender=Notification)
+def push_notification(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: publish_notification(instance))
+
+@receiver(post_save, sender=Notification)
+def count_unread_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_loaded_is_read', UNKNOWN)
+    instance._loaded_is_read = instance.is_read
+    if created:
+        delta = 0 if instance.is_read else 1
+    elif previous is not UNKNOWN and previous != instance.is_read:
+        delta = -1 if instance.is_read else 1
+    else:
+        return
+    if delta:
+        adjust_unread_counts({instance.user_id: delta})
+
+@receiver(post_delete, sender=Notification)
+def count_unread_on_delete(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread_counts({instance.user_id: -1})
+
+@receiver([post_save, post_delete], sender=BoardList)
+def bump_board_version_for_list(sender, instance, **kwargs):
+    bump_version('board', instance.board_id)
+
+@receiver([post_save, post_delete], sender=Card)
+def bump_board_version_for_card(sender, instance, **kwargs):
+    board_id = BoardList.objects.filter(id=instance.list_id).values_list('board_id', flat=True).first()
+    if board_id is not None:
+        bump_version('board', board_id)
+
+# Collections whose list endpoints answer conditional GETs
+VERSIONED_MODELS = (Project, Task, SubTask, FileShare)
+
+def bump_collection_version(sender, **kwargs):
+    bump_model_version(sender)
+
+def bump_collection_version_for_m2m(sender, instance, model, action, **kwargs):
+    if action.startswith('post_'):
+        for changed in {type(instance), model}:
+            if changed in VERSIONED_MODELS:
+                bump_model_version(changed)
+
+for versioned_model in VERSIONED_MODELS:
+    post_save.connect(bump_collection_version, sender=versioned_model)
+    post_delete.connect(bump_collection_version, sender=versioned_model)
+m2m_changed.connect(bump_collection_version_for_m2m, sender=Project.members.through)
+m2m_changed.connect(bump_collection_version_for_m2m, sender=FileShare.shared_with.through)
+
+@receiver(m2m_changed, sender=Project.members.through)
+def invalidate_access_for_members(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # user.projects.add(...) and friends: only this user's access changed
+        if action.startswith('post_'):
+            invalidate_project_access([instance.pk])
+    elif action == 'pre_clear':
+        instance._cleared_member_ids = list(instance.members.values_list('id', flat=True))
+    elif action == 'post_clear':
+        invalidate_project_access(getattr(instance, '_cleared_member_ids', []))
+    elif action in ('post_add', 'post_remove'):
+        invalidate_project_access(pk_set)
+
+@receiver([post_save, post_delete], sender=AccessPermission)
+def invalidate_access_for_grant(sender, instance, **kwargs):
+    invalidate_project_access([instance.user_id])
+
+# Models whose uploads go through the content-addressed blob store
+BLOB_BACKED_MODELS = (FileShare, Attachment, ReportFile)
+
+def store_upload_as_blob(sender, instance, raw=False, **kwargs):
+    if raw or not instance.file or instance.file._committed:
+        return
+    blob = store_file(instance.file)
+    instance.blob = blob
+    if not instance.original_name:
+        instance.original_name = os.path.basename(instance.file.name)[:255]
+    instance.file = blob.file.name
+
+def count_blob_reference(sender, instance, created, **kwargs):
+    previous = None if created else getattr(instance, '_loaded_blob_id', UNKNOWN)
+    instance._loaded_blob_id = instance.blob_id
+    if previous is UNKNOWN or previous == instance.blob_id:
+        return
+    if instance.blob_id:
+        acquire_blob(instance.blob_id)
+    if previous:
+        release_blob(previous)
+
+def release_blob_reference(sender, instance, **kwargs):
+    if instance.blob_id:
+        release_blob(instance.blob_id)
+
+for blob_backed_model in BLOB_BACKED_MODELS:
+    pre_save.connect(store_upload_as_blob, sender=blob_backed_model)
+    post_save.connect(count_blob_reference, sender=blob_backed_model)
+    post_delete.connect(release_blob_reference, sender=blob_backed_model)
+
+@receiver(post_save, sender=Blob)
+def derive_blob_preview(sender, instance, created, raw=False, **kwargs):
+    # Derivatives are per content, so a deduplicated upload reuses the existing preview
+    if created and not raw:
+        schedule_preview(instance.sha256)
+
+@receiver([post_save, post_delete], sender=GanttTask)
+def bump_gantt_version(sender, instance, **kwargs):
+    bump_version('gantt', instance.gantt_chart_id)
+
+@receiver(m2m_changed, sender=GanttTask.dependencies.through)
+def bump_gantt_version_for_dependencies(sender, instance, action, **kwargs):
+    if action.startswith('post_'):
+        bump_version('gantt', instance.gantt_chart_id)
+
+# Per-project cached responses (accounts/response_cache.py)
+def invalidate_cached_responses(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_for(instance)
+
+def invalidate_deleted_project_responses(sender, instance, **kwargs):
+    # Children deleted with the project may no longer resolve to it
+    invalidate_project(instance.pk)
+
+# The m2m field behind each through model, to find the owners on a reverse clear
+CACHED_M2M_FIELDS = {
+    Project.members.through: 'members',
+    Communication.recipients.through: 'recipients',
+    GanttTask.dependencies.through: 'dependencies',
+}
+
+def invalidate_cached_responses_for_m2m(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if not reverse:
+        owners = [instance] if action.startswith('post_') else []
+    elif action in ('post_add', 'post_remove'):
+        owners = model.objects.filter(pk__in=pk_set)
+    elif action == 'pre_clear':
+        owners = model.objects.filter(**{CACHED_M2M_FIELDS[sender]: instance})
+    else:
+        owners = []
+    for owner in owners:
+        invalidate_for(owner)
+
+for cached_model in PROJECT_OF:
+    post_save.connect(invalidate_cached_responses, sender=cached_model)
+    post_delete.connect(invalidate_cached_responses, sender=cached_model)
+post_delete.connect(invalidate_deleted_project_responses, sender=Project)
+for through in CACHED_M2M_FIELDS:
+    m2m_changed.connect(invalidate_cached_responses_for_m2m, sender=through)
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -0,0 +1,31 @@
+# accounts/snapshots.py
+from django.core.cache import cache
+
+from .models import BoardList, Card
+from .serializers import BoardListSerializer, CardSerializer
+from .versions import get_version
+
+SNAPSHOT_TIMEOUT = 60 * 60
+
+
+def board_snapshot(board_id):
+    """Return the nested lists+cards document for a board, cached per board version."""
+    version = get_version('board', board_id)
+    key = f'board-snapshot:{board_id}:{version}'
+    document = cache.get(key)
+    if document is None:
+        document = build_board_snapshot(board_id)
+        document['version'] = version
+        cache.set(key, document, SNAPSHOT_TIMEOUT)
+    return document
+
+
+def build_board_snapshot(board_id):
+    """Build the board document with one query for lists and one for cards."""
+    lists = BoardListSerializer(BoardList.objects.filter(board_id=board_id), many=True).data
+    cards = CardSerializer(Card.objects.filter(list__board_id=board_id), many=True).data
+
+    lists_by_id = {item['id']: dict(item, cards=[]) for item in lists}
+    for card in cards:
+        lists_by_id[card['list']]['cards'].append(dict(card))
+    return {'board': board_id, 'lists': list(lists_by_id.values())}
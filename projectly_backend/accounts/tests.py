@@ -1,3 +1,1308 @@
-from django.test import TestCase
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from unittest import skipIf
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.test import AsyncClient, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import (
+    AccessPermission, Blob, BlobPreview, Board, BoardList, Card, ClaimsUser, Communication, Event, FileShare, GanttChart, GanttTask, UploadSession, Notification, NotificationArchive, NotificationCounter, Project, Report,
+    ReportFile, SocialAccount, SubTask, Task, User, UserProfile
+)
+from .notifications import create_notifications
+from .realtime import InProcessBroker, get_broker, notification_message
+from .renderers import ORJSONRenderer
+from .routers import PIN_COOKIE
+from .parsers import ORJSONParser
+from .previews import Image
+from .response_cache import stats
+from .serializers import TaskSerializer
+from .streaming import stream_json
+from .uploads import UploadConflict, partial_path, receive_chunk
+from .views import register_api
+
+
+class QueryBudgetTests(TestCase):
+    """List endpoints must issue a fixed number of queries, however many rows they return."""
+
+    ROWS = 12
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='owner@example.com', password='secret')
+        cls.others = [
+            User.objects.create_user(email=f'member{i}@example.com', password='secret')
+            for i in range(3)
+        ]
+        cls.project = Project.objects.create(name='Budget', created_by=cls.user)
+        cls.project.members.add(cls.user, *cls.others)
+        task = Task.objects.create(title='Seed', created_by=cls.user, project=cls.project)
+
+        for i in range(cls.ROWS):
+            report = Report.objects.create(title=f'Report {i}', created_by=cls.user, project=cls.project)
+            report.shared_with.add(*cls.others)
+            ReportFile.objects.create(report=report, file=f'reports/{i}.pdf')
+
+            message = Communication.objects.create(
+                project=cls.project, subject=f'Subject {i}', message='Hi', sender=cls.user
+            )
+            message.recipients.add(*cls.others)
+
+            shared = FileShare.objects.create(file=f'shared_files/{i}.txt', uploaded_by=cls.user, project=cls.project)
+            shared.shared_with.add(*cls.others)
+
+            Notification.objects.create(
+                user=cls.user, notification_type='update', message=f'Note {i}',
+                related_task=task, related_project=cls.project,
+            )
+
+    def setUp(self):
+        cache.clear()  # project-scoped views resolve access once per request (one query)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertQueryBudget(self, url, budget):
+        with self.assertNumQueries(budget):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data)
+        return response
+
+    def test_report_list(self):
+        response = self.assertQueryBudget(f'/api/projects/{self.project.id}/reports/', 4)
+        self.assertEqual(len(response.data[0]['shared_with_emails']), 3)
+
+    def test_communication_list(self):
+        response = self.assertQueryBudget(f'/api/projects/{self.project.id}/communications/', 3)
+        self.assertEqual(len(response.data[0]['recipient_emails']), 3)
+
+    def test_file_list(self):
+        response = self.assertQueryBudget('/api/files/', 2)
+        self.assertEqual(response.data[0]['project_name'], 'Budget')
+
+    def test_file_share_list(self):
+        self.assertQueryBudget(f'/api/files/share/?project_id={self.project.id}', 2)
+
+    def test_notification_list(self):
+        response = self.assertQueryBudget('/api/notifications/', 1)
+        self.assertEqual(response.data[0]['related_task_title'], 'Seed')
+
+
+class ProjectAccessTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(email='lead@example.com', password='secret')
+        cls.viewer = User.objects.create_user(email='viewer@example.com', password='secret')
+        cls.project = Project.objects.create(name='Scoped', created_by=cls.owner)
+        cls.project.members.add(cls.owner)
+        Report.objects.create(title='Quarterly', created_by=cls.owner, project=cls.project)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def reports(self, user):
+        self.client.force_authenticate(user)
+        return self.client.get(f'/api/projects/{self.project.id}/reports/').data
+
+    def test_access_permission_grants_read_but_not_write(self):
+        self.assertEqual(self.reports(self.viewer), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            AccessPermission.objects.create(
+                user=self.viewer, project=self.project, permission='view', granted_by=self.owner
+            )
+        self.assertEqual(len(self.reports(self.viewer)), 1)
+
+        response = self.client.post(f'/api/projects/{self.project.id}/reports/', {'title': 'Nope'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_membership_change_invalidates_cached_access(self):
+        self.assertEqual(len(self.reports(self.owner)), 1)
+        # Served from the cache: no membership query on the second request
+        with self.assertNumQueries(3):
+            self.reports(self.owner)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.project.members.remove(self.owner)
+        self.assertEqual(self.reports(self.owner), [])
+
+
+class ResumableUploadTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='uploader@example.com', password='secret')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.data = os.urandom(300 * 1024)
+
+    def start(self):
+        response = self.client.post('/api/uploads/', {
+            'filename': 'design.psd', 'size': len(self.data), 'sha256': hashlib.sha256(self.data).hexdigest(),
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return f"/api/uploads/{response.data['id']}/"
+
+    def put(self, url, offset, chunk, checksum=None):
+        headers = {'HTTP_UPLOAD_OFFSET': str(offset)}
+        if checksum is not None:
+            headers['HTTP_UPLOAD_CHECKSUM'] = f'sha256 {base64.b64encode(checksum).decode()}'
+        return self.client.put(url, chunk, content_type='application/offset+octet-stream', **headers)
+
+    def test_chunks_resume_and_assemble(self):
+        url = self.start()
+        first, second = self.data[:200 * 1024], self.data[200 * 1024:]
+        response = self.put(url, 0, first, hashlib.sha256(first).digest())
+        self.assertEqual((response.status_code, response['Upload-Offset']), (204, str(len(first))))
+
+        # A corrupted chunk is rejected and leaves the offset where it was
+        response = self.put(url, len(first), second, hashlib.sha256(b'other').digest())
+        self.assertEqual((response.status_code, response['Upload-Offset']), (460, str(len(first))))
+        # So is a chunk sent for the wrong offset
+        self.assertEqual(self.put(url, 0, second).status_code, 409)
+
+        self.assertEqual(self.client.head(url)['Upload-Offset'], str(len(first)))
+        self.assertEqual(self.put(url, len(first), second).status_code, 204)
+
+        response = self.client.post(f'{url}complete/')
+        self.assertEqual(response.status_code, 201)
+        share = FileShare.objects.get(id=response.data['id'])
+        with share.file.open('rb') as f:
+            self.assertEqual(f.read(), self.data)
+        self.assertEqual(UploadSession.objects.get().status, 'complete')
+
+    def test_stale_duplicate_chunk_leaves_committed_bytes_alone(self):
+        url = self.start()
+        first, second = self.data[:100 * 1024], self.data[100 * 1024:200 * 1024]
+        stale = UploadSession.objects.get()  # loaded before any chunk landed
+        self.put(url, 0, first)
+        self.put(url, len(first), second)
+
+        with self.assertRaises(UploadConflict):
+            receive_chunk(stale, BytesIO(first), 0, len(first))
+        with open(partial_path(stale), 'rb') as f:
+            self.assertEqual(f.read(), first + second)
+
+        self.assertEqual(self.put(url, len(first) + len(second), self.data[200 * 1024:]).status_code, 204)
+        self.assertEqual(self.client.post(f'{url}complete/').status_code, 201)
+
+    def test_incomplete_upload_cannot_finish(self):
+        url = self.start()
+        self.put(url, 0, self.data[:1024])
+        self.assertEqual(self.client.post(f'{url}complete/').status_code, 409)
+
+    def test_legacy_upload_accepts_any_number_of_files(self):
+        files = {f'file_{i}': SimpleUploadedFile(f'{i}.txt', b'x' * i) for i in range(1, 6)}
+        response = self.client.post('/api/upload-files/', files)
+        self.assertEqual([f['size'] for f in response.json()['files']], [1, 2, 3, 4, 5])
+
+    def test_known_content_is_stored_once(self):
+        url = self.start()
+        self.put(url, 0, self.data)
+        first = FileShare.objects.get(id=self.client.post(f'{url}complete/').data['id'])
+
+        # Declaring a known digest finishes the upload without sending a byte
+        response = self.client.post('/api/uploads/', {
+            'filename': 'copy.psd', 'size': len(self.data), 'sha256': hashlib.sha256(self.data).hexdigest(),
+        }, format='json')
+        self.assertEqual((response.data['status'], response['Upload-Offset']), ('complete', str(len(self.data))))
+        second = FileShare.objects.get(id=response.data['file_share'])
+
+        self.assertEqual(first.file.name, second.file.name)
+        blob = Blob.objects.get()
+        self.assertEqual(blob.ref_count, 2)
+
+        first.delete()
+        second.delete()
+        blob.refresh_from_db()
+        self.assertEqual(blob.ref_count, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command('gc_blobs', grace_hours=-1, stdout=StringIO())
+        self.assertFalse(Blob.objects.exists())
+        self.assertFalse(os.path.exists(blob.file.path))
+
+    def test_known_digest_does_not_grant_access_to_the_content(self):
+        url = self.start()
+        self.put(url, 0, self.data)
+        self.client.post(f'{url}complete/')
+
+        stranger = User.objects.create_user(email='stranger@example.com', password='secret')
+        self.client.force_authenticate(stranger)
+        url = self.start()
+        self.assertEqual(UploadSession.objects.get(user=stranger).status, 'active')
+        # The bytes must really be sent, and they must match the declared digest
+        self.put(url, 0, os.urandom(len(self.data)))
+        self.assertEqual(self.client.post(f'{url}complete/').status_code, 422)
+        self.assertFalse(FileShare.objects.filter(uploaded_by=stranger).exists())
+
+    def test_multipart_uploads_are_deduplicated(self):
+        for name in ('a.txt', 'b.txt'):
+            self.client.post('/api/upload-files/', {'file_1': SimpleUploadedFile(name, b'same bytes')})
+        self.assertEqual(Blob.objects.get().ref_count, 2)
+        self.assertEqual(len(set(FileShare.objects.values_list('file', flat=True))), 1)
+
+
+class MediaServingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(email='media-owner@example.com', password='secret')
+        cls.member = User.objects.create_user(email='media-member@example.com', password='secret')
+        cls.stranger = User.objects.create_user(email='media-stranger@example.com', password='secret')
+        cls.project = Project.objects.create(name='Media', created_by=cls.owner)
+        cls.project.members.add(cls.member)
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.data = bytes(range(256)) * 40
+        share = FileShare.objects.create(
+            file=SimpleUploadedFile('plan.pdf', self.data), uploaded_by=self.owner, project=self.project
+        )
+        self.url = share.file.url
+
+    def get(self, user, **headers):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}', **headers)
+
+    def test_access_follows_the_file_share(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+        self.assertEqual(self.get(self.stranger).status_code, 404)
+        response = self.get(self.member)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+
+    def test_original_name_survives_blob_storage(self):
+        share = FileShare.objects.get()
+        self.assertTrue(share.file.name.startswith('blobs/'))
+        self.assertEqual(share.original_name, 'plan.pdf')
+        response = self.get(self.member)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Content-Disposition'], 'inline; filename="plan.pdf"')
+        files = APIClient().get('/api/files/').json()
+        self.assertEqual(files[0]['original_name'], 'plan.pdf')
+
+    def test_listed_urls_open_without_credentials(self):
+        listed = APIClient().get('/api/files/').json()[0]['file']
+        response = self.client.get(listed)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), self.data)
+
+        signature = listed.split('signature=')[1]
+        self.assertEqual(self.client.get(f'{self.url}?signature=forged').status_code, 401)
+        other = FileShare.objects.create(file=SimpleUploadedFile('other.txt', b'other'), uploaded_by=self.owner)
+        self.assertEqual(self.client.get(f'{other.file.url}?signature={signature}').status_code, 401)
+        with patch('django.core.signing.time.time', return_value=time.time() + 3 * settings.MEDIA_URL_MAX_AGE):
+            self.assertEqual(self.client.get(listed).status_code, 401)
+
+    def test_range_and_validators(self):
+        response = self.get(self.member, HTTP_RANGE='bytes=100-199')
+        self.assertEqual((response.status_code, response['Content-Range']), (206, f'bytes 100-199/{len(self.data)}'))
+        self.assertEqual(b''.join(response.streaming_content), self.data[100:200])
+        self.assertEqual(response['Content-Length'], '100')
+
+        response = self.get(self.member, HTTP_RANGE='bytes=-10')
+        self.assertEqual(b''.join(response.streaming_content), self.data[-10:])
+        self.assertEqual(self.get(self.member, HTTP_RANGE=f'bytes={len(self.data)}-').status_code, 416)
+
+        etag = response['ETag']
+        self.assertEqual(self.get(self.member, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # A stale If-Range turns the range request into a full response
+        response = self.get(self.member, HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(MEDIA_SENDFILE_BACKEND='x-accel-redirect', MEDIA_ACCEL_REDIRECT_PREFIX='/protected/')
+    def test_transfer_is_offloaded_to_the_front_server(self):
+        response = self.get(self.owner)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected' + self.url[len('/media'):])
+        self.assertEqual(response.content, b'')
+
+
+@override_settings(PREVIEW_WORKERS=0)
+class PreviewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='previews@example.com', password='secret')
+        cls.project = Project.objects.create(name='Previews', created_by=cls.user)
+        cls.project.members.add(cls.user)
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def attach(self, name, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/api/projects/{self.project.id}/attachments/', {'file': SimpleUploadedFile(name, content), 'project': self.project.id}
+            )
+        self.assertEqual(response.status_code, 201)
+
+    def test_listing_carries_preview_metadata(self):
+        png = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\rIHDR' + (640).to_bytes(4, 'big') + (480).to_bytes(4, 'big')
+        pdf = b'%PDF-1.4\n1 0 obj << /Type /Pages /Count 2 >>\n2 0 obj << /Type /Page >>\n3 0 obj << /Type/Page >>\n'
+        self.attach('photo.png', png + b'\x00' * 64)
+        self.attach('spec.pdf', pdf)
+
+        response = self.client.get(f'/api/projects/{self.project.id}/attachments/')
+        previews = {item['name']: item['preview'] for item in response.json()}
+        self.assertEqual(
+            {key: previews['photo.png'][key] for key in ('status', 'mime_type', 'width', 'height')},
+            {'status': 'ready', 'mime_type': 'image/png', 'width': 640, 'height': 480},
+        )
+        self.assertEqual((previews['spec.pdf']['mime_type'], previews['spec.pdf']['page_count']), ('application/pdf', 2))
+
+    @skipIf(Image is None, 'Pillow is not installed')
+    @override_settings(PREVIEW_THUMBNAIL_SIZE=(64, 64))
+    def test_images_get_a_thumbnail(self):
+        image = BytesIO()
+        Image.new('RGB', (400, 200), (200, 30, 30)).save(image, 'PNG')
+        self.attach('banner.png', image.getvalue())
+
+        preview = self.client.get(f'/api/projects/{self.project.id}/attachments/').json()[0]['preview']
+        self.assertEqual((preview['width'], preview['height']), (400, 200))
+        self.assertTrue(preview['thumbnail'].startswith('/media/previews/'))
+        stored = BlobPreview.objects.get()
+        with stored.thumbnail.open('rb') as f, Image.open(f) as thumbnail:
+            self.assertEqual((thumbnail.format, thumbnail.size), ('JPEG', (64, 32)))
+
+
+class ClaimsAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='claims@example.com', password='secret')
+        UserProfile.objects.filter(user=cls.user).update(role='head')
+
+    def test_requests_trust_the_token_claims(self):
+        response = self.client.post('/api/login/', {'email': 'claims@example.com', 'password': 'secret'})
+        access = response.json()['access']
+        self.assertEqual(AccessToken(access)['role'], 'head')
+
+        # Only the counter lookup; the user row is never loaded
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/notifications/unread-count/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        self.assertEqual(response.json(), {'unread': 0})
+
+        token = AccessToken(access)
+        token['active'] = False
+        response = self.client.get('/api/notifications/unread-count/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.assertEqual(response.status_code, 401)
+
+    def test_claims_user_loads_the_row_once_when_needed(self):
+        user = ClaimsUser.from_claims(self.user.pk, role='head')
+        self.assertEqual((user.role, user.is_authenticated), ('head', True))
+        with self.assertNumQueries(1):
+            self.assertEqual((user.email, user.first_name, user.date_joined), (
+                self.user.email, self.user.first_name, self.user.date_joined
+            ))
+        self.assertEqual(user, self.user)
+
+
+class PasswordHashingTests(TestCase):
+
+    def test_login_upgrades_outdated_hashes(self):
+        with self.settings(PASSWORD_HASHER_PARAMS={'PBKDF2_ITERATIONS': 1000}):
+            user = User.objects.create_user(email='rehash@example.com', password='Secret123')
+        self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+
+        with self.settings(PASSWORD_HASHER_PARAMS={'PBKDF2_ITERATIONS': 2000}):
+            response = self.client.post('/api/login/', {'email': 'rehash@example.com', 'password': 'Secret123'})
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('access', response.json())
+            user.refresh_from_db()
+            self.assertTrue(user.password.startswith('pbkdf2_sha256$2000$'))
+
+            response = self.client.post('/api/login/', {'email': 'rehash@example.com', 'password': 'wrong'})
+            self.assertEqual(response.json(), {'non_field_errors': ['Invalid credentials']})
+
+    def test_register_relies_on_the_unique_index(self):
+        payload = {
+            'name': 'Ada Lovelace', 'email': 'ada@example.com', 'password': 'Engine123',
+            'confirmPassword': 'Engine123', 'role': 'head',
+        }
+        # RegisterView answers /api/register/ first, so call the view directly
+        register = lambda: async_to_sync(register_api)(
+            RequestFactory().post('/api/register/', payload, content_type='application/json')
+        )
+        with self.settings(PASSWORD_HASHER_PARAMS={'PBKDF2_ITERATIONS': 1000}):
+            response = register()
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(json.loads(response.content)['user']['role'], 'Head')
+            self.assertEqual(UserProfile.objects.get(user__email='ada@example.com').role, 'head')
+
+            with CaptureQueriesContext(connection) as queries:
+                response = register()
+        self.assertEqual((response.status_code, json.loads(response.content)), (400, {'error': 'Email already exists'}))
+        self.assertFalse([query for query in queries if query['sql'].startswith('SELECT')])
+
+
+class StubProviderHandler(BaseHTTPRequestHandler):
+    """Google-style userinfo endpoint: ``Bearer good`` is valid, ``Bearer slow`` never answers in time."""
+    calls = []
+
+    def do_GET(self):
+        token = self.headers.get('Authorization', '').removeprefix('Bearer ')
+        type(self).calls.append(token)
+        if token == 'slow':
+            time.sleep(1)
+        status, body = (200, {'sub': 'g-123', 'email': 'social@example.com'}) if token == 'good' else (401, {})
+        payload = json.dumps(body).encode()
+        try:
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        except BrokenPipeError:
+            pass  # The client timed out, which is what the slow token is for
+
+    def log_message(self, *args):
+        pass
+
+
+class SocialAuthTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), StubProviderHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+
+    def setUp(self):
+        cache.clear()
+        StubProviderHandler.calls = []
+        url = f'http://127.0.0.1:{self.server.server_port}/userinfo'
+        self.enterContext(override_settings(SOCIAL_AUTH_USERINFO_URLS={'google': url}, SOCIAL_AUTH_TIMEOUT=(1, 0.2)))
+
+    def login(self, token):
+        return self.client.post('/api/social-auth/', {'provider': 'google', 'access_token': token})
+
+    def test_validated_tokens_are_cached(self):
+        for _ in range(2):
+            response = self.login('good')
+            self.assertEqual(response.json()['email'], 'social@example.com')
+        self.assertEqual(StubProviderHandler.calls, ['good'])
+        account = SocialAccount.objects.select_related('user').get()
+        self.assertEqual((account.provider_id, account.user.is_email_verified), ('g-123', True))
+
+    def test_rejected_and_slow_providers(self):
+        self.assertEqual(self.login('bad').status_code, 400)
+        started = time.monotonic()
+        self.assertEqual(self.login('slow').status_code, 502)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertFalse(User.objects.exists())
+
+
+class QueryPlanTests(TestCase):
+
+    def test_hot_queries_use_their_indexes(self):
+        # --check raises CommandError naming any query that lost its index
+        call_command(
+            'bench_indexes', users=20, projects=5, tasks=500, notifications=1000, cards=200,
+            repeat=1, check=True, stdout=StringIO(),
+        )
+
+
+class DatabaseTuningTests(TestCase):
+
+    def test_sqlite_connections_are_tuned(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+
+
+class ReplicaRoutingTests(TestCase):
+    """Opted-in list views read from a replica, here a second SQLite database."""
+
+    # The 'replica' alias is only registered in setUpClass
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.replica_dir = tempfile.mkdtemp()
+        connections.settings['replica'] = connections.configure_settings({'default': {
+            'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(cls.replica_dir, 'replica.sqlite3'),
+        }})['default']
+        call_command('migrate', database='replica', verbosity=0)
+        cls.enterClassContext(override_settings(DATABASE_REPLICAS=['replica']))
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['replica'].close()
+        del connections['replica']
+        del connections.settings['replica']
+        shutil.rmtree(cls.replica_dir, ignore_errors=True)
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email='replica@example.com', password='secret')
+        Notification.objects.create(user=self.user, notification_type='update', message='On the primary')
+        # The replica has not caught up with the primary's notification yet
+        User.objects.using('replica').bulk_create([User(id=self.user.id, email=self.user.email)])
+        Notification.objects.using('replica').bulk_create([
+            Notification(user_id=self.user.id, notification_type='update', message='On the replica'),
+        ])
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_safe_reads_go_to_the_replica(self):
+        response = self.client.get('/api/notifications/')
+        self.assertContains(response, 'On the replica')
+        self.assertNotContains(response, 'On the primary')
+
+    def test_writer_reads_the_primary_until_the_pin_expires(self):
+        self.client.patch('/api/notifications/mark-as-read/', {}, format='json')
+        self.assertFalse(Notification.objects.filter(user=self.user, is_read=False).exists())
+        self.assertContains(self.client.get('/api/notifications/'), 'On the primary')
+
+        # Pinned by user id as well, so another device of the same user sees the write
+        other_device = APIClient()
+        other_device.force_authenticate(self.user)
+        self.assertContains(other_device.get('/api/notifications/'), 'On the primary')
+
+        cache.clear()
+        self.client.cookies.clear()
+        self.assertContains(self.client.get('/api/notifications/'), 'On the replica')
+
+    def test_bodies_from_the_replica_carry_no_validators(self):
+        Project.objects.create(name='On the primary', created_by=self.user)
+        Project.objects.using('replica').bulk_create([Project(name='Only on the replica', created_by_id=self.user.id)])
+        client = APIClient()
+        response = client.get('/api/projects/')
+        self.assertContains(response, 'Only on the replica')
+        self.assertNotIn('ETag', response)
+
+        # A reader pinned to the primary gets validators, which later replica reads honour
+        client.cookies[PIN_COOKIE] = str(int(time.time()) + 60)
+        response = client.get('/api/projects/')
+        self.assertContains(response, 'On the primary')
+        del client.cookies[PIN_COOKIE]
+        self.assertEqual(client.get('/api/projects/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+
+class ResponseCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='cached@example.com', password='secret')
+        cls.project = Project.objects.create(name='Cached', created_by=cls.user)
+        cls.other = Project.objects.create(name='Other', created_by=cls.user)
+        cls.project.members.add(cls.user)
+        cls.other.members.add(cls.user)
+
+    def setUp(self):
+        cache.clear()
+        caches['responses'].clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/projects/{self.project.id}/events/'
+
+    def add_event(self, project, title):
+        with self.captureOnCommitCallbacks(execute=True):
+            Event.objects.create(
+                project=project, title=title, created_by=self.user,
+                start_date=timezone.now(), end_date=timezone.now(),
+            )
+
+    def test_repeated_reads_are_served_from_the_cache(self):
+        self.add_event(self.project, 'Kickoff')
+        first = self.client.get(self.url)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(stats()['events'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_stats_are_served_to_admins(self):
+        self.client.get(self.url)
+        self.assertEqual(self.client.get('/api/response-cache/stats/').status_code, 403)
+        admin = User.objects.create_user(email='cache-admin@example.com', password='secret', is_staff=True)
+        self.client.force_authenticate(admin)
+        response = self.client.get('/api/response-cache/stats/')
+        self.assertEqual(response.data['events'], {'hits': 0, 'misses': 1, 'hit_ratio': 0.0})
+
+    def test_writes_invalidate_only_their_project(self):
+        self.client.get(self.url)
+        self.add_event(self.other, 'Elsewhere')
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+        self.add_event(self.project, 'Retro')
+        self.assertEqual([event['title'] for event in self.client.get(self.url).json()], ['Retro'])
+
+    def test_replica_reads_are_not_cached(self):
+        with patch('accounts.mixins.reading_from_replica', return_value=True):
+            self.client.get(self.url)
+            self.client.get(self.url)
+        self.assertEqual(stats()['events']['hits'], 0)
+
+    def test_file_based_backend(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        responses = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': directory}
+        with override_settings(CACHES={**settings.CACHES, 'responses': responses}):
+            self.client.get(self.url)
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+            self.assertEqual(stats()['events']['hits'], 1)
+            self.add_event(self.project, 'Planning')
+            self.assertEqual(len(self.client.get(self.url).json()), 1)
+
+
+class JSONPipelineTests(TestCase):
+
+    def test_renderer_matches_drf(self):
+        data = {
+            'when': timezone.now(), 'due': timezone.now().date(), 'amount': Decimal('1.50'),
+            'text': 'caf\u00e9 \u2028', 1: [None, True],
+        }
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_numbers_decode_like_drf(self):
+        # Wider than 64 bits: orjson refuses it, so the stdlib encodes the document
+        data = {'big': 2 ** 70, 'small': 1}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        # Exponents are spelt 1e16 rather than 1e+16, which decodes the same
+        data = {'large': 1e16, 'tiny': 1.5e-7, 'plain': 0.1}
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_parser_rejects_malformed_json(self):
+        parse = lambda body: ORJSONParser().parse(BytesIO(body), 'application/json', {})
+        self.assertEqual(parse(b'{"ids": [1, 2]}'), {'ids': [1, 2]})
+        with self.assertRaises(ParseError):
+            parse(b'{"ids": NaN}')
+
+    def test_streamed_task_list_matches_the_plain_document(self):
+        user = User.objects.create_user(email='stream-json@example.com', password='secret')
+        Task.objects.bulk_create(Task(title=f'Task {i}', created_by=user) for i in range(5))
+        response = APIClient().get('/api/tasks/?stream=json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(len(json.loads(b''.join(response.streaming_content))), 5)
+
+        # Batches are spliced into one array
+        streamed = stream_json(Task.objects.order_by('id'), TaskSerializer, chunk_size=2)
+        tasks = json.loads(b''.join(streamed.streaming_content))
+        self.assertEqual([task['title'] for task in tasks], [f'Task {i}' for i in range(5)])
+
+
+class BoardSnapshotTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='boards@example.com', password='secret')
+        cls.project = Project.objects.create(name='Boards', created_by=cls.user)
+        cls.board = Board.objects.create(project=cls.project)
+        cls.todo = BoardList.objects.create(board=cls.board, name='To do', position=0)
+        cls.done = BoardList.objects.create(board=cls.board, name='Done', position=1)
+        cls.card = Card.objects.create(list=cls.todo, title='Write tests', created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = f'/api/public/boards/{self.board.id}/snapshot/'
+
+    def test_snapshot_nests_cards_and_is_served_from_cache(self):
+        snapshot = self.client.get(self.url).data
+        self.assertEqual([item['name'] for item in snapshot['lists']], ['To do', 'Done'])
+        self.assertEqual([card['title'] for card in snapshot['lists'][0]['cards']], ['Write tests'])
+        self.assertEqual(snapshot['lists'][1]['cards'], [])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url).data, snapshot)
+        lists = self.client.get(f'/api/public/boards/{self.board.id}/lists/').data
+        self.assertEqual(lists, snapshot['lists'])
+
+    def test_card_and_list_changes_bump_the_version(self):
+        version = self.client.get(self.url).data['version']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.card.list = self.done
+            self.card.save()
+        snapshot = self.client.get(self.url).data
+        self.assertGreater(snapshot['version'], version)
+        self.assertEqual([card['title'] for card in snapshot['lists'][1]['cards']], ['Write tests'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.todo.delete()
+        snapshot_after_delete = self.client.get(self.url).data
+        self.assertGreater(snapshot_after_delete['version'], snapshot['version'])
+        self.assertEqual([item['name'] for item in snapshot_after_delete['lists']], ['Done'])
+
+
+class ConditionalGetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='conditional@example.com', password='secret')
+        Task.objects.create(title='Cached', created_by=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_matching_etag_is_answered_without_queries(self):
+        response = self.client.get('/api/tasks/')
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            not_modified = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertEqual(self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH='W/' + response['ETag']).status_code, 304)
+        self.assertEqual(self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+    def test_writes_and_other_queries_change_the_etag(self):
+        etag = self.client.get('/api/tasks/')['ETag']
+        self.assertNotEqual(self.client.get('/api/tasks/?status=done')['ETag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Task.objects.create(title='New', created_by=self.user)
+        response = self.client.get('/api/tasks/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+    def test_if_modified_since(self):
+        last_modified = self.client.get('/api/tasks/')['Last-Modified']
+        self.assertEqual(self.client.get('/api/tasks/', HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        earlier = http_date(time.time() - 3600)
+        self.assertEqual(self.client.get('/api/tasks/', HTTP_IF_MODIFIED_SINCE=earlier).status_code, 200)
+
+    def test_unchanged_board_snapshot_is_not_modified(self):
+        board = Board.objects.create(project=Project.objects.create(name='Conditional', created_by=self.user))
+        url = f'/api/public/boards/{board.id}/snapshot/'
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            BoardList.objects.create(board=board, name='New list')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class TaskListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='tasks@example.com', password='secret')
+        cls.other = User.objects.create_user(email='other-tasks@example.com', password='secret')
+        cls.project = Project.objects.create(name='Listing', created_by=cls.user)
+        cls.tasks = [
+            Task.objects.create(title=f'Task {i}', project=cls.project, created_by=cls.user, due_date=f'2025-01-0{i + 1}')
+            for i in range(5)
+        ]
+        cls.tasks[0].assigned_to = cls.other
+        cls.tasks[0].status = 'done'
+        cls.tasks[0].save()
+        Task.objects.create(title='Elsewhere', created_by=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def titles(self, response):
+        return [task['title'] for task in response.data['results']]
+
+    def test_cursor_walks_every_task_once_in_creation_order(self):
+        seen = []
+        url = '/api/tasks/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen += self.titles(response)
+            url = response.data['next']
+        self.assertEqual(seen, [task.title for task in Task.objects.order_by('created_at', 'id')])
+
+    def test_invalid_cursor_is_not_found(self):
+        self.assertEqual(self.client.get('/api/tasks/?cursor=garbage').status_code, 404)
+
+    def test_filters(self):
+        response = self.client.get(f'/api/tasks/?project={self.project.id}&due_after=2025-01-02&due_before=2025-01-04')
+        self.assertEqual(self.titles(response), ['Task 1', 'Task 2', 'Task 3'])
+        response = self.client.get(f'/api/tasks/?assigned_to={self.other.id}&status=done')
+        self.assertEqual(self.titles(response), ['Task 0'])
+
+    def test_malformed_filters_are_rejected(self):
+        for query in ('project=abc', 'assigned_to=1.5', 'due_after=tomorrow'):
+            response = self.client.get(f'/api/tasks/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn(query.split('=')[0], response.data)
+
+
+class SubTaskRollupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='rollups@example.com', password='secret')
+        cls.project = Project.objects.create(name='Rollups', created_by=cls.user)
+        cls.task = Task.objects.create(title='Parent', project=cls.project, created_by=cls.user)
+        cls.empty = Task.objects.create(title='Empty', project=cls.project, created_by=cls.user)
+        SubTask.objects.create(parent_task=cls.task, title='Done', completed=True, due_date='2025-01-01')
+        SubTask.objects.create(parent_task=cls.task, title='Later', due_date='2025-03-01')
+        SubTask.objects.create(parent_task=cls.task, title='Sooner', due_date='2025-02-01')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_expanded_task_list_includes_subtasks_and_rollups(self):
+        response = self.client.get(f'/api/tasks/?project={self.project.id}&expand=subtasks')
+        tasks = {task['title']: task for task in response.data['results']}
+        self.assertEqual(len(tasks['Parent']['subtasks']), 3)
+        self.assertEqual(
+            tasks['Parent']['rollup'],
+            {'subtask_count': 3, 'completed_count': 1, 'next_due_date': date(2025, 2, 1)},
+        )
+        self.assertEqual(tasks['Empty']['rollup'], {'subtask_count': 0, 'completed_count': 0, 'next_due_date': None})
+        self.assertNotIn('subtasks', self.client.get('/api/tasks/').data['results'][0])
+
+    def test_batch_groups_subtasks_by_task(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/subtasks/batch/?task_ids={self.task.id},{self.empty.id}')
+        self.assertEqual(sorted(response.data), [self.task.id, self.empty.id])
+        self.assertEqual([item['title'] for item in response.data[self.task.id]['subtasks']], ['Done', 'Later', 'Sooner'])
+        self.assertEqual(response.data[self.task.id]['rollup']['completed_count'], 1)
+        self.assertEqual(response.data[self.empty.id]['subtasks'], [])
+
+        by_project = self.client.get(f'/api/subtasks/batch/?project={self.project.id}')
+        self.assertEqual(by_project.data, response.data)
+
+    def test_batch_rejects_malformed_ids(self):
+        for query in ('', 'task_ids=1,x', 'project=abc'):
+            self.assertEqual(self.client.get(f'/api/subtasks/batch/?{query}').status_code, 400, query)
+
+
+class GanttScheduleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='gantt@example.com', password='secret')
+        cls.project = Project.objects.create(name='Gantt', created_by=cls.user)
+        chart = GanttChart.objects.create(project=cls.project)
+
+        def task(name, days):
+            return GanttTask.objects.create(
+                gantt_chart=chart, name=name, start_date=date(2025, 1, 1), end_date=date(2025, 1, 1 + days)
+            )
+        cls.design, cls.build, cls.docs, cls.ship = task('Design', 3), task('Build', 2), task('Docs', 1), task('Ship', 2)
+        cls.build.dependencies.add(cls.design)
+        cls.docs.dependencies.add(cls.design)
+        cls.ship.dependencies.add(cls.build, cls.docs)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = f'/api/projects/{self.project.id}/gantt-chart/schedule/'
+
+    def test_dates_slack_and_critical_path(self):
+        schedule = self.client.get(self.url).data
+        self.assertEqual((schedule['project_start'], schedule['project_finish']), (date(2025, 1, 1), date(2025, 1, 8)))
+        self.assertEqual(schedule['critical_path'], [self.design.id, self.build.id, self.ship.id])
+
+        tasks = {task['name']: task for task in schedule['tasks']}
+        self.assertEqual(
+            (tasks['Build']['earliest_start'], tasks['Build']['earliest_finish']), (date(2025, 1, 4), date(2025, 1, 6))
+        )
+        self.assertEqual(
+            (tasks['Docs']['latest_start'], tasks['Docs']['slack'], tasks['Docs']['critical']), (date(2025, 1, 5), 1, False)
+        )
+        self.assertEqual((tasks['Ship']['earliest_start'], tasks['Ship']['slack']), (date(2025, 1, 6), 0))
+
+        with self.assertNumQueries(1):  # the chart id; the schedule itself comes from cache
+            self.assertEqual(self.client.get(self.url).data, schedule)
+
+    def test_cycle_is_a_conflict(self):
+        self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.design.dependencies.add(self.ship)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 409)
+        cycle = response.data['cycle']
+        # Either path through Build or Docs closes the loop
+        self.assertEqual((len(cycle), {self.design.id, self.ship.id} <= set(cycle)), (3, True))
+
+    def test_project_without_chart_is_not_found(self):
+        other = Project.objects.create(name='No chart', created_by=self.user)
+        self.assertEqual(self.client.get(f'/api/projects/{other.id}/gantt-chart/schedule/').status_code, 404)
+
+
+class GanttRescheduleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='reschedule@example.com', password='secret')
+        cls.project = Project.objects.create(name='Reschedule', created_by=cls.user)
+        chart = GanttChart.objects.create(project=cls.project)
+
+        def task(name, start, end, *after):
+            task = GanttTask.objects.create(
+                gantt_chart=chart, name=name, start_date=date(2025, 1, start), end_date=date(2025, 1, end)
+            )
+            task.dependencies.add(*after)
+            return task
+        cls.design = task('Design', 1, 4)
+        cls.build = task('Build', 4, 6, cls.design)
+        cls.ship = task('Ship', 6, 8, cls.build)
+        cls.review = task('Review', 10, 12, cls.design)
+        cls.unrelated = task('Unrelated', 1, 2)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def reschedule(self, task, **dates):
+        return self.client.patch(
+            f'/api/projects/{self.project.id}/gantt-tasks/{task.id}/reschedule/', dates, format='json'
+        )
+
+    def dates(self, task):
+        task.refresh_from_db()
+        return task.start_date.day, task.end_date.day
+
+    def test_only_dependents_that_start_too_early_move(self):
+        schedule_url = f'/api/projects/{self.project.id}/gantt-chart/schedule/'
+        self.assertEqual(self.client.get(schedule_url).data['project_finish'], date(2025, 1, 12))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.reschedule(self.design, end_date='2025-01-06')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(item['id'] for item in response.data['shifted']),
+            sorted([self.design.id, self.build.id, self.ship.id]),
+        )
+        self.assertEqual(self.dates(self.build), (6, 8))
+        self.assertEqual(self.dates(self.ship), (8, 10))
+        self.assertEqual(self.dates(self.review), (10, 12))
+        self.assertEqual(self.dates(self.unrelated), (1, 2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reschedule(self.ship, end_date='2025-01-14')
+        schedule = self.client.get(schedule_url).data
+        self.assertEqual(schedule['project_finish'], date(2025, 1, 14))
+        self.assertEqual(schedule['critical_path'], [self.design.id, self.build.id, self.ship.id])
+
+    def test_unchanged_dates_write_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.reschedule(self.build, start_date='2025-01-04')
+        self.assertEqual(response.data['shifted'], [])
+        self.assertEqual(callbacks, [])
+
+    def test_invalid_moves(self):
+        self.assertEqual(self.reschedule(self.build).status_code, 400)
+        self.assertEqual(self.reschedule(self.build, start_date='2025-01-07').status_code, 400)
+        self.assertEqual(self.dates(self.build), (4, 6))
+
+        other_chart = GanttChart.objects.create(project=Project.objects.create(name='Other', created_by=self.user))
+        foreign = GanttTask.objects.create(
+            gantt_chart=other_chart, name='Foreign', start_date=date(2025, 1, 1), end_date=date(2025, 1, 2)
+        )
+        self.assertEqual(self.reschedule(foreign, start_date='2025-01-01').status_code, 404)
+
+
+class BulkWriteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='bulk@example.com', password='secret')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def write(self, mode, rows):
+        return self.client.post('/api/tasks/bulk/', {'mode': mode, 'rows': rows}, format='json')
+
+    def test_bulk_writes_require_authentication(self):
+        response = APIClient().post('/api/tasks/bulk/', {'rows': [{'title': 'Anonymous'}]}, format='json')
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Task.objects.exists())
+
+    def test_bad_rows_are_reported_without_failing_the_rest(self):
+        response = self.write('create', [
+            {'title': 'Good', 'external_id': 'good', 'due_date': '2025-03-01'},
+            {'title': 'Numeric date', 'due_date': 5},
+            {'title': 'List date', 'due_date': [1]},
+            {'description': 'No title'},
+            {'title': 'Unknown assignee', 'assigned_to': 999999},
+            'not an object',
+        ])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['failed']), (1, 5))
+        errors = {error['row']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4, 5])
+        self.assertIn('due_date', errors[1])
+        self.assertIn('due_date', errors[2])
+        self.assertIn('title', errors[3])
+        self.assertIn('assigned_to', errors[4])
+        task = Task.objects.get()
+        self.assertEqual((task.external_id, task.created_by), ('good', self.user))
+
+    def test_update_and_upsert_match_on_id_or_external_id(self):
+        task = Task.objects.create(title='Old', external_id='ext-1', created_by=self.user)
+
+        response = self.write('update', [{'id': task.id, 'status': 'done'}, {'id': 999999, 'title': 'Missing'}])
+        self.assertEqual((response.data['updated'], response.data['failed']), (1, 1))
+
+        response = self.write('upsert', [{'external_id': 'ext-1', 'title': 'Renamed'}, {'external_id': 'ext-2', 'title': 'New'}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 1))
+        task.refresh_from_db()
+        self.assertEqual((task.title, task.status), ('Renamed', 'done'))
+        self.assertTrue(Task.objects.filter(external_id='ext-2', title='New').exists())
+
+        response = self.write('create', [{'external_id': 'ext-2', 'title': 'Again'}])
+        self.assertIn('external_id', response.data['errors'][0]['errors'])
+
+
+class TaskAssignmentNotificationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(email='assigner@example.com', password='secret')
+        cls.alice = User.objects.create_user(email='alice@example.com', password='secret')
+        cls.bob = User.objects.create_user(email='bob@example.com', password='secret')
+
+    def assigned(self, user):
+        return Notification.objects.filter(user=user, notification_type='task_assigned').count()
+
+    def test_one_insert_per_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(5):
+                Task.objects.create(title=f'Task {i}', assigned_to=self.alice, created_by=self.owner)
+            self.assertEqual(self.assigned(self.alice), 0)
+        self.assertEqual(self.assigned(self.alice), 5)
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                for task in Task.objects.all():
+                    task.assigned_to = self.bob
+                    task.save()
+        inserts = [q for q in queries if q['sql'].startswith('INSERT') and 'accounts_notification"' in q['sql']]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(self.assigned(self.bob), 5)
+
+    def test_only_a_changed_assignee_is_notified(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(title='Diffed', assigned_to=self.alice, created_by=self.owner)
+        task = Task.objects.get(id=task.id)
+
+        with self.captureOnCommitCallbacks(execute=True), self.assertNumQueries(1):
+            task.title = 'Renamed'
+            task.save()
+        self.assertEqual(self.assigned(self.alice), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.assigned_to = self.bob
+            task.save()
+            task.assigned_to = None
+            task.save()
+        self.assertEqual((self.assigned(self.alice), self.assigned(self.bob)), (1, 1))
+
+    def test_rolled_back_and_deleted_tasks_are_not_notified(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Task.objects.create(title='Rolled back', assigned_to=self.alice, created_by=self.owner)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            Task.objects.create(title='Deleted', assigned_to=self.alice, created_by=self.owner).delete()
+            Task.objects.create(title='Kept', assigned_to=self.bob, created_by=self.owner)
+        self.assertEqual(self.assigned(self.alice), 0)
+        self.assertEqual(
+            list(Notification.objects.values_list('message', flat=True)),
+            ['You have been assigned a new task: Kept'],
+        )
+
+
+class NotificationCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='bell@example.com', password='secret')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def notify(self, count):
+        return create_notifications([
+            Notification(user=self.user, notification_type='update', message=f'Note {i}')
+            for i in range(count)
+        ])
+
+    def unread(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/notifications/unread-count/')
+        return response.data['unread']
+
+    def test_counter_follows_creates_reads_and_deletes(self):
+        self.notify(3)
+        single = Notification.objects.create(user=self.user, notification_type='update', message='One')
+        self.assertEqual(self.unread(), 4)
+
+        single.is_read = True
+        single.save()
+        self.assertEqual(self.unread(), 3)
+
+        Notification.objects.filter(is_read=False).first().delete()
+        self.assertEqual(self.unread(), 2)
+
+    def test_mark_selected_ids_as_read(self):
+        first, second, third = self.notify(3)
+        response = self.client.patch(
+            '/api/notifications/mark-as-read/', {'ids': [first.id, second.id]}, format='json'
+        )
+        self.assertEqual((response.data['marked'], response.data['unread']), (2, 1))
+
+        # Marking the same rows again must not push the counter below the truth
+        response = self.client.patch('/api/notifications/mark-as-read/', {'ids': [first.id]}, format='json')
+        self.assertEqual((response.data['marked'], response.data['unread']), (0, 1))
+
+    def test_mark_read_up_to_timestamp(self):
+        older, newer = self.notify(2)
+        Notification.objects.filter(id=older.id).update(created_at=newer.created_at - timedelta(hours=1))
+        response = self.client.patch(
+            '/api/notifications/mark-as-read/',
+            {'before': (newer.created_at - timedelta(minutes=1)).isoformat()}, format='json',
+        )
+        self.assertEqual((response.data['marked'], response.data['unread']), (1, 1))
+        self.assertFalse(Notification.objects.get(id=newer.id).is_read)
+
+    def test_reconcile_repairs_drift(self):
+        self.notify(2)
+        NotificationCounter.objects.filter(user=self.user).update(unread=7)
+        call_command('reconcile_notification_counters', stdout=StringIO())
+        self.assertEqual(self.unread(), 2)
+
+
+class NotificationRetentionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='retain@example.com', password='secret')
+        cls.task = Task.objects.create(title='Repeated', created_by=cls.user)
+
+    def notification(self, age_days=0, **fields):
+        fields = {'user': self.user, 'notification_type': 'update', 'message': 'Note', **fields}
+        notification = create_notifications([Notification(**fields)])[0]
+        Notification.objects.filter(id=notification.id).update(created_at=timezone.now() - timedelta(days=age_days))
+        return notification
+
+    def test_prune_collapses_archives_and_keeps_counters(self):
+        repeats = [self.notification(notification_type='task_assigned', related_task=self.task) for _ in range(3)]
+        old_read = self.notification(age_days=40, is_read=True)
+        old_unread = self.notification(age_days=200)
+        recent_read = self.notification(age_days=1, is_read=True)
+
+        call_command('prune_notifications', batch_size=1, stdout=StringIO())
+
+        self.assertCountEqual(
+            Notification.objects.values_list('id', flat=True), [repeats[-1].id, recent_read.id]
+        )
+        self.assertCountEqual(
+            NotificationArchive.objects.values_list('id', flat=True), [old_read.id, old_unread.id]
+        )
+        self.assertEqual(NotificationCounter.objects.get(user=self.user).unread, 1)
+
+
+class RecordingBroker:
+    """Stand-in broker that keeps published messages in memory."""
+
+    def __init__(self):
+        self.published = []
+
+    def publish(self, user_id, message):
+        self.published.append((user_id, message))
+
+
+@override_settings(NOTIFICATION_BROKER='accounts.tests.RecordingBroker')
+class NotificationPushTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(email='push@example.com', password='secret')
+
+    def test_new_notification_is_published_on_commit(self):
+        broker = get_broker()
+        with self.captureOnCommitCallbacks(execute=True):
+            notification = Notification.objects.create(
+                user=self.user, notification_type='update', message='Published'
+            )
+            self.assertEqual(broker.published, [])
+        self.assertEqual(broker.published, [(self.user.id, notification_message(notification))])
+
+    def test_in_process_broker_delivers_across_threads(self):
+        async def receive():
+            broker = InProcessBroker()
+            subscription = broker.subscribe(self.user.id)
+            publisher = threading.Thread(target=broker.publish, args=(self.user.id, {'id': 1}))
+            publisher.start()
+            try:
+                return await asyncio.wait_for(subscription.get(), timeout=0.1)
+            finally:
+                publisher.join()
+                subscription.close()
+
+        self.assertEqual(async_to_sync(receive)(), {'id': 1})
+
+
+@override_settings(NOTIFICATION_BROKER='accounts.realtime.InProcessBroker')
+class NotificationStreamTests(TransactionTestCase):
+
+    def test_stream_requires_a_valid_token(self):
+        response = self.client.get('/api/notifications/stream/?token=invalid')
+        self.assertEqual(response.status_code, 401)
+
+    def test_stream_pushes_committed_notifications(self):
+        user = User.objects.create_user(email='stream@example.com', password='secret')
+        token = str(AccessToken.for_user(user))
+
+        async def first_event():
+            response = await AsyncClient().get(f'/api/notifications/stream/?token={token}')
+            events = aiter(response.streaming_content)
+            await anext(events)  # retry hint, sent once subscribed
+            await sync_to_async(Notification.objects.create)(
+                user=user, notification_type='update', message='Live'
+            )
+            return await asyncio.wait_for(anext(events), timeout=1)
+
+        event = async_to_sync(first_event)()
+        self.assertIn(b'event: notification', event)
+        self.assertIn(b'"message": "Live"', event)
@@ -0,0 +1,235 @@
+# accounts/uploads.py
+import base64
+import binascii
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .blobs import find_blob, ingest_path, upload_dir
+from .media import can_read_media
+from .models import FileShare, UploadSession
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None
+
+READ_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    status = 400
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        if status is not None:
+            self.status = status
+
+
+class UploadConflict(UploadError):
+    """The chunk does not start at the session's offset, or another chunk is being written."""
+    status = 409
+
+
+def max_upload_size():
+    return getattr(settings, 'UPLOAD_MAX_SIZE', 5 * 1024 ** 3)
+
+
+def partial_path(session):
+    return os.path.join(upload_dir(), f'{session.id}.part')
+
+
+# Whole-file digests for uploads whose chunks this process has seen in
+# order. A chunk handled by another worker breaks the chain; the digest is
+# then recomputed once from disk when the upload is finished.
+_digests = {}
+_digests_lock = threading.Lock()
+
+
+def _take_digest(session_id, offset):
+    with _digests_lock:
+        entry = _digests.pop(session_id, None)
+    if entry is not None and entry[0] == offset:
+        return entry[1]
+    return None
+
+
+def _keep_digest(session_id, offset, digest):
+    with _digests_lock:
+        _digests[session_id] = (offset, digest)
+
+
+def parse_checksum(header):
+    """Parse an ``Upload-Checksum: <algorithm> <base64 digest>`` header."""
+    try:
+        algorithm, encoded = header.split(' ', 1)
+        expected = base64.b64decode(encoded.strip(), validate=True)
+    except (ValueError, binascii.Error):
+        raise UploadError('Upload-Checksum must be "<algorithm> <base64 digest>".')
+    algorithm = algorithm.lower()
+    if algorithm not in hashlib.algorithms_guaranteed:
+        raise UploadError(f'Unsupported checksum algorithm "{algorithm}".')
+    return algorithm, expected
+
+
+@contextmanager
+def _locked_partial(session):
+    try:
+        fd = os.open(partial_path(session), os.O_RDWR)
+    except FileNotFoundError:
+        raise UploadError('The partial file for this upload is gone; start a new upload.', status=410)
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadConflict('Another chunk for this upload is still being written.')
+        with os.fdopen(fd, 'r+b', closefd=False) as f:
+            yield f
+    finally:
+        os.close(fd)
+
+
+def start_upload(user, filename, size, sha256='', project=None):
+    """Open an upload session, or finish it on the spot if the user can already read the content.
+
+    A digest alone proves nothing about who may see the bytes, so anyone
+    else uploads them in full; ``finish_upload`` checks them against the
+    digest and links the stored blob then.
+    """
+    blob = find_blob(sha256)
+    if blob is not None and blob.size == size and can_read_media(user.pk, blob.file.name):
+        with transaction.atomic():
+            share = FileShare.objects.create(
+                blob=blob, file=blob.file.name, original_name=filename, uploaded_by=user, project=project
+            )
+            return UploadSession.objects.create(
+                user=user, filename=filename, size=size, sha256=blob.sha256, project=project,
+                offset=size, status='complete', file_share=share,
+            )
+
+    session = UploadSession.objects.create(
+        user=user, filename=filename, size=size, sha256=sha256.lower(), project=project
+    )
+    os.makedirs(upload_dir(), exist_ok=True)
+    open(partial_path(session), 'wb').close()
+    _keep_digest(session.id, 0, hashlib.sha256())
+    return session
+
+
+def receive_chunk(session, stream, offset, length, checksum=None):
+    """Append ``length`` bytes from ``stream`` at ``offset``; returns the new offset.
+
+    The body is copied to the partial file in small reads, so memory use does
+    not depend on chunk size. A chunk that arrives short or fails its
+    checksum is cut off again, leaving the upload resumable at ``offset``.
+    """
+    if session.status != 'active':
+        raise UploadConflict('This upload is already complete.')
+    if offset != session.offset:
+        raise UploadConflict(f'Expected a chunk at offset {session.offset}.')
+    if length is None:
+        raise UploadError('Content-Length is required.', status=411)
+    if offset + length > session.size:
+        raise UploadError('Chunk extends past the declared upload size.', status=413)
+
+    chunk_digest = hashlib.new(checksum[0]) if checksum else None
+    with _locked_partial(session) as f:
+        # Chunks may have been committed while this request waited: check the
+        # offset again under the lock, before anything touches the file
+        current = UploadSession.objects.filter(pk=session.pk, status='active').values_list('offset', flat=True).first()
+        if current != offset:
+            raise UploadConflict('The upload moved on while this chunk waited.')
+        file_digest = _take_digest(session.id, offset)
+        # Drop the torn tail of any earlier chunk that failed part-way
+        f.truncate(offset)
+        f.seek(offset)
+        received = 0
+        while received < length:
+            block = stream.read(min(READ_SIZE, length - received))
+            if not block:
+                break
+            f.write(block)
+            received += len(block)
+            if chunk_digest is not None:
+                chunk_digest.update(block)
+            if file_digest is not None:
+                file_digest.update(block)
+
+        if received < length:
+            f.truncate(offset)
+            raise UploadError(f'Chunk ended after {received} of {length} bytes; resend it.')
+        if chunk_digest is not None and chunk_digest.digest() != checksum[1]:
+            f.truncate(offset)
+            raise UploadError('Chunk checksum mismatch; resend it.', status=460)
+        f.flush()
+        os.fsync(f.fileno())
+
+        new_offset = offset + received
+        claimed = UploadSession.objects.filter(pk=session.pk, offset=offset, status='active').update(
+            offset=new_offset, updated_at=timezone.now()
+        )
+        if not claimed:
+            raise UploadConflict('The upload moved on while this chunk was written.')
+
+    session.offset = new_offset
+    if file_digest is not None:
+        _keep_digest(session.id, new_offset, file_digest)
+    return new_offset
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest
+
+
+def finish_upload(session):
+    """Verify the whole-file checksum and turn the upload into a FileShare."""
+    if session.offset != session.size:
+        raise UploadConflict(f'Upload incomplete: {session.offset} of {session.size} bytes received.')
+    if not UploadSession.objects.filter(pk=session.pk, status='active').update(status='complete'):
+        raise UploadConflict('This upload is already complete.')
+
+    path = partial_path(session)
+    try:
+        digest = _take_digest(session.id, session.size) or _hash_file(path)
+        sha256 = digest.hexdigest()
+        if session.sha256 and sha256 != session.sha256:
+            # The bytes on disk are wrong somewhere; there is nothing to resume
+            abort_upload(session)
+            raise UploadError('File checksum mismatch; the upload was discarded.', status=422)
+
+        blob = ingest_path(path, sha256, session.size)
+        with transaction.atomic():
+            share = FileShare.objects.create(
+                blob=blob, file=blob.file.name, original_name=session.filename,
+                uploaded_by=session.user, project=session.project,
+            )
+            session.status = 'complete'
+            session.sha256 = sha256
+            session.file_share = share
+            session.save(update_fields=['status', 'sha256', 'file_share', 'updated_at'])
+    except UploadError:
+        raise
+    except Exception:
+        UploadSession.objects.filter(pk=session.pk).update(status='active')
+        raise
+    return share
+
+
+def abort_upload(session):
+    with _digests_lock:
+        _digests.pop(session.id, None)
+    try:
+        os.remove(partial_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
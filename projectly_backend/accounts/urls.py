@@ -5,6 +5,7 @@ from .views import (
     RoleSelectionView,
     SocialAuthView,
     PublicBoardListsView,
+    PublicBoardSnapshotView,
     PublicCardCreateView
 )
 from .views import (
@@ -18,17 +19,23 @@ from .views import (
 )
 from .views import (
     TaskListCreateView,
+    TaskBulkWriteView,
+    SubTaskBulkWriteView,
     TaskDetailView,
     NotificationListView,
     NotificationMarkAsReadView,
+    NotificationUnreadCountView,
     GanttChartView,
     GanttTaskView,
+    GanttScheduleView,
+    GanttTaskRescheduleView,
+    ResponseCacheStatsView,
     FileListView , 
     ProjectListCreateView
 )
 from .views import (
     ReportListCreateView, ReportDetailView, ReportFileUploadView,
-    SubTaskListCreateView, FileShareListCreateView,
+    SubTaskListCreateView, SubTaskBatchView, FileShareListCreateView,
     AccessPermissionListCreateView
 )
 from django.urls import path
@@ -56,16 +63,24 @@ urlpatterns = [
     path('projects/<int:project_id>/events/', EventListCreateView.as_view(), name='event-list'),
     path('projects/<int:project_id>/communications/', CommunicationListCreateView.as_view(), name='communication-list'),
     path('tasks/', TaskListCreateView.as_view(), name='task-list'),
+    path('tasks/bulk/', TaskBulkWriteView.as_view(), name='task-bulk'),
     path('tasks/<int:pk>/', TaskDetailView.as_view(), name='task-detail'),
     path('files/', FileListView.as_view(), name='file-list'),
     path('notifications/', NotificationListView.as_view(), name='notification-list'),
+    path('notifications/stream/', views.notification_stream, name='notification-stream'),
+    path('notifications/unread-count/', NotificationUnreadCountView.as_view(), name='notification-unread-count'),
     path('notifications/mark-as-read/', NotificationMarkAsReadView.as_view(), name='notification-mark-read'),
     path('projects/<int:project_id>/gantt-chart/', GanttChartView.as_view(), name='gantt-chart'),
+    path('projects/<int:project_id>/gantt-chart/schedule/', GanttScheduleView.as_view(), name='gantt-schedule'),
     path('projects/<int:project_id>/gantt-tasks/', GanttTaskView.as_view(), name='gantt-task-list'),
+    path('projects/<int:project_id>/gantt-tasks/<int:task_id>/reschedule/', GanttTaskRescheduleView.as_view(), name='gantt-task-reschedule'),
+    path('response-cache/stats/', ResponseCacheStatsView.as_view(), name='response-cache-stats'),
     path('reports/', ReportListCreateView.as_view(), name='report-list'),
     path('reports/<int:pk>/', ReportDetailView.as_view(), name='report-detail'),
     path('reports/<int:report_id>/files/', ReportFileUploadView.as_view(), name='report-file-upload'),
     path('tasks/<int:parent_task_id>/subtasks/', SubTaskListCreateView.as_view(), name='subtask-list'),
+    path('subtasks/batch/', SubTaskBatchView.as_view(), name='subtask-batch'),
+    path('subtasks/bulk/', SubTaskBulkWriteView.as_view(), name='subtask-bulk'),
     path('files/share/', FileShareListCreateView.as_view(), name='file-share-list'),
     path('access-permissions/', AccessPermissionListCreateView.as_view(), name='access-permission-list'),
     path('register/', views.register_api, name='register_api'),
@@ -73,9 +88,13 @@ urlpatterns = [
     path('auth/register/', RegisterView.as_view(), name='register'),
     path('auth/login/', LoginView.as_view(), name='login'),
     path('upload-files/', views.upload_files, name='upload-files'),
+    path('uploads/', views.UploadSessionCreateView.as_view(), name='upload-create'),
+    path('uploads/<uuid:upload_id>/', views.UploadSessionView.as_view(), name='upload-session'),
+    path('uploads/<uuid:upload_id>/complete/', views.UploadSessionCompleteView.as_view(), name='upload-complete'),
     path('api/communications/', CommunicationListCreateView.as_view(), name='communication-list'),
     path('api/projects/', ProjectListCreateView.as_view(), name='project-list'),
     path('api/public/boards/<int:board_id>/lists/', PublicBoardListsView.as_view(), name='public-board-lists'),
+    path('api/public/boards/<int:board_id>/snapshot/', PublicBoardSnapshotView.as_view(), name='public-board-snapshot'),
     path('api/public/lists/<int:list_id>/cards/', PublicCardCreateView.as_view(), name='public-create-card'),
 
 ]
\ No newline at end of file
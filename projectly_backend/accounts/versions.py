@@ -0,0 +1,61 @@
+# accounts/versions.py
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _key(namespace, key):
+    return f'version:{namespace}:{key}'
+
+
+def _touched_key(namespace, key):
+    return f'touched:{namespace}:{key}'
+
+
+def _seed():
+    # Seeding from the clock means a version key that was evicted comes back
+    # larger than any value handed out before, so stale entries stay dead.
+    return time.time_ns() // 1000
+
+
+def get_version(namespace, key):
+    """Return the current version number for ``namespace:key``."""
+    cache_key = _key(namespace, key)
+    version = cache.get(cache_key)
+    if version is None:
+        cache.add(cache_key, _seed(), timeout=None)
+        cache.add(_touched_key(namespace, key), time.time(), timeout=None)
+        version = cache.get(cache_key)
+    return version
+
+
+def get_last_modified(namespace, key):
+    """Return the timestamp of the last bump, or ``None`` if it is unknown."""
+    return cache.get(_touched_key(namespace, key))
+
+
+def bump_version(namespace, key):
+    """Invalidate everything cached under the current version of ``namespace:key``.
+
+    The bump runs once the surrounding transaction commits, so readers can
+    never cache pre-commit data under the new version.
+    """
+    def bump():
+        cache_key = _key(namespace, key)
+        try:
+            cache.incr(cache_key)
+        except ValueError:
+            cache.add(cache_key, _seed(), timeout=None)
+        cache.set(_touched_key(namespace, key), time.time(), timeout=None)
+
+    transaction.on_commit(bump)
+
+
+def model_version_key(model):
+    return model._meta.label_lower
+
+
+def bump_model_version(model):
+    """Invalidate validators for every collection of ``model``."""
+    bump_version('model', model_version_key(model))
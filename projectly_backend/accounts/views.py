@@ -4,22 +4,41 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from .serializers import (
     UserRegistrationSerializer,
+    LoginCredentialsSerializer,
     UserLoginSerializer,
     UserProfileSerializer,
     SocialAuthSerializer
 )
-from .models import SocialAccount, UserProfile
-import requests
+from .models import UserProfile
 from django.contrib.auth import get_user_model
-from rest_framework_simplejwt.tokens import RefreshToken
-from django.http import HttpResponse, JsonResponse
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+import asyncio
+import mimetypes
+import posixpath
+from asgiref.sync import sync_to_async
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from django.utils.decorators import method_decorator
+from django.views import View
+import os
+from urllib.parse import quote
+from django.core.files.storage import default_storage
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotAllowed, HttpResponseRedirect, JsonResponse,
+    StreamingHttpResponse
+)
+from django.utils.cache import get_conditional_response
+from django.utils.http import content_disposition_header, http_date
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from .models import (
     Project, Board, BoardList, Card, 
     Attachment, Report, Event, Communication,
-    Task, Notification, GanttChart,
-    SubTask, FileShare, AccessPermission
+    Task, Notification, GanttChart, GanttTask,
+    SubTask, FileShare, AccessPermission, UploadSession, ReportFile
 )
 from .serializers import (
     ProjectSerializer, BoardSerializer, BoardListSerializer,
@@ -28,29 +47,52 @@ from .serializers import (
     TaskSerializer, NotificationSerializer,
     GanttChartSerializer, GanttTaskSerializer,
     SubTaskSerializer, FileShareSerializer,
-    AccessPermissionSerializer, ReportFileSerializer
+    AccessPermissionSerializer, ReportFileSerializer,
+    GanttRescheduleSerializer, NotificationMarkReadSerializer, UploadSessionSerializer,
+    subtask_rollup
 )
-from django.db.models import Q
+from django.db.models import Prefetch, Q
+from django.utils.dateparse import parse_date
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
 import json
 from django.middleware.csrf import get_token
-import os
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
 from django.conf import settings
 from rest_framework import viewsets
 from .models import YourModel
 from .serializers import UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer, YourModelSerializer
+from .pagination import KeysetPagination
+from .mixins import (
+    AuthenticationGroupMixin, ConditionalGetMixin, EagerLoadingMixin, ProjectAccessMixin, ProjectResponseCacheMixin,
+    ReplicaReadMixin, StreamingListMixin,
+)
+from .snapshots import board_snapshot
+from .realtime import get_broker, notification_message
+from .bulk import SubTaskBulkWriter, TaskBulkWriter
+from .scheduling import DependencyCycleError, chart_schedule, reschedule_task
+from .response_cache import invalidate as invalidate_responses, stats as response_cache_stats
+from .notifications import mark_notifications_read, unread_count
+from .authentication import authenticate_credentials, tokens_for_user
+from .hashers import HashingOverloaded, run_hashing
+from .social import ProviderUnavailable, afetch_user_info, social_login_user
+from .media import (
+    CONTENT_ADDRESSED_PREFIXES, FileRange, file_etag, media_row, media_signature_valid, normalize_media_path, parse_range,
+    readable_media, sign_media_url,
+)
+from .uploads import (
+    UploadError, abort_upload, finish_upload, parse_checksum, receive_chunk, start_upload
+)
+from rest_framework import serializers
 
-class ProjectListView(generics.ListAPIView):
+class ProjectListView(AuthenticationGroupMixin, ProjectAccessMixin, generics.ListAPIView):
     serializer_class = ProjectSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return self.request.user.projects.all()
+        return Project.objects.filter(id__in=self.accessible_project_ids())
     
 class YourModelViewSet(viewsets.ModelViewSet):
     queryset = YourModel.objects.all()
@@ -58,6 +100,9 @@ class YourModelViewSet(viewsets.ModelViewSet):
     
 User = get_user_model() 
 
+# Serializers only need the address of users listed in to-many relations
+EMAIL_ONLY_USERS = User.objects.only('id', 'email')
+
 # Utility Views
 def home(request):
     return HttpResponse("Welcome to Projectly Backend{go to this link to open admin panel  http://127.0.0.1:8000/admin/}")
@@ -70,32 +115,167 @@ def upload_files(request):
     if request.method == 'POST':
         try:
             uploaded_files = []
-            for i in range(1, 4):
-                file_key = f'file_{i}'
-                if file_key in request.FILES:
-                    uploaded_file = request.FILES[file_key]
-                    path = default_storage.save(
-                        os.path.join('uploads', uploaded_file.name),
-                        ContentFile(uploaded_file.read())
-                    )
-                    # Save to FileShare model for persistence
-                    file_share = FileShare.objects.create(
-                        file=path,
-                        uploaded_by=User.objects.first()  # Use first user as default
-                    )
-                    uploaded_files.append({
-                        'id': file_share.id,
-                        'name': uploaded_file.name,
-                        'size': uploaded_file.size,
-                        'url': default_storage.url(path)
-                    })
+            # Any number of file_1, file_2, ... fields, in numeric order
+            file_keys = sorted((key for key in request.FILES if key.startswith('file_')), key=lambda key: (len(key), key))
+            for file_key in file_keys:
+                uploaded_file = request.FILES[file_key]
+                # Saving hashes the upload in chunks into the blob store; known content is not written again
+                file_share = FileShare.objects.create(
+                    file=uploaded_file,
+                    uploaded_by=User.objects.first()  # Use first user as default
+                )
+                uploaded_files.append({
+                    'id': file_share.id,
+                    'name': file_share.filename,
+                    'size': uploaded_file.size,
+                    'url': sign_media_url(file_share.file.url, file_share.file.name)
+                })
             return JsonResponse({'status': 'success', 'files': uploaded_files}, status=200)
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
     return JsonResponse({'status': 'error', 'message': 'Invalid request method'}, status=400)
 
+async def notification_stream(request):
+    """Server-sent events carrying the user's new notifications as they commit.
+
+    EventSource cannot set headers, so the access token may also be passed as
+    ``?token=``. Serve through ``projectly_backend.asgi`` so each open stream
+    is a coroutine rather than a blocked worker thread.
+    """
+    user_id = _token_user_id(request)
+    if user_id is None:
+        return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+
+    last_event_id = request.headers.get('Last-Event-ID')
+    keepalive = getattr(settings, 'NOTIFICATION_STREAM_KEEPALIVE', 15)
+
+    async def events():
+        subscription = get_broker().subscribe(user_id)
+        try:
+            yield 'retry: 3000\n\n'
+            if last_event_id and last_event_id.isdigit():
+                # Replay whatever was committed while the client was reconnecting
+                missed = Notification.objects.filter(user_id=user_id, id__gt=int(last_event_id)).order_by('id')
+                async for notification in missed:
+                    yield _sse_event(notification_message(notification))
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscription.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield ': keepalive\n\n'
+                    continue
+                yield _sse_event(message)
+        finally:
+            subscription.close()
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+def _sse_event(message):
+    return f"id: {message['id']}\nevent: notification\ndata: {json.dumps(message, cls=JSONEncoder)}\n\n"
+
+def _token_user_id(request):
+    """User id from a Bearer header or ``?token=`` access token, None if absent or invalid."""
+    header = request.headers.get('Authorization', '')
+    raw_token = header[7:] if header.startswith('Bearer ') else request.GET.get('token')
+    if not raw_token:
+        return None
+    try:
+        return AccessToken(raw_token)[api_settings.USER_ID_CLAIM]
+    except (TokenError, KeyError):
+        return None
+
+def serve_media(request, path):
+    """Send a media file to a user allowed to see it.
+
+    Access follows the FileShare, Attachment or ReportFile rows that use the
+    file, or to a URL signed by a view that already checked it (links the
+    browser opens carry no Authorization header). Range, ETag and
+    Last-Modified are honoured here so the transfer
+    itself can be handed to the front server (``MEDIA_SENDFILE_BACKEND``) or
+    to the WSGI server's ``sendfile()`` path via FileResponse.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponseNotAllowed(['GET', 'HEAD'])
+    name = normalize_media_path(path)
+    signature = request.GET.get('signature')
+    if name is not None and signature and media_signature_valid(name, signature):
+        # Signed by a view that already checked access (see sign_media_url)
+        row = media_row(name)
+    else:
+        user_id = _token_user_id(request)
+        if user_id is None and request.user.is_authenticated:
+            user_id = request.user.pk
+        if user_id is None:
+            return JsonResponse({'detail': 'Authentication credentials were not provided or are invalid.'}, status=401)
+        # Unknown and forbidden files look the same, so names cannot be probed
+        row = readable_media(user_id, name) if name is not None else None
+    if row is None:
+        raise Http404('No such file.')
+    try:
+        full_path = default_storage.path(name)
+    except NotImplementedError:
+        # Remote storage serves its own (signed) URLs
+        return HttpResponseRedirect(default_storage.url(name))
+    try:
+        stat = os.stat(full_path)
+    except FileNotFoundError:
+        raise Http404('No such file.')
+
+    etag = file_etag(name, stat)
+    last_modified = int(stat.st_mtime)
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+
+    size = stat.st_size
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and if_range and if_range not in (etag, http_date(last_modified)):
+        # The client's partial copy is stale: send the whole current file
+        range_header = None
+    try:
+        byte_range = parse_range(range_header, size)
+    except ValueError:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+    start, end = byte_range or (0, size - 1)
+
+    backend = getattr(settings, 'MEDIA_SENDFILE_BACKEND', None)
+    if backend == 'x-accel-redirect':
+        response = HttpResponse()
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip('/') + '/' + quote(name)
+    elif backend == 'x-sendfile':
+        response = HttpResponse()
+        response['X-Sendfile'] = full_path
+    else:
+        if byte_range:
+            response = FileResponse(FileRange(open(full_path, 'rb'), start, end))
+            response.status_code = 206
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        else:
+            response = FileResponse(open(full_path, 'rb'))
+        response['Content-Length'] = end - start + 1 if size else 0
+
+    # The front server applies Range itself to X-Accel-Redirect/X-Sendfile responses
+    # Blobs are stored under their digest; the type and download name come from the upload's name
+    filename = posixpath.basename(name) if name.startswith('previews/') else row.filename
+    response['Content-Type'] = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    if filename:
+        response['Content-Disposition'] = content_disposition_header(False, filename)
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = (
+        'private, max-age=31536000, immutable' if name.startswith(CONTENT_ADDRESSED_PREFIXES) else 'private, no-cache'
+    )
+    return response
+
 @csrf_exempt
-def register_api(request):
+async def register_api(request):
     if request.method != 'POST':
         return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
     
@@ -111,9 +291,6 @@ def register_api(request):
         except ValidationError:
             return JsonResponse({'error': 'Invalid email format'}, status=400)
         
-        if User.objects.filter(email=data['email']).exists():
-            return JsonResponse({'error': 'Email already exists'}, status=400)
-        
         if data['password'] != data['confirmPassword']:
             return JsonResponse({'error': 'Passwords do not match'}, status=400)
         
@@ -126,20 +303,16 @@ def register_api(request):
         if not any(char.isupper() for char in data['password']):
             return JsonResponse({'error': 'Password must contain at least one uppercase letter'}, status=400)
         
-        name_parts = data['name'].split(' ', 1)
-        first_name = name_parts[0]
-        last_name = name_parts[1] if len(name_parts) > 1 else ''
-        
-        user = User.objects.create_user(
-            email=data['email'],
-            password=data['password'],
-            first_name=first_name,
-            last_name=last_name
-        )
-        
-        profile = user.profile
-        profile.role = data['role']
-        profile.save()
+        try:
+            encoded_password = await run_hashing(make_password, data['password'])
+        except HashingOverloaded:
+            return _hashing_overloaded()
+
+        try:
+            # The unique index is the duplicate check, so registering costs no extra query
+            user = await sync_to_async(_create_registered_user)(data['email'], encoded_password, data['name'], data['role'])
+        except IntegrityError:
+            return JsonResponse({'error': 'Email already exists'}, status=400)
         
         return JsonResponse({
             'success': True,
@@ -147,7 +320,7 @@ def register_api(request):
             'user': {
                 'email': user.email,
                 'name': f"{user.first_name} {user.last_name}",
-                'role': profile.get_role_display()
+                'role': dict(UserProfile.ROLE_CHOICES).get(data['role'], data['role'])
             }
         }, status=201)
     
@@ -156,6 +329,33 @@ def register_api(request):
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+def _create_registered_user(email, encoded_password, name, role):
+    name_parts = name.split(' ', 1)
+    with transaction.atomic():
+        user = User(
+            email=User.objects.normalize_email(email),
+            password=encoded_password,
+            first_name=name_parts[0],
+            last_name=name_parts[1] if len(name_parts) > 1 else ''
+        )
+        user.save()
+        # The post_save handler has already created the profile
+        UserProfile.objects.filter(user=user).update(role=role)
+    return user
+
+def _hashing_overloaded():
+    response = JsonResponse({'error': 'Too many sign-ins in progress, please retry shortly.'}, status=503)
+    response['Retry-After'] = '1'
+    return response
+
+def _request_data(request):
+    if request.content_type == 'application/json':
+        try:
+            return json.loads(request.body or b'{}')
+        except json.JSONDecodeError:
+            return None
+    return request.POST
+
 # Authentication Views
 class RegisterView(APIView):
     def post(self, request):
@@ -170,12 +370,31 @@ class RegisterView(APIView):
             }, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class LoginView(APIView):
-    def post(self, request):
-        serializer = UserLoginSerializer(data=request.data)
-        if serializer.is_valid():
-            return Response(serializer.validated_data, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+@method_decorator(csrf_exempt, name='dispatch')
+class LoginView(View):
+    """Password login that verifies the hash on the bounded hashing pool, not the request thread.
+
+    Serve through ``projectly_backend.asgi`` so waiting logins cost a
+    coroutine each instead of a worker.
+    """
+
+    async def post(self, request):
+        serializer = LoginCredentialsSerializer(data=_request_data(request))
+        if not serializer.is_valid():
+            return JsonResponse(serializer.errors, status=400)
+        try:
+            user = await authenticate_credentials(**serializer.validated_data)
+        except HashingOverloaded:
+            return _hashing_overloaded()
+        if user is None:
+            return JsonResponse({'non_field_errors': ['Invalid credentials']}, status=400)
+
+        refresh = await sync_to_async(tokens_for_user)(user)
+        return JsonResponse({
+            'email': user.email,
+            'refresh': str(refresh),
+            'access': str(refresh.access_token),
+        })
 
 class RoleSelectionView(APIView):
     permission_classes = [IsAuthenticated]
@@ -200,93 +419,47 @@ class RoleSelectionView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class SocialAuthView(APIView):
-    def post(self, request):
-        serializer = SocialAuthSerializer(data=request.data)
+@method_decorator(csrf_exempt, name='dispatch')
+class SocialAuthView(View):
+    """Sign in with a provider access token.
+
+    The provider lookup runs on the social-auth pool with strict timeouts
+    (see ``accounts.social``), so a slow provider holds a coroutine rather
+    than a worker.
+    """
+
+    async def post(self, request):
+        serializer = SocialAuthSerializer(data=_request_data(request))
         if not serializer.is_valid():
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            return JsonResponse(serializer.errors, status=400)
         
         provider = serializer.validated_data['provider']
         access_token = serializer.validated_data['access_token']
         
-        user_info = self._get_user_info(provider, access_token)
-        if not user_info:
-            return Response({"error": "Invalid token or provider error"}, 
-                           status=status.HTTP_400_BAD_REQUEST)
-        
-        email = user_info.get('email')
-        if not email:
-            return Response({"error": "Email not provided by the provider"}, 
-                          status=status.HTTP_400_BAD_REQUEST)
-        
         try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            user = User.objects.create_user(email=email, password=None)
-            user.is_email_verified = True
-            user.save()
+            user_info = await afetch_user_info(provider, access_token)
+        except ProviderUnavailable:
+            return JsonResponse({"error": "The provider is not responding, please retry shortly"}, status=502)
+        if not user_info:
+            return JsonResponse({"error": "Invalid token or provider error"}, status=400)
         
-        social_account, created = SocialAccount.objects.get_or_create(
-            provider=provider,
-            provider_id=user_info['id'],
-            defaults={'user': user}
-        )
+        if not user_info.get('email'):
+            return JsonResponse({"error": "Email not provided by the provider"}, status=400)
         
-        refresh = RefreshToken.for_user(user)
-        return Response({
+        user = await sync_to_async(social_login_user)(provider, user_info)
+        refresh = await sync_to_async(tokens_for_user)(user)
+        return JsonResponse({
             'email': user.email,
             'refresh': str(refresh),
             'access': str(refresh.access_token),
         })
-    
-    def _get_user_info(self, provider, access_token):
-        if provider == 'google':
-            return self._get_google_user_info(access_token)
-        elif provider == 'apple':
-            return self._get_apple_user_info(access_token)
-        elif provider == 'microsoft':
-            return self._get_microsoft_user_info(access_token)
-        return None
-    
-    def _get_google_user_info(self, access_token):
-        response = requests.get(
-            'https://www.googleapis.com/oauth2/v3/userinfo',
-            params={'access_token': access_token}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'id': data['sub'],
-                'email': data['email'],
-                'name': data.get('name', '')
-            }
-        return None
-    
-    def _get_apple_user_info(self, access_token):
-        return {
-            'id': access_token[:20],
-            'email': f"apple_user_{access_token[:5]}@example.com"
-        }
-    
-    def _get_microsoft_user_info(self, access_token):
-        response = requests.get(
-            'https://graph.microsoft.com/v1.0/me',
-            headers={'Authorization': f'Bearer {access_token}'}
-        )
-        if response.status_code == 200:
-            data = response.json()
-            return {
-                'id': data['id'],
-                'email': data.get('mail') or data.get('userPrincipalName'),
-                'name': data.get('displayName', '')
-            }
-        return None
 
 # Project Management Views
-class ProjectListCreateView(generics.ListCreateAPIView):
+class ProjectListCreateView(ReplicaReadMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [AllowAny]  # Allow unauthenticated access
     authentication_classes = []  # Remove authentication
+    conditional_models = (Project,)
 
     def get_queryset(self):
         return Project.objects.all()  # Return all projects
@@ -295,86 +468,117 @@ class ProjectListCreateView(generics.ListCreateAPIView):
         default_user = User.objects.first()  # Use first user as default
         serializer.save(created_by=default_user)
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailView(AuthenticationGroupMixin, ProjectAccessMixin, ProjectResponseCacheMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ProjectSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
+    cache_resource = 'project'
+
+    def get_cache_project_id(self):
+        return self.kwargs.get('pk')
 
     def get_queryset(self):
-        return self.request.user.projects.all()
+        return Project.objects.filter(id__in=self.accessible_project_ids())
 
-class BoardView(generics.RetrieveAPIView):
+class BoardView(AuthenticationGroupMixin, ProjectAccessMixin, ProjectResponseCacheMixin, generics.RetrieveAPIView):
     serializer_class = BoardSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
+    cache_resource = 'board'
 
     def get_queryset(self):
-        return Board.objects.filter(project__members=self.request.user)
+        return Board.objects.filter(project_id__in=self.accessible_project_ids())
 
-class BoardListCreateView(generics.ListCreateAPIView):
+class BoardListCreateView(AuthenticationGroupMixin, ProjectAccessMixin, ProjectResponseCacheMixin, generics.ListCreateAPIView):
     serializer_class = BoardListSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
+    cache_resource = 'board'
+
+    def get_cache_project_id(self):
+        return Board.objects.filter(id=self.kwargs.get('board_id')).values_list('project_id', flat=True).first()
 
     def get_queryset(self):
         board_id = self.kwargs.get('board_id')
-        return BoardList.objects.filter(board_id=board_id, board__project__members=self.request.user)
+        return BoardList.objects.filter(board_id=board_id, board__project_id__in=self.accessible_project_ids())
 
     def perform_create(self, serializer):
         board_id = self.kwargs.get('board_id')
-        board = generics.get_object_or_404(Board, id=board_id, project__members=self.request.user)
+        board = generics.get_object_or_404(Board, id=board_id, project_id__in=self.accessible_project_ids())
         serializer.save(board=board)
 
-class CardListCreateView(generics.ListCreateAPIView):
+class CardListCreateView(AuthenticationGroupMixin, ProjectAccessMixin, ProjectResponseCacheMixin, generics.ListCreateAPIView):
     serializer_class = CardSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
+    cache_resource = 'board'
+
+    def get_cache_project_id(self):
+        return BoardList.objects.filter(
+            id=self.kwargs.get('list_id')
+        ).values_list('board__project_id', flat=True).first()
 
     def get_queryset(self):
         list_id = self.kwargs.get('list_id')
-        return Card.objects.filter(list_id=list_id, list__board__project__members=self.request.user)
+        return Card.objects.filter(list_id=list_id, list__board__project_id__in=self.accessible_project_ids())
 
     def perform_create(self, serializer):
         list_id = self.kwargs.get('list_id')
         board_list = generics.get_object_or_404(
             BoardList, 
             id=list_id, 
-            board__project__members=self.request.user
+            board__project_id__in=self.accessible_project_ids()
         )
         serializer.save(created_by=self.request.user, list=board_list)
 
-class CardDetailView(generics.RetrieveUpdateDestroyAPIView):
+class CardDetailView(AuthenticationGroupMixin, ProjectAccessMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CardSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Card.objects.filter(list__board__project__members=self.request.user)
+        return Card.objects.filter(list__board__project_id__in=self.accessible_project_ids())
 
-class AttachmentListCreateView(generics.ListCreateAPIView):
+class AttachmentListCreateView(AuthenticationGroupMixin, ProjectAccessMixin, generics.ListCreateAPIView):
     serializer_class = AttachmentSerializer
+    authentication_group = 'files'
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
-        return Attachment.objects.filter(project_id=project_id, project__members=self.request.user)
+        return self.filter_by_project(Attachment.objects.select_related('blob__preview'), project_id)
 
     def perform_create(self, serializer):
-        project_id = self.kwargs.get('project_id')
-        project = generics.get_object_or_404(Project, id=project_id, members=self.request.user)
+        project = self.get_accessible_project(self.kwargs.get('project_id'))
         serializer.save(uploaded_by=self.request.user, project=project)
 
-class ReportListCreateView(generics.ListCreateAPIView):
+class ReportListCreateView(AuthenticationGroupMixin, ProjectAccessMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     serializer_class = ReportSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
+    select_related = ('created_by',)
+    prefetch_related = (
+        Prefetch('files', queryset=ReportFile.objects.select_related('blob__preview')),
+        Prefetch('shared_with', queryset=EMAIL_ONLY_USERS),
+    )
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
-        return Report.objects.filter(project_id=project_id, project__members=self.request.user)
+        return self.filter_by_project(Report.objects.all(), project_id)
 
     def perform_create(self, serializer):
-        project_id = self.kwargs.get('project_id')
-        project = generics.get_object_or_404(Project, id=project_id, members=self.request.user)
+        project = self.get_accessible_project(self.kwargs.get('project_id'))
         serializer.save(created_by=self.request.user, project=project)
 
-class ReportDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ReportDetailView(AuthenticationGroupMixin, EagerLoadingMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ReportSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
+    select_related = ('created_by',)
+    prefetch_related = (
+        Prefetch('files', queryset=ReportFile.objects.select_related('blob__preview')),
+        Prefetch('shared_with', queryset=EMAIL_ONLY_USERS),
+    )
     
     def get_queryset(self):
         return Report.objects.filter(
@@ -382,43 +586,87 @@ class ReportDetailView(generics.RetrieveUpdateDestroyAPIView):
             Q(shared_with=self.request.user)
         ).distinct()
     
-class EventListCreateView(generics.ListCreateAPIView):
+class EventListCreateView(AuthenticationGroupMixin, ProjectAccessMixin, ProjectResponseCacheMixin, generics.ListCreateAPIView):
     serializer_class = EventSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.IsAuthenticated]
+    cache_resource = 'events'
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
-        return Event.objects.filter(project_id=project_id, project__members=self.request.user)
+        return self.filter_by_project(Event.objects.all(), project_id)
 
     def perform_create(self, serializer):
-        project_id = self.kwargs.get('project_id')
-        project = generics.get_object_or_404(Project, id=project_id, members=self.request.user)
+        project = self.get_accessible_project(self.kwargs.get('project_id'))
         serializer.save(created_by=self.request.user, project=project)
 
-class CommunicationListCreateView(generics.ListCreateAPIView):
+class CommunicationListCreateView(
+    AuthenticationGroupMixin, ProjectAccessMixin, ProjectResponseCacheMixin, EagerLoadingMixin, generics.ListCreateAPIView
+):
     serializer_class = CommunicationSerializer
+    authentication_group = 'projects'
     permission_classes = [permissions.AllowAny]
+    cache_resource = 'communications'
+    select_related = ('sender',)
+    prefetch_related = (Prefetch('recipients', queryset=EMAIL_ONLY_USERS),)
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
-        return Communication.objects.filter(
-            project_id=project_id, 
-            project__members=self.request.user
-        )
+        return self.filter_by_project(Communication.objects.all(), project_id)
 
     def perform_create(self, serializer):
-        project_id = self.kwargs.get('project_id')
-        project = generics.get_object_or_404(Project, id=project_id, members=self.request.user)
+        project = self.get_accessible_project(self.kwargs.get('project_id'))
         serializer.save(sender=self.request.user, project=project)
 
 # Task Management Views
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(ReplicaReadMixin, ConditionalGetMixin, StreamingListMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = []  # Allow unauthenticated access
     authentication_classes = []  # Remove authentication
+    pagination_class = KeysetPagination
+    # Bulk consumers can stream every task without paging
+    stream_ordering = ('created_at', 'id')
+    conditional_models = (Task, SubTask)
 
     def get_queryset(self):
-        return Task.objects.all()  # Return all tasks
+        queryset = Task.objects.all()  # Return all tasks
+        params = self.request.query_params
+
+        for param, lookup in (('project', 'project_id'), ('assigned_to', 'assigned_to_id')):
+            value = params.get(param)
+            if value:
+                if not value.isdigit():
+                    raise serializers.ValidationError({param: 'Expected an integer ID.'})
+                queryset = queryset.filter(**{lookup: int(value)})
+
+        if params.get('status'):
+            queryset = queryset.filter(status=params['status'])
+
+        for param, lookup in (('due_after', 'due_date__gte'), ('due_before', 'due_date__lte')):
+            value = params.get(param)
+            if value:
+                try:
+                    due = parse_date(value)
+                except ValueError:
+                    due = None
+                if due is None:
+                    raise serializers.ValidationError({param: 'Expected a date in YYYY-MM-DD format.'})
+                queryset = queryset.filter(**{lookup: due})
+
+        if 'subtasks' in self.get_expand():
+            queryset = queryset.with_subtask_rollups().prefetch_related(
+                Prefetch('subtasks', queryset=SubTask.objects.select_related('parent_task', 'assigned_to'))
+            )
+
+        return queryset
+
+    def get_expand(self):
+        return set(filter(None, self.request.query_params.get('expand', '').split(',')))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['expand'] = self.get_expand()
+        return context
 
     def perform_create(self, serializer):
         default_user = User.objects.first()  # Use first user as default
@@ -428,6 +676,47 @@ class TaskListCreateView(generics.ListCreateAPIView):
             project = get_object_or_404(Project, id=project_id)
         serializer.save(created_by=default_user, project=project)
 
+class BulkWriteView(APIView):
+    """Create, update or upsert many rows in one request.
+
+    Body: ``{"mode": "create"|"update"|"upsert", "rows": [...]}``. Rows are
+    written in chunks; the response reports counts, per-row errors and
+    throughput. Updates and upserts match rows on ``id`` or ``external_id``.
+    """
+    permission_classes = [IsAuthenticated]  # Mass writes need a known caller, unlike the task list
+    writer_class = None
+
+    def get_writer(self, mode, chunk_size):
+        return self.writer_class(mode=mode, chunk_size=chunk_size)
+
+    def post(self, request, *args, **kwargs):
+        payload = request.data
+        rows = payload.get('rows') if isinstance(payload, dict) else payload
+        mode = payload.get('mode', 'create') if isinstance(payload, dict) else request.query_params.get('mode', 'create')
+        if not isinstance(rows, list):
+            return Response({'rows': ['Expected a list of objects.']}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            chunk_size = int(request.query_params.get('chunk_size') or 0) or None
+        except ValueError:
+            return Response({'chunk_size': ['Expected an integer.']}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            writer = self.get_writer(mode, chunk_size)
+        except ValueError as e:
+            return Response({'mode': [str(e)]}, status=status.HTTP_400_BAD_REQUEST)
+        result = writer.write(rows).as_dict()
+        response_status = status.HTTP_207_MULTI_STATUS if result['failed'] else status.HTTP_200_OK
+        return Response(result, status=response_status)
+
+class TaskBulkWriteView(BulkWriteView):
+    writer_class = TaskBulkWriter
+
+    def get_writer(self, mode, chunk_size):
+        return self.writer_class(mode=mode, chunk_size=chunk_size, created_by=self.request.user)
+
+class SubTaskBulkWriteView(BulkWriteView):
+    writer_class = SubTaskBulkWriter
+
 class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = TaskSerializer
     permission_classes = [AllowAny]  # Allow unauthenticated access
@@ -436,17 +725,23 @@ class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
     def get_queryset(self):
         return Task.objects.all()  # Return all tasks
 
-class FileListView(generics.ListAPIView):
+class FileListView(ReplicaReadMixin, ConditionalGetMixin, StreamingListMixin, EagerLoadingMixin, generics.ListAPIView):
     serializer_class = FileShareSerializer
     permission_classes = [AllowAny]  # Allow unauthenticated access
     authentication_classes = []  # Remove authentication
+    conditional_models = (FileShare, Project)
+    signed_media = True
+    select_related = ('uploaded_by', 'project', 'blob__preview')
+    prefetch_related = (Prefetch('shared_with', queryset=EMAIL_ONLY_USERS),)
 
     def get_queryset(self):
         return FileShare.objects.all()  # Return all files
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(ReplicaReadMixin, AuthenticationGroupMixin, EagerLoadingMixin, generics.ListAPIView):
     serializer_class = NotificationSerializer
+    authentication_group = 'notifications'
     permission_classes = [permissions.IsAuthenticated]
+    select_related = ('related_task', 'related_project')
     
     def get_queryset(self):
         is_read = self.request.query_params.get('is_read')
@@ -457,22 +752,35 @@ class NotificationListView(generics.ListAPIView):
             
         return queryset.order_by('-created_at')
 
-class NotificationMarkAsReadView(generics.UpdateAPIView):
-    serializer_class = NotificationSerializer
-    permission_classes = [permissions.AllowAny]
-    
-    def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user, is_read=False)
+class NotificationUnreadCountView(AuthenticationGroupMixin, APIView):
+    """Badge count for the notification bell, read from the user's counter row."""
+    authentication_group = 'notifications'
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response({'unread': unread_count(request.user)})
+
+class NotificationMarkAsReadView(AuthenticationGroupMixin, generics.UpdateAPIView):
+    """Mark all unread notifications read, or only ``ids`` / those created up to ``before``."""
+    authentication_group = 'notifications'
+    serializer_class = NotificationMarkReadSerializer
+    permission_classes = [permissions.IsAuthenticated]
     
     def update(self, request, *args, **kwargs):
-        notifications = self.get_queryset()
-        notifications.update(is_read=True)
-        return Response({'status': 'notifications marked as read'}, status=status.HTTP_200_OK)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        marked = mark_notifications_read(request.user, **serializer.validated_data)
+        return Response({
+            'status': 'notifications marked as read',
+            'marked': marked,
+            'unread': unread_count(request.user),
+        }, status=status.HTTP_200_OK)
 
 # views.py
-class GanttChartView(generics.RetrieveAPIView):
+class GanttChartView(ProjectResponseCacheMixin, generics.RetrieveAPIView):
     serializer_class = GanttChartSerializer
     permission_classes = [permissions.AllowAny]  # Changed from IsAuthenticated
+    cache_resource = 'gantt'
     
     def get_object(self):
         project_id = self.kwargs.get('project_id')
@@ -480,10 +788,17 @@ class GanttChartView(generics.RetrieveAPIView):
         gantt_chart, created = GanttChart.objects.get_or_create(project=project)
         return gantt_chart
 
-class GanttTaskView(generics.ListCreateAPIView):
+class GanttTaskView(ReplicaReadMixin, ConditionalGetMixin, ProjectResponseCacheMixin, generics.ListCreateAPIView):
     serializer_class = GanttTaskSerializer
     permission_classes = [permissions.AllowAny]  # Changed from IsAuthenticated
+    cache_resource = 'gantt'
     
+    def get_validator_keys(self):
+        chart_id = GanttChart.objects.filter(
+            project_id=self.kwargs.get('project_id')
+        ).values_list('id', flat=True).first()
+        return [('gantt', chart_id)] if chart_id else []
+
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
         project = generics.get_object_or_404(Project, id=project_id)
@@ -496,9 +811,67 @@ class GanttTaskView(generics.ListCreateAPIView):
         gantt_chart = generics.get_object_or_404(GanttChart, project=project)
         serializer.save(gantt_chart=gantt_chart)
 
+class GanttScheduleView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """Critical-path schedule for a project's Gantt chart, computed server-side."""
+    permission_classes = [permissions.AllowAny]
+
+    def get_chart_id(self):
+        if not hasattr(self, '_chart_id'):
+            self._chart_id = GanttChart.objects.filter(
+                project_id=self.kwargs.get('project_id')
+            ).values_list('id', flat=True).first()
+        return self._chart_id
+
+    def get_validator_keys(self):
+        chart_id = self.get_chart_id()
+        return [('gantt', chart_id)] if chart_id else []
+
+    def retrieve(self, request, *args, **kwargs):
+        chart_id = self.get_chart_id()
+        if chart_id is None:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return Response(chart_schedule(chart_id))
+        except DependencyCycleError as e:
+            return Response({'detail': str(e), 'cycle': e.cycle}, status=status.HTTP_409_CONFLICT)
+
+class GanttTaskRescheduleView(APIView):
+    """Move one Gantt task and shift only the dependents that now start too early."""
+    permission_classes = [permissions.AllowAny]
+
+    def patch(self, request, project_id, task_id):
+        chart = generics.get_object_or_404(GanttChart, project_id=project_id)
+        serializer = GanttRescheduleSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            shifted = reschedule_task(chart.id, task_id, **serializer.validated_data)
+        except GanttTask.DoesNotExist:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        except ValueError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except DependencyCycleError as e:
+            return Response({'detail': str(e), 'cycle': e.cycle}, status=status.HTTP_409_CONFLICT)
+        if shifted:
+            # bulk_update skips post_save, so the response cache is not told by a signal
+            invalidate_responses(project_id, 'gantt')
+        return Response({'task': task_id, 'shifted': shifted})
+
+class ResponseCacheStatsView(APIView):
+    """Response cache hits, misses and hit ratio per resource, for monitoring.
+
+    Served by the app itself so the counters are readable whatever the
+    cache backend: with the default local-memory cache they live in this
+    process, where a management command cannot see them.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(response_cache_stats())
+
 # Report and File Sharing Views
-class ReportFileUploadView(generics.CreateAPIView):
+class ReportFileUploadView(AuthenticationGroupMixin, generics.CreateAPIView):
     serializer_class = ReportFileSerializer
+    authentication_group = 'files'
     permission_classes = [permissions.IsAuthenticated]
     
     def create(self, request, *args, **kwargs):
@@ -512,10 +885,11 @@ class ReportFileUploadView(generics.CreateAPIView):
         file_serializer.save(report=report)
         return Response(file_serializer.data, status=status.HTTP_201_CREATED)
 
-class SubTaskListCreateView(generics.ListCreateAPIView):
+class SubTaskListCreateView(EagerLoadingMixin, generics.ListCreateAPIView):
     serializer_class = SubTaskSerializer
     permission_classes = [AllowAny]  # Allow unauthenticated access
     authentication_classes = []  # Remove authentication
+    select_related = ('parent_task', 'assigned_to')
 
     def get_queryset(self):
         parent_task_id = self.kwargs.get('parent_task_id')
@@ -525,9 +899,55 @@ class SubTaskListCreateView(generics.ListCreateAPIView):
         parent_task = get_object_or_404(Task, id=self.kwargs['parent_task_id'])
         serializer.save(parent_task=parent_task)
 
-class FileShareListCreateView(generics.ListCreateAPIView):
+class SubTaskBatchView(generics.GenericAPIView):
+    """Subtasks for many tasks at once, grouped by parent with SQL rollups.
+
+    Takes either ``?task_ids=1,2,3`` or ``?project=<id>`` and answers with one
+    query for the subtasks and one for the per-task rollups.
+    """
+    serializer_class = SubTaskSerializer
+    permission_classes = [AllowAny]  # Allow unauthenticated access
+    authentication_classes = []  # Remove authentication
+    max_task_ids = 1000
+
+    def get_task_filter(self):
+        params = self.request.query_params
+        if params.get('task_ids'):
+            try:
+                task_ids = {int(value) for value in params['task_ids'].split(',') if value}
+            except ValueError:
+                raise serializers.ValidationError({'task_ids': 'Expected a comma-separated list of task IDs.'})
+            if len(task_ids) > self.max_task_ids:
+                raise serializers.ValidationError({'task_ids': f'At most {self.max_task_ids} task IDs per request.'})
+            return Q(id__in=task_ids)
+        if params.get('project'):
+            if not params['project'].isdigit():
+                raise serializers.ValidationError({'project': 'Expected an integer ID.'})
+            return Q(project_id=int(params['project']))
+        raise serializers.ValidationError({'detail': 'Provide task_ids or project.'})
+
+    def get(self, request, *args, **kwargs):
+        task_filter = self.get_task_filter()
+        tasks = Task.objects.filter(task_filter).with_subtask_rollups()
+        subtasks = SubTask.objects.filter(
+            parent_task__in=Task.objects.filter(task_filter).values('id')
+        ).select_related('parent_task', 'assigned_to').order_by('parent_task_id', 'id')
+
+        grouped = {}
+        for task in tasks:
+            grouped[task.id] = {'subtasks': [], 'rollup': subtask_rollup(task)}
+        for item in self.get_serializer(subtasks, many=True).data:
+            grouped[item['parent_task']]['subtasks'].append(item)
+        return Response(grouped)
+
+class FileShareListCreateView(AuthenticationGroupMixin, ConditionalGetMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     serializer_class = FileShareSerializer
+    authentication_group = 'files'
     permission_classes = [permissions.IsAuthenticated]
+    conditional_models = (FileShare, Project)
+    signed_media = True
+    select_related = ('uploaded_by', 'project', 'blob__preview')
+    prefetch_related = (Prefetch('shared_with', queryset=EMAIL_ONLY_USERS),)
     
     def get_queryset(self):
         project_id = self.request.query_params.get('project_id')
@@ -556,9 +976,93 @@ class FileShareListCreateView(generics.ListCreateAPIView):
     def perform_create(self, serializer):
         serializer.save(uploaded_by=self.request.user)
 
-class AccessPermissionListCreateView(generics.ListCreateAPIView):
+class UploadSessionCreateView(AuthenticationGroupMixin, ProjectAccessMixin, APIView):
+    """Start a resumable upload: declare the name, size and optionally the SHA-256."""
+    authentication_group = 'files'
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = UploadSessionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        project = serializer.validated_data.get('project')
+        if project is not None:
+            self.get_accessible_project(project.id)
+        session = start_upload(request.user, **serializer.validated_data)
+        response = Response(UploadSessionSerializer(session).data, status=status.HTTP_201_CREATED)
+        response['Location'] = request.build_absolute_uri(f'{session.id}/')
+        response['Upload-Offset'] = session.offset
+        response['Upload-Chunk-Size'] = getattr(settings, 'UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)
+        return response
+
+class UploadSessionView(AuthenticationGroupMixin, APIView):
+    """Send chunks with PUT at ``Upload-Offset``; HEAD/GET report where to resume."""
+    authentication_group = 'files'
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_session(self, request, upload_id):
+        return get_object_or_404(UploadSession, id=upload_id, user=request.user)
+
+    def with_offset(self, response, session):
+        response['Upload-Offset'] = session.offset
+        response['Upload-Length'] = session.size
+        response['Cache-Control'] = 'no-store'
+        return response
+
+    def get(self, request, upload_id):
+        session = self.get_session(request, upload_id)
+        return self.with_offset(Response(UploadSessionSerializer(session).data), session)
+
+    def head(self, request, upload_id):
+        return self.with_offset(Response(), self.get_session(request, upload_id))
+
+    def put(self, request, upload_id):
+        session = self.get_session(request, upload_id)
+        try:
+            offset = int(request.headers.get('Upload-Offset', ''))
+            length = request.headers.get('Content-Length')
+            length = int(length) if length else None
+        except ValueError:
+            return self.with_offset(
+                Response({'detail': 'Upload-Offset and Content-Length must be integers.'}, status=status.HTTP_400_BAD_REQUEST),
+                session,
+            )
+        try:
+            checksum = request.headers.get('Upload-Checksum')
+            # Read the raw body stream; request.data would buffer the whole chunk
+            receive_chunk(session, request.stream, offset, length, parse_checksum(checksum) if checksum else None)
+        except UploadError as e:
+            session.refresh_from_db()
+            return self.with_offset(Response({'detail': str(e)}, status=e.status), session)
+        return self.with_offset(Response(status=status.HTTP_204_NO_CONTENT), session)
+
+    def delete(self, request, upload_id):
+        abort_upload(self.get_session(request, upload_id))
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class UploadSessionCompleteView(AuthenticationGroupMixin, APIView):
+    """Verify the received file and turn it into a FileShare."""
+    authentication_group = 'files'
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request, upload_id):
+        session = get_object_or_404(UploadSession, id=upload_id, user=request.user)
+        try:
+            share = finish_upload(session)
+        except UploadError as e:
+            return Response({'detail': str(e)}, status=e.status)
+        return Response({
+            'id': share.id,
+            'name': session.filename,
+            'size': session.size,
+            'sha256': session.sha256,
+            'url': sign_media_url(share.file.url, share.file.name),
+        }, status=status.HTTP_201_CREATED)
+
+class AccessPermissionListCreateView(AuthenticationGroupMixin, ProjectAccessMixin, EagerLoadingMixin, generics.ListCreateAPIView):
     serializer_class = AccessPermissionSerializer
+    authentication_group = 'projects'
     permission_classes = [AllowAny]
+    select_related = ('user', 'project', 'granted_by')
     
     def get_queryset(self):
         project_id = self.request.query_params.get('project_id')
@@ -570,11 +1074,8 @@ class AccessPermissionListCreateView(generics.ListCreateAPIView):
         return AccessPermission.objects.filter(granted_by=self.request.user)
     
     def perform_create(self, serializer):
-        project = get_object_or_404(
-            Project, 
-            id=serializer.validated_data['project'].id,
-            members=self.request.user
-        )
+        # Only project admins (members included) may hand out access
+        self.get_accessible_project(serializer.validated_data['project'].id, level='admin')
         serializer.save(granted_by=self.request.user)
 # In your views.py
 
@@ -584,24 +1085,31 @@ from rest_framework.permissions import AllowAny
 from .models import BoardList, Card
 from .serializers import BoardListSerializer, CardSerializer
 
-class PublicBoardListsView(generics.ListAPIView):
+class PublicBoardListsView(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = BoardListSerializer
     permission_classes = [AllowAny]
     authentication_classes = []
 
+    def get_validator_keys(self):
+        return [('board', self.kwargs['board_id'])]
+
     def get_queryset(self):
         board_id = self.kwargs.get('board_id')
-        return BoardList.objects.filter(board_id=board_id).prefetch_related('card_set')
+        return BoardList.objects.filter(board_id=board_id)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.get_serializer(queryset, many=True)
-        board_lists_data = []
-        for board_list in queryset:
-            list_data = BoardListSerializer(board_list).data
-            list_data['cards'] = CardSerializer(board_list.card_set.all(), many=True).data
-            board_lists_data.append(list_data)
-        return Response(board_lists_data)
+        return Response(board_snapshot(self.kwargs['board_id'])['lists'])
+
+class PublicBoardSnapshotView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """The whole board as one versioned lists+cards document."""
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get_validator_keys(self):
+        return [('board', self.kwargs['board_id'])]
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(board_snapshot(self.kwargs['board_id']))
 
 class PublicCardCreateView(generics.CreateAPIView):
     serializer_class = CardSerializer
@@ -2,6 +2,8 @@
 ASGI config for projectly_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with an ASGI server (e.g. ``uvicorn projectly_backend.asgi:application``)
+to keep the notification event stream open without tying up a worker thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
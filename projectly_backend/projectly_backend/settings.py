@@ -1,6 +1,8 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
+from django.core.exceptions import ImproperlyConfigured
 
 load_dotenv()
 
@@ -48,10 +50,31 @@ REST_FRAMEWORK = {
       'DEFAULT_PERMISSION_CLASSES': (
           'rest_framework.permissions.AllowAny',
       ),
+      # orjson when installed (accounts/renderers.py, accounts/parsers.py); otherwise the stdlib
+      'DEFAULT_RENDERER_CLASSES': (
+          'accounts.renderers.ORJSONRenderer',
+          'rest_framework.renderers.BrowsableAPIRenderer',
+      ),
+      'DEFAULT_PARSER_CLASSES': (
+          'accounts.parsers.ORJSONParser',
+          'rest_framework.parsers.FormParser',
+          'rest_framework.parsers.MultiPartParser',
+      ),
       'DEFAULT_PAGINATION_CLASS': None,  # Disable pagination
       'PAGE_SIZE': None
   }
 
+# Authentication backends per endpoint group (accounts.mixins.AuthenticationGroupMixin).
+# The stateless backend trusts the signed access-token claims instead of
+# loading the user on each request; set e.g. AUTH_BACKENDS_FILES to
+# rest_framework_simplejwt.authentication.JWTAuthentication to move a group
+# back. Views outside these groups use DEFAULT_AUTHENTICATION_CLASSES.
+STATELESS_JWT_AUTHENTICATION = 'accounts.authentication.ClaimsJWTAuthentication'
+AUTHENTICATION_GROUPS = {
+      group: tuple(os.getenv(f'AUTH_BACKENDS_{group.upper()}', STATELESS_JWT_AUTHENTICATION).split(','))
+      for group in ('projects', 'notifications', 'files')
+  }
+
 SOCIAL_AUTH_GOOGLE_CLIENT_ID = 'your-google-client-id'
 SOCIAL_AUTH_GOOGLE_SECRET = 'your-google-secret'
 
@@ -64,6 +87,20 @@ SOCIAL_AUTH_APPLE_TEAM_ID = 'your-apple-team-id'
 SOCIAL_AUTH_APPLE_KEY_ID = 'your-apple-key-id'
 SOCIAL_AUTH_APPLE_PRIVATE_KEY = 'your-apple-private-key'
 
+# Provider lookups (accounts/social.py): pooled keep-alive connections,
+# (connect, read) timeouts in seconds, and how long a validated token's
+# identity is reused. The userinfo URLs can point at a stub in tests.
+SOCIAL_AUTH_POOL_SIZE = int(os.getenv('SOCIAL_AUTH_POOL_SIZE', 10))
+SOCIAL_AUTH_TIMEOUT = (
+      float(os.getenv('SOCIAL_AUTH_CONNECT_TIMEOUT', 3.05)),
+      float(os.getenv('SOCIAL_AUTH_READ_TIMEOUT', 5)),
+  )
+SOCIAL_AUTH_TOKEN_CACHE_TTL = int(os.getenv('SOCIAL_AUTH_TOKEN_CACHE_TTL', 300))
+SOCIAL_AUTH_USERINFO_URLS = {
+      'google': os.getenv('SOCIAL_AUTH_GOOGLE_USERINFO_URL', 'https://www.googleapis.com/oauth2/v3/userinfo'),
+      'microsoft': os.getenv('SOCIAL_AUTH_MICROSOFT_USERINFO_URL', 'https://graph.microsoft.com/v1.0/me'),
+  }
+
 MIDDLEWARE = [
       'corsheaders.middleware.CorsMiddleware',
       'django.middleware.security.SecurityMiddleware',
@@ -73,6 +110,7 @@ MIDDLEWARE = [
       'django.contrib.auth.middleware.AuthenticationMiddleware',
       'django.contrib.messages.middleware.MessageMiddleware',
       'django.middleware.clickjacking.XFrameOptionsMiddleware',
+      'accounts.middleware.ReplicaPinMiddleware',
   ]
 
 ROOT_URLCONF = 'projectly_backend.urls'
@@ -92,17 +130,174 @@ TEMPLATES = [
       },
   ]
 
+# Board snapshots and version counters live here; point every worker at a
+# shared backend (e.g. Redis or file-based) when running more than one process.
+CACHES = {
+      'default': {
+          'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+          'LOCATION': os.getenv('CACHE_LOCATION', 'projectly'),
+      },
+      # Per-project API responses (accounts/response_cache.py). Local memory
+      # by default; RESPONSE_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+      # with a directory in RESPONSE_CACHE_LOCATION shares entries, invalidations
+      # and hit/miss counters between the workers on a host. Counters are served
+      # at /api/response-cache/stats/ (admins only) whatever the backend.
+      'responses': {
+          'BACKEND': os.getenv('RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+          'LOCATION': os.getenv('RESPONSE_CACHE_LOCATION', 'projectly-responses'),
+          'OPTIONS': {'MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 5000))},
+      },
+  }
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', 300))  # signals invalidate entries sooner
+
+# Pub/sub used to push new notifications to open event streams
+NOTIFICATION_BROKER = 'accounts.realtime.InProcessBroker'
+NOTIFICATION_STREAM_KEEPALIVE = 15  # seconds between SSE keepalive comments
+
+# Applied by `manage.py prune_notifications`; None disables a step
+NOTIFICATION_RETENTION = {
+      'COLLAPSE_TYPES': ['task_assigned'],  # keep only the newest per user and task
+      'ARCHIVE_READ_AFTER_DAYS': int(os.getenv('NOTIFICATION_ARCHIVE_READ_AFTER_DAYS', 30)),
+      'ARCHIVE_ALL_AFTER_DAYS': int(os.getenv('NOTIFICATION_ARCHIVE_ALL_AFTER_DAYS', 180)),
+      'PURGE_ARCHIVE_AFTER_DAYS': int(os.getenv('NOTIFICATION_PURGE_ARCHIVE_AFTER_DAYS', 730)),
+      'BATCH_SIZE': 1000,  # rows per delete transaction
+  }
+
+BULK_WRITE_CHUNK_SIZE = 500  # rows per bulk_create/bulk_update transaction
+
+# Seconds a user's resolved project memberships/grants stay cached;
+# membership and AccessPermission changes invalidate them sooner
+PROJECT_ACCESS_TIMEOUT = 60
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Resumable uploads (accounts/uploads.py). Partial files live under
+# MEDIA_ROOT/.uploads by default so finishing an upload is a rename.
+UPLOAD_TEMP_DIR = os.getenv('UPLOAD_TEMP_DIR') or None
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # size suggested to clients
+UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', 5 * 1024 ** 3))
+
+# Protected media (accounts.views.serve_media) checks access in Django and
+# then hands the bytes to the front server: 'x-accel-redirect' (nginx, with
+# an internal location at MEDIA_ACCEL_REDIRECT_PREFIX aliased to MEDIA_ROOT)
+# or 'x-sendfile' (Apache mod_xsendfile, lighttpd). Unset streams the file
+# from the worker, which uses sendfile() where the WSGI server supports it.
+MEDIA_SENDFILE_BACKEND = os.getenv('MEDIA_SENDFILE_BACKEND') or None
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv('MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+# File URLs in API responses are signed so plain links open without a header;
+# a signature holds for one to two windows of this many seconds.
+MEDIA_URL_MAX_AGE = int(os.getenv('MEDIA_URL_MAX_AGE', 60 * 60))
+
+# Thumbnails and file metadata (accounts/previews.py) are derived on an
+# in-process thread pool after upload; 0 workers derives them inline.
+# Thumbnails need Pillow; without it only metadata is recorded.
+PREVIEW_WORKERS = int(os.getenv('PREVIEW_WORKERS', 2))
+PREVIEW_THUMBNAIL_SIZE = (320, 320)
+PREVIEW_MAX_PIXELS = 50_000_000  # larger images get metadata but no thumbnail
+
 WSGI_APPLICATION = 'projectly_backend.wsgi.application'
 
-DATABASES = {
-      'default': {
-          'ENGINE': 'django.db.backends.sqlite3',
-          'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE selects sqlite3 (default) or postgresql.
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite3')
+
+# SQLite: WAL lets readers carry on while one connection writes, and
+# IMMEDIATE transactions take the write lock when they begin instead of
+# failing with "database is locked" when a read transaction tries to write.
+# 'timeout' is the busy timeout: how long a writer waits for the lock.
+SQLITE_OPTIONS = {
+      'timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', 20)),
+      'transaction_mode': 'IMMEDIATE',
+      'init_command': ';'.join([
+          'PRAGMA journal_mode=WAL',
+          # Durable at each checkpoint rather than each commit; safe with WAL
+          'PRAGMA synchronous=NORMAL',
+          f"PRAGMA mmap_size={int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+          'PRAGMA journal_size_limit=67108864',
+      ]),
+  }
+
+if DB_ENGINE == 'postgresql':
+    # DB_POOL uses Django's psycopg pool (pip install "psycopg[pool]"), which
+    # replaces persistent connections; otherwise each worker thread keeps its
+    # connection for DB_CONN_MAX_AGE seconds and health-checks it on reuse.
+    DB_POOL = os.getenv('DB_POOL') == 'True'
+    DATABASES = {
+          'default': {
+              'ENGINE': 'django.db.backends.postgresql',
+              'NAME': os.getenv('DB_NAME', 'projectly'),
+              'USER': os.getenv('DB_USER', ''),
+              'PASSWORD': os.getenv('DB_PASSWORD', ''),
+              'HOST': os.getenv('DB_HOST', ''),
+              'PORT': os.getenv('DB_PORT', ''),
+              'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+              'CONN_HEALTH_CHECKS': True,
+              'OPTIONS': {
+                  'pool': {
+                      'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+                      'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+                      'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+                  },
+              } if DB_POOL else {},
+          }
+      }
+elif DB_ENGINE == 'sqlite3':
+    DATABASES = {
+          'default': {
+              'ENGINE': 'django.db.backends.sqlite3',
+              'NAME': os.getenv('DB_NAME') or BASE_DIR / 'db.sqlite3',
+              'OPTIONS': SQLITE_OPTIONS,
+          }
+      }
+else:
+    raise ImproperlyConfigured(f'DB_ENGINE must be sqlite3 or postgresql, not {DB_ENGINE!r}.')
+
+# Read replicas: DB_REPLICAS lists replica hosts (PostgreSQL) or database
+# files (SQLite stand-ins), comma-separated. Views with ReplicaReadMixin
+# read from one of them; everything else, and every write, uses 'default'.
+# A caller who wrote is kept on the primary for REPLICA_PIN_SECONDS, which
+# should exceed the replicas' usual lag.
+DATABASE_REPLICAS = []
+for _number, _location in enumerate(filter(None, os.getenv('DB_REPLICAS', '').split(','))):
+    DATABASE_REPLICAS.append(f'replica{_number}')
+    DATABASES[f'replica{_number}'] = {
+          **DATABASES['default'],
+          'HOST' if DB_ENGINE == 'postgresql' else 'NAME': _location.strip(),
+          # Tests read the replica through the test primary
+          'TEST': {'MIRROR': 'default'},
       }
+DATABASE_ROUTERS = ['accounts.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', 5))
+
+# Password hashing (accounts/hashers.py). PASSWORD_HASHER picks the algorithm
+# for new and upgraded hashes: argon2 (needs argon2-cffi), bcrypt (needs
+# bcrypt) or pbkdf2. The others stay listed so existing hashes still verify;
+# they, and hashes made with older cost parameters, are rewritten on login.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'pbkdf2')
+PASSWORD_HASHER_PARAMS = {
+      'PBKDF2_ITERATIONS': int(os.getenv('PBKDF2_ITERATIONS', 0)) or None,  # None keeps Django's default
+      'ARGON2_TIME_COST': int(os.getenv('ARGON2_TIME_COST', 0)) or None,
+      'ARGON2_MEMORY_COST': int(os.getenv('ARGON2_MEMORY_COST', 0)) or None,  # KiB
+      'ARGON2_PARALLELISM': int(os.getenv('ARGON2_PARALLELISM', 0)) or None,
+      'BCRYPT_ROUNDS': int(os.getenv('BCRYPT_ROUNDS', 0)) or None,
+  }
+_AVAILABLE_HASHERS = {
+      'argon2': ('accounts.hashers.Argon2PasswordHasher', find_spec('argon2') is not None),
+      'bcrypt': ('accounts.hashers.BCryptSHA256PasswordHasher', find_spec('bcrypt') is not None),
+      'pbkdf2': ('accounts.hashers.PBKDF2PasswordHasher', True),
   }
+if not _AVAILABLE_HASHERS.get(PASSWORD_HASHER, (None, False))[1]:
+    raise ImproperlyConfigured(f'PASSWORD_HASHER {PASSWORD_HASHER!r} is unknown or its library is not installed.')
+PASSWORD_HASHERS = [_AVAILABLE_HASHERS[PASSWORD_HASHER][0]] + [
+      path for name, (path, available) in _AVAILABLE_HASHERS.items() if available and name != PASSWORD_HASHER
+  ] + [
+      'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+      'django.contrib.auth.hashers.ScryptPasswordHasher',
+  ]
+# Async login and registration verify and hash on a bounded thread pool:
+# one thread per core unless set, refusing work beyond the queue with a 503.
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 0)) or None
+PASSWORD_HASH_QUEUE = int(os.getenv('PASSWORD_HASH_QUEUE', 64))
 
 AUTH_PASSWORD_VALIDATORS = [
       {
@@ -17,7 +17,7 @@ Including another URLconf
 
 from django.contrib import admin
 from django.urls import path, include
-from accounts.views import home
+from accounts.views import home, serve_media
 from django.conf import settings
 from django.conf.urls.static import static
 
@@ -29,8 +29,10 @@ urlpatterns = [
     path('', home, name='home'),
     path('api/auth/', include('accounts.urls')),
     path('api/tasks/', include('accounts.urls')),
-      path('', include('accounts.urls'))
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+      path('', include('accounts.urls')),
+    # Media goes through an access check; the transfer itself is offloaded (see MEDIA_SENDFILE_BACKEND)
+    path(f"{settings.MEDIA_URL.lstrip('/')}<path:path>", serve_media, name='media'),
+]
 
 # Serve static files in debug mode
 if settings.DEBUG: